@@ -6,23 +6,85 @@ PIANIFICAZIONE CORSI 2026 - SISTEMA INTELLIGENTE
 STRATEGIA:
 1. DataValidation per liste base (formatori, aule)
 2. Conditional Formatting per evidenziare DUPLICATI in rosso
-3. Sezioni AULE separate per filtraggio attività
-4. Celle di supporto per validazione dinamica
+3. Range nominati ATT_<aula> (foglio CONTROLLO_AULE) per ogni aula
+4. Menu Attività dipendente dall'aula scelta (INDIRECT): le combinazioni
+   aula-attività non compatibili non si possono inserire; se l'aula viene
+   cambiata dopo l'attività, l'attività rimasta incompatibile è in ARANCIO
+
+BACKEND DI SCRITTURA:
+I fogli sono descritti una sola volta (funzioni create_*_sheet) e scritti
+tramite un backend intercambiabile:
+- openpyxl (predefinito): modello completo in memoria
+- xlsxwriter: modalità constant_memory, veloce e leggera per molti file
+
+    python3 crea_pianificazione_smart.py --backend xlsxwriter
+
+PRECOMPILAZIONE da assegnazioni preparate fuori da Excel (CSV, JSON, SQLite):
+
+    python3 crea_pianificazione_smart.py --precompila assegnazioni.csv
+
+PIANO DIVISO PER TRIMESTRE O MESE (fogli più piccoli, FORMATORI somma tutti i fogli):
+
+    python3 crea_pianificazione_smart.py --suddivisione trimestre
+
+PIANO COME TABELLA EXCEL (una riga per turno con la data, filtri e ordinamento):
+
+    python3 crea_pianificazione_smart.py --layout tabella
+
+VERSIONE LEGGERA (solo inserimento dati: niente formule né conditional formatting,
+duplicati e conteggi controllati da sincronizza_risultati.py e nei PDF):
+
+    python3 crea_pianificazione_smart.py --leggero
+
+GENERAZIONE IN BATCH (più anni / sedi, un processo per file):
+
+    python3 crea_pianificazione_smart.py --batch specifiche.json --backend xlsxwriter --cartella batch
 
 """
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
 from openpyxl.utils import get_column_letter
+from openpyxl.utils.cell import coordinate_to_tuple
 from openpyxl.worksheet.datavalidation import DataValidation
-from openpyxl.formatting.rule import CellIsRule, FormulaRule
+from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.workbook.defined_name import DefinedName
+from openpyxl.comments import Comment
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
+import argparse
 import calendar
+import contextlib
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import stili
+from stili import STILI_EXCEL
 
 # CONFIGURAZIONE
 FORMATORI = ['CL', 'MC', 'LD', 'EP', 'IP', 'FB', 'GZ', 'DC']
 FORMATORI_TEST = ['URS', 'NIC', 'MIT', 'MON', 'WER']
 
+# Dati foglio FORMATORI: (%, n.giorni previsti, settimana non lavoro, festività e ferie)
+DATI_FORMATORI = {
+    'CL': (0.7, 155, '', 0),
+    'MC': (0.5, 111, 'Mercoledì Mattina; Mercoledì pomeriggio', 0),
+    'LD': (0.8, 177, '', 0),
+    'EP': (0.9, 199, '', 0),
+    'IP': (0.9, 199, '', 0),
+    'FB': (0.8, 177, '', 0),
+    'GZ': (0.8, 177, '', 0),
+    'DC': (0.4, 88, 'Mercoledì Mattina; Mercoledì pomeriggio', 0),
+}
+
 # ATTIVITÀ ESTERNE (per fuori aula)
 ATTIVITA_ESTERNE = ['RIUNIONE', 'FORMAZIONE', 'CONSULENZA', 'AUDIT', 'ALTRO']
 
@@ -35,6 +97,41 @@ AULE_ATTIVITA = {
     'UFF': ['UFF', 'COL', 'C']
 }
 
+# Range nominati per il menu Attività dipendente dall'aula
+PREFISSO_ATTIVITA_AULA = 'ATT_'
+NOME_TUTTE_ATTIVITA = 'ATT_TUTTE'  # usato finché l'aula non è scelta
+
+# Liste dei menu a tendina (righe helper nascoste 50-69)
+LISTA_FORMATORI = f'=FORMATORI!$A$51:$A${50 + len(FORMATORI)}'
+LISTA_FORMATORI_TEST = f'=FORMATORI!$I$51:$I${50 + len(FORMATORI_TEST)}'
+LISTA_AULE = f'=CONTROLLO_AULE!$A$50:$A${49 + len(AULE_ATTIVITA)}'
+
+# PERIODO PIANIFICATO (estendibile, es. fino a gennaio 2027)
+DATA_INIZIO = datetime(2026, 1, 1)
+DATA_FINE = datetime(2026, 12, 31)
+
+# FOGLI DEL PIANO: uno per l'anno di DATA_INIZIO ('2026') oppure uno per periodo
+# ('2026 T1'...'2026 T4' o '2026 GEN'...'2026 DIC'); FORMATORI li somma tutti
+NOME_FOGLIO_PIANO = str(DATA_INIZIO.year)
+SUDDIVISIONI = ['anno', 'trimestre', 'mese']
+MESI_BREVI = ['GEN', 'FEB', 'MAR', 'APR', 'MAG', 'GIU', 'LUG', 'AGO', 'SET', 'OTT', 'NOV', 'DIC']
+
+# LAYOUT DEL PIANO: 'mesi' = banda e intestazioni per ogni mese (predefinito),
+# 'tabella' = una tabella Excel unica con una riga per turno e la data su ogni riga
+LAYOUT = ['mesi', 'tabella']
+RIGA_INTESTAZIONE_TABELLA = 4  # i turni iniziano dalla riga successiva
+STILE_TABELLA = 'TableStyleLight9'
+# I nomi delle colonne di una tabella devono essere unici
+INTESTAZIONI_TABELLA = ['Data', 'Turno'] + [
+    f'P{n} {campo}'
+    for n in range(1, 5)
+    for campo in ['percorso', 'Formatore 1', 'Formatore 2', 'Aula', 'Attività', 'Test']
+] + ['Fine corso'] + [
+    intestazione
+    for n in range(1, 6)
+    for intestazione in [f'Form.{n}', f'Att.Est.{n}']
+]
+
 # FESTIVITÀ 2026
 FESTIVITA = [
     datetime(2026, 1, 1),   # Capodanno
@@ -53,24 +150,9 @@ FESTIVITA = [
     datetime(2026, 8, 13), datetime(2026, 8, 14),
 ]
 
-# COLORI
-COLOR_HEADER = 'D9E1F2'
-COLOR_MORNING = 'E2EFDA'
-COLOR_AFTERNOON = 'FFF2CC'
-COLOR_MONTH = 'B4C7E7'
-COLOR_DUPLICATE = 'FF0000'  # Rosso per duplicati
-COLOR_WARNING = 'FFC7CE'    # Rosa per warning
-
-# 40 colori per percorsi
-COLORI_PERCORSI = [
-    'B4C7E7', 'F8CBAD', 'C5E0B4', 'FFE699', 'B4C7E7', 'D5A6BD', 
-    'A9D08E', 'F4B084', 'BDD7EE', 'F8CBAD', 'C6E0B4', 'FFD966',
-    '9DC3E6', 'F4B183', 'A8D08D', 'FFEB9C', '8FAADC', 'E2A293',
-    '9BBB59', 'FFD556', '7FA7D0', 'D99694', '92D050', 'FFC000',
-    '6FA8DC', 'CC8899', '76A35D', 'F9CB9C', '5B9BD5', 'B38EAC',
-    '70AD47', 'ED7D31', '4A7EBB', 'A87B9C', '548235', 'C65911',
-    '385D8A', '9B6B81', '375623', 'A04D00'
-]
+# COLORI (definiti in stili.py, condivisi con i PDF)
+COLOR_DUPLICATE = stili.ROSSO  # Rosso per duplicati
+COLOR_INCOMPATIBILE = stili.ARANCIO  # Attività non compatibile con l'aula
 
 def is_weekend(date):
     return date.weekday() >= 5
@@ -78,208 +160,562 @@ def is_weekend(date):
 def is_holiday(date):
     return date in FESTIVITA
 
-def create_assumptions_sheet(wb):
+def festivita_nazionali(anno):
+    """Festività italiane di un anno (Pasquetta calcolata), senza ferie aziendali"""
+    # Pasqua: algoritmo di Gauss/Meeus per il calendario gregoriano
+    a, b, c = anno % 19, anno // 100, anno % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    mese = (h + l - 7 * m + 90) // 25
+    giorno = (h + l - 7 * m + 33 * mese + 19) % 32
+    pasquetta = datetime(anno, mese, giorno) + timedelta(days=1)
+    
+    fisse = [(1, 1), (1, 6), (4, 25), (5, 1), (6, 2), (8, 15), (11, 1), (12, 8), (12, 25), (12, 26)]
+    return sorted([datetime(anno, mese, giorno) for mese, giorno in fisse] + [pasquetta])
+
+def giorni_lavorativi(data_inizio=None, data_fine=None):
+    """Giorni da pianificare tra data_inizio e data_fine (esclusi weekend e festività)"""
+    current_date = data_inizio or DATA_INIZIO
+    data_fine = data_fine or DATA_FINE
+    giorni = []
+    while current_date <= data_fine:
+        if not is_weekend(current_date) and not is_holiday(current_date):
+            giorni.append(current_date)
+        current_date += timedelta(days=1)
+    return giorni
+
+def periodi_piano(giorni, suddivisione='anno'):
+    """Giorni divisi per foglio: [(nome_foglio, giorni)] in ordine di calendario"""
+    if suddivisione == 'anno':
+        return [(NOME_FOGLIO_PIANO, giorni)]
+    periodi = {}
+    for giorno in giorni:
+        if suddivisione == 'trimestre':
+            nome = f'{NOME_FOGLIO_PIANO} T{(giorno.month - 1) // 3 + 1}'
+        else:
+            nome = f'{NOME_FOGLIO_PIANO} {MESI_BREVI[giorno.month - 1]}'
+        periodi.setdefault(nome, []).append(giorno)
+    return list(periodi.items())
+
+# ===== BACKEND DI SCRITTURA =====
+# Le funzioni create_*_sheet usano solo queste operazioni:
+#   write / cell           -> valore + stile (per nome) di una cella
+#   merge                  -> unione celle ('A1:C1')
+#   set_width              -> larghezza colonna
+#   hide_rows              -> righe helper nascoste
+#   add_list_validation    -> menu a tendina
+#   add_formula_format     -> conditional formatting con formula
+#   add_comment            -> commento (nota) su una cella
+#   add_table              -> tabella Excel (ListObject) su un range con intestazioni
+# e a livello di workbook:
+#   define_name            -> range nominato ('ATT_103' -> CONTROLLO_AULE!$E$50:$E$56)
+# Gli stili sono indicati per nome (stili.STILI_EXCEL): ogni backend crea
+# l'oggetto corrispondente una sola volta, al primo utilizzo del nome.
+
+def _range_compatti(celle):
+    """Raggruppa celle (riga, colonna) in range verticali contigui: 'D6:D45 D48:D87 ...'"""
+    per_colonna = defaultdict(list)
+    for row, col in celle:
+        per_colonna[col].append(row)
+    
+    ranges = []
+    for col in sorted(per_colonna):
+        righe = sorted(set(per_colonna[col]))
+        inizio = precedente = righe[0]
+        for row in righe[1:] + [None]:
+            if row is not None and row == precedente + 1:
+                precedente = row
+                continue
+            lettera = get_column_letter(col)
+            if inizio == precedente:
+                ranges.append(f'{lettera}{inizio}')
+            else:
+                ranges.append(f'{lettera}{inizio}:{lettera}{precedente}')
+            inizio = precedente = row
+    return ranges
+
+
+class FoglioBase:
+    """Operazioni comuni: i riferimenti 'A1' vengono convertiti in (riga, colonna)"""
+    
+    def __init__(self, title):
+        self.title = title
+        # Validazioni raggruppate per opzioni identiche: una sola regola con
+        # molti range invece di una regola per cella
+        self._validazioni = defaultdict(list)
+    
+    def write(self, ref, value, stile=None):
+        row, col = coordinate_to_tuple(ref)
+        self.cell(row, col, value, stile)
+    
+    def add_list_validation(self, row, col, formula1, error=None, error_title=None,
+                            prompt=None, prompt_title=None, blocca=False):
+        """blocca=True: Excel rifiuta i valori fuori lista (messaggio di errore 'stop')"""
+        chiave = (formula1, error, error_title, prompt, prompt_title, blocca)
+        self._validazioni[chiave].append((row, col))
+
+
+class OpenpyxlSheet(FoglioBase):
+    def __init__(self, ws, backend):
+        super().__init__(ws.title)
+        self.ws = ws
+        self._backend = backend
+    
+    def cell(self, row, col, value, stile=None):
+        cell = self.ws.cell(row=row, column=col, value=value)
+        if stile:
+            cell.style = self._backend.stile(stile)
+    
+    def merge(self, ref):
+        self.ws.merge_cells(ref)
+    
+    def set_width(self, col_letter, width):
+        self.ws.column_dimensions[col_letter].width = width
+    
+    def hide_rows(self, first_row, last_row):
+        for row in range(first_row, last_row + 1):
+            self.ws.row_dimensions[row].hidden = True
+    
+    def add_formula_format(self, sqref, formula, colore):
+        rule = FormulaRule(formula=[formula], fill=PatternFill(start_color=colore, end_color=colore, fill_type='solid'))
+        self.ws.conditional_formatting.add(sqref, rule)
+    
+    def add_comment(self, row, col, testo):
+        self.ws.cell(row=row, column=col).comment = Comment(testo, 'Pianificazione')
+    
+    def add_table(self, ref, nome, intestazioni):
+        # I nomi delle colonne vengono presi dalle celle d'intestazione al salvataggio
+        self.ws.add_table(Table(displayName=nome, ref=ref, autoFilter=AutoFilter(ref=ref),
+                                tableStyleInfo=TableStyleInfo(name=STILE_TABELLA, showRowStripes=False)))
+    
+    def close(self):
+        for (formula1, error, error_title, prompt, prompt_title, blocca), celle in self._validazioni.items():
+            dv = DataValidation(type="list", formula1=formula1, allow_blank=True,
+                                sqref=' '.join(_range_compatti(celle)))
+            if blocca:
+                dv.showErrorMessage = True
+                dv.showInputMessage = True
+            dv.error = error
+            dv.errorTitle = error_title
+            dv.prompt = prompt
+            dv.promptTitle = prompt_title
+            self.ws.add_data_validation(dv)
+
+
+class OpenpyxlBackend:
+    """Backend predefinito: costruisce il workbook completo in memoria"""
+    nome = 'openpyxl'
+    
+    def __init__(self, filename, wb=None, tabelle=False):
+        """wb: workbook già aperto a cui aggiungere fogli (aggiorna_pianificazione.py)
+        tabelle: il file conterrà tabelle Excel (sempre supportate da openpyxl)
+        """
+        self.filename = filename
+        if wb is None:
+            wb = Workbook()
+            wb.remove(wb.active)
+        self.wb = wb
+        self._fogli = []
+        # Un workbook esistente ha già i suoi NamedStyle
+        self._stili_registrati = set(wb.style_names)
+    
+    def stile(self, nome):
+        """Registra il NamedStyle al primo utilizzo e ne restituisce il nome"""
+        if nome not in self._stili_registrati:
+            stile = STILI_EXCEL[nome]
+            named = NamedStyle(name=nome)
+            named.font = Font(bold=stile.get('bold', False), italic=stile.get('italic', False),
+                              size=stile.get('size', 11), color=stile.get('color'))
+            if 'fill' in stile:
+                named.fill = PatternFill(start_color=stile['fill'], end_color=stile['fill'], fill_type='solid')
+            named.alignment = Alignment(horizontal=stile.get('align'), vertical=stile.get('valign'),
+                                        wrap_text=stile.get('wrap'))
+            if 'num_format' in stile:
+                named.number_format = stile['num_format']
+            self.wb.add_named_style(named)
+            self._stili_registrati.add(nome)
+        return nome
+    
+    def define_name(self, nome, riferimento):
+        self.wb.defined_names[nome] = DefinedName(nome, attr_text=riferimento)
+    
+    def add_sheet(self, title):
+        foglio = OpenpyxlSheet(self.wb.create_sheet(title), self)
+        self._fogli.append(foglio)
+        return foglio
+    
+    def chiudi_fogli(self):
+        """Scrive nel workbook le validazioni raccolte (prima del salvataggio)"""
+        for foglio in self._fogli:
+            foglio.close()
+        self._fogli = []
+    
+    def save(self):
+        self.chiudi_fogli()
+        self.wb.save(self.filename)
+
+
+class XlsxwriterSheet(FoglioBase):
+    """
+    Foglio xlsxwriter in constant_memory: le righe vanno scritte in ordine
+    crescente, quindi le celle vengono raccolte come semplici tuple e
+    scritte riga per riga alla chiusura del foglio.
+    """
+    
+    def __init__(self, ws, backend):
+        super().__init__(ws.name)
+        self.ws = ws
+        self._backend = backend
+        self._celle = defaultdict(dict)  # riga -> {colonna: (valore, stile)}
+        self._merge = {}                 # (riga, colonna) in alto a sinistra -> 'A1:C1'
+        self._righe_nascoste = set()
+        self._larghezze = {}
+        self._formati_condizionali = []
+        self._commenti = []
+        self._tabelle = []
+    
+    def cell(self, row, col, value, stile=None):
+        self._celle[row][col] = (value, stile)
+    
+    def merge(self, ref):
+        inizio = ref.split(':')[0]
+        self._merge[coordinate_to_tuple(inizio)] = ref
+    
+    def set_width(self, col_letter, width):
+        self._larghezze[col_letter] = width
+    
+    def hide_rows(self, first_row, last_row):
+        self._righe_nascoste.update(range(first_row, last_row + 1))
+    
+    def add_formula_format(self, sqref, formula, colore):
+        self._formati_condizionali.append((sqref, formula, colore))
+    
+    def add_comment(self, row, col, testo):
+        self._commenti.append((row, col, testo))
+    
+    def add_table(self, ref, nome, intestazioni):
+        self._tabelle.append((ref, nome, intestazioni))
+    
+    def close(self):
+        for col_letter, width in self._larghezze.items():
+            self.ws.set_column(f'{col_letter}:{col_letter}', width)
+        
+        # Prima delle celle: add_table scrive le intestazioni senza formato,
+        # le celle raccolte le riscrivono con il loro stile
+        for ref, nome, intestazioni in self._tabelle:
+            self.ws.add_table(ref, {
+                'name': nome,
+                'style': STILE_TABELLA,
+                'columns': [{'header': testo} for testo in intestazioni],
+                'banded_rows': False,
+            })
+        
+        for row in sorted(set(self._celle) | self._righe_nascoste):
+            if row in self._righe_nascoste:
+                self.ws.set_row(row - 1, None, None, {'hidden': True})
+                if row not in self._celle:
+                    # In constant_memory una riga senza celle non viene mai scritta
+                    self.ws.write_blank(row - 1, 0, None, self._backend.formato_vuoto)
+            for col, (value, stile) in sorted(self._celle.get(row, {}).items()):
+                fmt = self._backend.formato(stile) if stile else None
+                if (row, col) in self._merge:
+                    self.ws.merge_range(self._merge[(row, col)], value, fmt)
+                elif isinstance(value, datetime):
+                    self.ws.write_datetime(row - 1, col - 1, value, fmt)
+                else:
+                    self.ws.write(row - 1, col - 1, value, fmt)
+        
+        for row, col, testo in self._commenti:
+            self.ws.write_comment(row - 1, col - 1, testo, {'author': 'Pianificazione'})
+        
+        for (formula1, error, error_title, prompt, prompt_title, blocca), celle in self._validazioni.items():
+            ranges = _range_compatti(celle)
+            opzioni = {
+                'validate': 'list',
+                'source': formula1,
+                'ignore_blank': True,
+                # Come openpyxl: messaggi memorizzati ma mostrati solo se blocca
+                'show_input': blocca,
+                'show_error': blocca,
+                'multi_range': ' '.join(ranges),
+            }
+            if error:
+                opzioni['error_message'] = error
+            if error_title:
+                opzioni['error_title'] = error_title
+            if prompt:
+                opzioni['input_message'] = prompt
+            if prompt_title:
+                opzioni['input_title'] = prompt_title
+            self.ws.data_validation(ranges[0], opzioni)
+        
+        for sqref, formula, colore in self._formati_condizionali:
+            # Il primo range del sqref è la cella di riferimento della formula relativa
+            self.ws.conditional_format(sqref.split()[0], {
+                'type': 'formula',
+                'criteria': formula,
+                'format': self._backend.formato_condizionale(colore),
+                'multi_range': sqref,
+            })
+
+
+class XlsxwriterBackend:
+    """Backend xlsxwriter in modalità constant_memory (richiede: pip install xlsxwriter)"""
+    nome = 'xlsxwriter'
+    
+    def __init__(self, filename, constant_memory=True, tabelle=False):
+        """tabelle=True: add_table() non è disponibile in constant_memory, il file è scritto in memoria"""
+        try:
+            import xlsxwriter
+        except ImportError:
+            raise RuntimeError("Backend xlsxwriter non disponibile: installa con 'pip install xlsxwriter'")
+        
+        self.filename = filename
+        self.wb = xlsxwriter.Workbook(filename, {'constant_memory': constant_memory and not tabelle})
+        self._fogli = []
+        self._formati = {}
+        self._formati_condizionali = {}
+        self.formato_vuoto = self.wb.add_format()
+    
+    def formato(self, nome):
+        """Un solo Format xlsxwriter per ogni stile con nome"""
+        if nome not in self._formati:
+            stile = STILI_EXCEL[nome]
+            proprieta = {}
+            if stile.get('bold'):
+                proprieta['bold'] = True
+            if stile.get('italic'):
+                proprieta['italic'] = True
+            if stile.get('size'):
+                proprieta['font_size'] = stile['size']
+            if stile.get('color'):
+                proprieta['font_color'] = '#' + stile['color']
+            if stile.get('fill'):
+                proprieta['bg_color'] = '#' + stile['fill']
+                proprieta['pattern'] = 1
+            if stile.get('align'):
+                proprieta['align'] = stile['align']
+            if stile.get('valign'):
+                proprieta['valign'] = 'vcenter' if stile['valign'] == 'center' else stile['valign']
+            if stile.get('wrap'):
+                proprieta['text_wrap'] = True
+            if stile.get('num_format'):
+                proprieta['num_format'] = stile['num_format']
+            self._formati[nome] = self.wb.add_format(proprieta)
+        return self._formati[nome]
+    
+    def formato_condizionale(self, colore):
+        if colore not in self._formati_condizionali:
+            self._formati_condizionali[colore] = self.wb.add_format({'bg_color': '#' + colore})
+        return self._formati_condizionali[colore]
+    
+    def define_name(self, nome, riferimento):
+        self.wb.define_name(nome, '=' + riferimento)
+    
+    def add_sheet(self, title):
+        foglio = XlsxwriterSheet(self.wb.add_worksheet(title), self)
+        self._fogli.append(foglio)
+        return foglio
+    
+    def save(self):
+        for foglio in self._fogli:
+            foglio.close()
+        self.wb.close()
+
+
+BACKENDS = {
+    'openpyxl': OpenpyxlBackend,
+    'xlsxwriter': XlsxwriterBackend,
+}
+
+# ===== DEFINIZIONE FOGLI =====
+
+def create_assumptions_sheet(backend):
     """Foglio Assumptions - Festività e Orari Lezioni"""
-    ws = wb.create_sheet('Assumptions', 0)
+    ws = backend.add_sheet('Assumptions')
     
     # SEZIONE ORARI LEZIONI
-    ws['A1'] = 'IMPOSTAZIONI ORARI LEZIONI'
-    ws['A1'].font = Font(bold=True, size=14, color='FFFFFF')
-    ws['A1'].fill = PatternFill(start_color='2E75B5', end_color='2E75B5', fill_type='solid')
-    ws['A1'].alignment = Alignment(horizontal='center')
-    ws.merge_cells('A1:C1')
+    ws.write('A1', 'IMPOSTAZIONI ORARI LEZIONI',
+             'Titolo foglio')
+    ws.merge('A1:C1')
     
     # Intestazioni
-    ws['A3'] = 'Turno'
-    ws['B3'] = 'Orario Inizio'
-    ws['C3'] = 'Orario Fine'
-    for col in ['A3', 'B3', 'C3']:
-        ws[col].font = Font(bold=True)
-        ws[col].fill = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
-        ws[col].alignment = Alignment(horizontal='center')
+    for ref, testo in [('A3', 'Turno'), ('B3', 'Orario Inizio'), ('C3', 'Orario Fine')]:
+        ws.write(ref, testo, 'Intestazione')
     
     # Dati orari
-    ws['A4'] = 'Mattina'
-    ws['B4'] = '09:00'
-    ws['C4'] = '13:00'
-    
-    ws['A5'] = 'Pomeriggio'
-    ws['B5'] = '14:00'
-    ws['C5'] = '18:00'
-    
     # Formattazione celle orari
-    for row in [4, 5]:
-        ws[f'A{row}'].font = Font(bold=True)
-        ws[f'B{row}'].alignment = Alignment(horizontal='center')
-        ws[f'C{row}'].alignment = Alignment(horizontal='center')
+    ws.write('A4', 'Mattina', 'Grassetto')
+    ws.write('B4', '09:00', 'Centrato')
+    ws.write('C4', '13:00', 'Centrato')
+    
+    ws.write('A5', 'Pomeriggio', 'Grassetto')
+    ws.write('B5', '14:00', 'Centrato')
+    ws.write('C5', '18:00', 'Centrato')
     
     # Dimensioni colonne
-    ws.column_dimensions['A'].width = 15
-    ws.column_dimensions['B'].width = 15
-    ws.column_dimensions['C'].width = 15
+    ws.set_width('B', 15)
+    ws.set_width('C', 15)
     
     # SEZIONE FESTIVITÀ
-    ws['A8'] = 'GIORNI DA ESCLUDERE (FESTIVITÀ E FERIE)'
-    ws['A8'].font = Font(bold=True, size=12)
-    ws['A8'].fill = PatternFill(start_color='FFC000', end_color='FFC000', fill_type='solid')
+    ws.write('A8', 'GIORNI DA ESCLUDERE (FESTIVITÀ E FERIE)', 'Sezione festività')
     
     for idx, festivita in enumerate(sorted(FESTIVITA), start=10):
-        ws[f'A{idx}'] = festivita
-        ws[f'A{idx}'].number_format = 'DD/MM/YYYY'
+        ws.write(f'A{idx}', festivita, 'Data')
     
-    ws.column_dimensions['A'].width = 30
+    ws.set_width('A', 30)
 
-def create_formatori_sheet(wb):
-    """Foglio FORMATORI - Con formule per conteggio automatico dal foglio 2026"""
-    ws = wb.create_sheet('FORMATORI')
+def create_formatori_sheet(backend, righe_piano, leggero=False):
+    """Foglio FORMATORI - Con formule per conteggio automatico dai fogli del piano
+    
+    righe_piano = [(nome_foglio, prima_riga, ultima_riga)] dei dati di ogni
+    foglio del piano (NOME_FOGLIO_PIANO o i fogli per trimestre / mese)
+    leggero: nessuna formula, n.giorni disponibili come valore e giorni
+    svolti / rimanenti calcolati da sincronizza_risultati.py (foglio RISULTATI)
+    """
+    ws = backend.add_sheet('FORMATORI')
+    
+    range_formatori = [
+        f"'{foglio}'!${a}${prima}:${b}${ultima}"
+        for foglio, prima, ultima in righe_piano
+        for a, b in [('D', 'E'), ('J', 'K'), ('P', 'Q'), ('V', 'W'),
+                     ('AB', 'AB'), ('AD', 'AD'), ('AF', 'AF'), ('AH', 'AH'), ('AJ', 'AJ')]
+    ]
     
     # Headers
-    headers = ['FORMATORI', '%', 'n.giorni\nprevisti', 'Settimana\nnon lavoro', 
-               'Festività e ferie', 'n.giorni\ndisponibili', 'n.giorni\nsvolti', 
+    headers = ['FORMATORI', '%', 'n.giorni\nprevisti', 'Settimana\nnon lavoro',
+               'Festività e ferie', 'n.giorni\ndisponibili', 'n.giorni\nsvolti',
                'n.giorni\nrimanenti', 'FORMATORI TEST']
     for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal='center', wrap_text=True)
+        stile = 'Intestazione a capo'
         if col_idx == 7:  # n.giorni svolti
-            cell.fill = PatternFill(start_color='E8F4EA', end_color='E8F4EA', fill_type='solid')
-    
-    # Dati formatori principali
-    formatori_data = [
-        ('CL', 0.7, 155, '', 0),
-        ('MC', 0.5, 111, 'Mercoledì Mattina; Mercoledì pomeriggio', 0),
-        ('LD', 0.8, 177, '', 0),
-        ('EP', 0.9, 199, '', 0),
-        ('IP', 0.9, 199, '', 0),
-        ('FB', 0.8, 177, '', 0),
-        ('GZ', 0.8, 177, '', 0),
-        ('DC', 0.4, 88, 'Mercoledì Mattina; Mercoledì pomeriggio', 0),
-    ]
-    
-    for idx, (nome, perc, giorni, non_lavoro, ferie) in enumerate(formatori_data, start=2):
-        ws[f'A{idx}'] = nome
-        ws[f'B{idx}'] = perc
-        ws[f'B{idx}'].number_format = '0%'
-        ws[f'C{idx}'] = giorni
-        ws[f'D{idx}'] = non_lavoro
-        ws[f'E{idx}'] = ferie
-        ws[f'F{idx}'] = f'=C{idx}-E{idx}'
+            stile = 'Intestazione svolti'
+        ws.cell(1, col_idx, header, stile)
+    
+    # Dati formatori principali (vuoti per i formatori senza dati in DATI_FORMATORI)
+    for idx, nome in enumerate(FORMATORI, start=2):
+        perc, giorni, non_lavoro, ferie = DATI_FORMATORI.get(nome, (None, None, '', 0))
+        ws.write(f'A{idx}', nome)
+        ws.write(f'B{idx}', perc, 'Percentuale')
+        ws.write(f'C{idx}', giorni)
+        ws.write(f'D{idx}', non_lavoro)
+        ws.write(f'E{idx}', ferie)
+        if leggero:
+            ws.write(f'F{idx}', giorni - (ferie or 0) if giorni is not None else None)
+            continue
+        ws.write(f'F{idx}', f'=C{idx}-E{idx}')
         
-        # FORMULA CONTA GIORNI: conta quante volte il formatore appare nel foglio 2026
+        # FORMULA CONTA GIORNI: conta quante volte il formatore appare nel piano
         # Solo colonne formatori: D,E,J,K,P,Q,V,W,AB,AD,AF,AH,AJ (28,30,32,34,36)
-        ws[f'G{idx}'] = (
-            f'=SUM('
-            f'COUNTIF(\'2026\'!D:D,A{idx}),COUNTIF(\'2026\'!E:E,A{idx}),'
-            f'COUNTIF(\'2026\'!J:J,A{idx}),COUNTIF(\'2026\'!K:K,A{idx}),'
-            f'COUNTIF(\'2026\'!P:P,A{idx}),COUNTIF(\'2026\'!Q:Q,A{idx}),'
-            f'COUNTIF(\'2026\'!V:V,A{idx}),COUNTIF(\'2026\'!W:W,A{idx}),'
-            f'COUNTIF(\'2026\'!AB:AB,A{idx}),COUNTIF(\'2026\'!AD:AD,A{idx}),'
-            f'COUNTIF(\'2026\'!AF:AF,A{idx}),COUNTIF(\'2026\'!AH:AH,A{idx}),COUNTIF(\'2026\'!AJ:AJ,A{idx})'
-            f')'
-        )
-        ws[f'G{idx}'].fill = PatternFill(start_color='E8F4EA', end_color='E8F4EA', fill_type='solid')
+        # Range limitati alle righe dati e coppie F1/F2 contigue in un solo COUNTIF;
+        # con il piano diviso per periodo la somma comprende tutti i fogli
+        ws.write(f'G{idx}', '=SUM(' + ','.join(
+            f"COUNTIF({colonne},A{idx})" for colonne in range_formatori
+        ) + ')', 'Giorni svolti')
         
-        ws[f'H{idx}'] = f'=F{idx}-G{idx}'
+        ws.write(f'H{idx}', f'=F{idx}-G{idx}')
+    
+    if leggero:
+        # Nota fuori dalla colonna A: aggiorna_pianificazione.py aggiunge i nuovi formatori in coda
+        ws.write('K1', 'Giorni svolti e rimanenti: foglio RISULTATI '
+                       '(python3 sincronizza_risultati.py)', 'Corsivo')
     
     # Formatori TEST (ora integrati sopra, questa sezione mantiene la colonna I per referenza)
     for idx, test_nome in enumerate(FORMATORI_TEST, start=2):
-        ws[f'I{idx}'] = test_nome
+        ws.write(f'I{idx}', test_nome)
     
     # Liste nascoste per validazione (riga 50+)
     for idx, nome in enumerate(FORMATORI, start=51):
-        ws[f'A{idx}'] = nome
+        ws.write(f'A{idx}', nome)
     
     for idx, test_nome in enumerate(FORMATORI_TEST, start=51):
-        ws[f'I{idx}'] = test_nome
+        ws.write(f'I{idx}', test_nome)
     
     # Nascondi righe helper
-    for row in range(50, 70):
-        ws.row_dimensions[row].hidden = True
+    ws.hide_rows(50, 69)
     
-    ws.column_dimensions['A'].width = 12
-    ws.column_dimensions['D'].width = 30
-    ws.column_dimensions['G'].width = 15
+    ws.set_width('A', 12)
+    ws.set_width('D', 30)
+    ws.set_width('G', 15)
 
-def create_controllo_aule_sheet(wb):
+def create_controllo_aule_sheet(backend):
     """Foglio CONTROLLO_AULE - Con sezioni per ogni aula"""
-    ws = wb.create_sheet('CONTROLLO_AULE')
+    ws = backend.add_sheet('CONTROLLO_AULE')
     
     # STRATEGIA: Creare range nominati per ogni aula
-    # Esempio: 103_ATTIVITA contiene solo le attività compatibili con aula 103
+    # Esempio: ATT_103 contiene solo le attività compatibili con aula 103
+    # (un nome non può iniziare con una cifra, quindi il prefisso va davanti)
     
-    ws['A1'] = 'AULA'
-    ws['B1'] = 'DESCRIZIONE'
-    ws['C1'] = 'ATTIVITÀ COMPATIBILI'
-    
-    for col in ['A', 'B', 'C']:
-        ws[f'{col}1'].font = Font(bold=True)
+    ws.write('A1', 'AULA', 'Grassetto')
+    ws.write('B1', 'DESCRIZIONE', 'Grassetto')
+    ws.write('C1', 'ATTIVITÀ COMPATIBILI', 'Grassetto')
     
     current_row = 2
     
     # Per ogni aula, lista le attività compatibili
     for aula, attivita in AULE_ATTIVITA.items():
-        ws[f'A{current_row}'] = aula
-        ws[f'B{current_row}'] = f'Aula {aula}'
+        ws.write(f'A{current_row}', aula)
+        ws.write(f'B{current_row}', f'Aula {aula}')
         
         # Metti tutte le attività in colonna C
         for idx, att in enumerate(attivita):
-            ws[f'C{current_row + idx}'] = att
+            ws.write(f'C{current_row + idx}', att)
         
         current_row += len(attivita) + 1  # Spazio tra aule
     
     # Liste per validazione (riga 50+)
     aule_list = list(AULE_ATTIVITA.keys())
     for idx, aula in enumerate(aule_list, start=50):
-        ws[f'A{idx}'] = aula
+        ws.write(f'A{idx}', aula)
     
     # Tutte le attività (per lista completa)
     all_att = sorted(set(att for atts in AULE_ATTIVITA.values() for att in atts))
     for idx, att in enumerate(all_att, start=50):
-        ws[f'C{idx}'] = att
+        ws.write(f'C{idx}', att)
+    # Almeno fino alla riga 65 come nei file creati finora (stesso range di aggiorna_pianificazione.py)
+    backend.define_name(NOME_TUTTE_ATTIVITA, f'CONTROLLO_AULE!$C$50:$C${max(65, 49 + len(all_att))}')
     
     # Attività esterne (colonna D)
     for idx, att_est in enumerate(ATTIVITA_ESTERNE, start=50):
-        ws[f'D{idx}'] = att_est
+        ws.write(f'D{idx}', att_est)
     
     # SEZIONI SEPARATE PER OGNI AULA (per validazione dinamica)
+    # Ogni colonna diventa il range nominato letto da INDIRECT nel foglio 2026
     start_col = 5  # Colonna E
     for aula, attivita in AULE_ATTIVITA.items():
         col_letter = get_column_letter(start_col)
-        ws[f'{col_letter}1'] = f'{aula}_ATT'
-        ws[f'{col_letter}1'].font = Font(bold=True)
+        nome = PREFISSO_ATTIVITA_AULA + aula
+        ws.write(f'{col_letter}1', nome, 'Grassetto')
         
         for idx, att in enumerate(attivita, start=50):
-            ws[f'{col_letter}{idx}'] = att
+            ws.write(f'{col_letter}{idx}', att)
         
+        backend.define_name(nome, f'CONTROLLO_AULE!${col_letter}$50:${col_letter}${49 + len(attivita)}')
         start_col += 1
     
     # Nascondi righe helper
-    for row in range(50, 70):
-        ws.row_dimensions[row].hidden = True
+    ws.hide_rows(50, max(69, 49 + len(all_att)))
     
-    ws.column_dimensions['A'].width = 12
-    ws.column_dimensions['B'].width = 20
-    ws.column_dimensions['C'].width = 15
+    ws.set_width('A', 12)
+    ws.set_width('B', 20)
+    ws.set_width('C', 15)
 
-def create_att_esterne_sheet(wb):
+def create_att_esterne_sheet(backend):
     """Foglio ATT. ESTERNE - Personalizzabile dall'utente"""
-    ws = wb.create_sheet('ATT. ESTERNE')
+    ws = backend.add_sheet('ATT. ESTERNE')
     
     # TITOLO
-    ws['A1'] = 'CONFIGURAZIONE ATTIVITÀ ESTERNE'
-    ws['A1'].font = Font(bold=True, size=14, color='FFFFFF')
-    ws['A1'].fill = PatternFill(start_color='2E75B5', end_color='2E75B5', fill_type='solid')
-    ws['A1'].alignment = Alignment(horizontal='center')
-    ws.merge_cells('A1:C1')
+    ws.write('A1', 'CONFIGURAZIONE ATTIVITÀ ESTERNE',
+             'Titolo foglio')
+    ws.merge('A1:C1')
     
     # INTESTAZIONI
-    ws['A3'] = 'Codice'
-    ws['B3'] = 'Descrizione'
-    ws['C3'] = 'Note'
-    for col in ['A3', 'B3', 'C3']:
-        ws[col].font = Font(bold=True)
-        ws[col].fill = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
-        ws[col].alignment = Alignment(horizontal='center')
+    for ref, testo in [('A3', 'Codice'), ('B3', 'Descrizione'), ('C3', 'Note')]:
+        ws.write(ref, testo, 'Intestazione')
     
     # DATI PREDEFINITI (Modificabili dall'utente)
     attivita = [
@@ -295,195 +731,128 @@ def create_att_esterne_sheet(wb):
     ]
     
     for idx, (sigla, desc, note) in enumerate(attivita, start=4):
-        ws[f'A{idx}'] = sigla
-        ws[f'B{idx}'] = desc
-        ws[f'C{idx}'] = note
-        
         # Proteggi solo la colonna A (codice)
-        ws[f'A{idx}'].font = Font(bold=True)
+        ws.write(f'A{idx}', sigla, 'Grassetto')
         
         # Evidenzia i progetti modificabili
-        if sigla.startswith('P'):
-            ws[f'B{idx}'].fill = PatternFill(start_color='FFF2CC', end_color='FFF2CC', fill_type='solid')
-            ws[f'C{idx}'].fill = PatternFill(start_color='FFF2CC', end_color='FFF2CC', fill_type='solid')
+        stile = 'Modificabile' if sigla.startswith('P') else None
+        ws.write(f'B{idx}', desc, stile)
+        ws.write(f'C{idx}', note, stile)
     
     # Range nascosto per validazione (riga 50+)
     for idx, (sigla, desc, note) in enumerate(attivita, start=50):
-        ws[f'B{idx}'] = sigla
+        ws.write(f'B{idx}', sigla)
     
     # Nascondi righe helper
-    for row in range(50, 70):
-        ws.row_dimensions[row].hidden = True
+    ws.hide_rows(50, 69)
     
     # Istruzioni
-    ws['A15'] = '💡 ISTRUZIONI:'
-    ws['A15'].font = Font(bold=True, size=11)
-    ws['A16'] = '1. Modifica la colonna "Descrizione" per i progetti P1-P5'
-    ws['A17'] = '2. Esempio: P1 = "Progetto Sostenibilità"'
-    ws['A18'] = '3. Le modifiche appariranno automaticamente nei PDF dei formatori'
-    
-    for row in [16, 17, 18]:
-        ws[f'A{row}'].alignment = Alignment(wrap_text=True)
-    
-    ws.column_dimensions['A'].width = 10
-    ws.column_dimensions['B'].width = 30
-    ws.column_dimensions['C'].width = 25
+    ws.write('A15', '💡 ISTRUZIONI:', 'Grassetto')
+    ws.write('A16', '1. Modifica la colonna "Descrizione" per i progetti P1-P5', 'A capo')
+    ws.write('A17', '2. Esempio: P1 = "Progetto Sostenibilità"', 'A capo')
+    ws.write('A18', '3. Le modifiche appariranno automaticamente nei PDF dei formatori', 'A capo')
+    
+    ws.set_width('A', 10)
+    ws.set_width('B', 30)
+    ws.set_width('C', 25)
 
-def create_aule_sheet(wb):
+def create_aule_sheet(backend):
     """Foglio AULE_1"""
-    ws = wb.create_sheet('AULE_1')
+    ws = backend.add_sheet('AULE_1')
     
-    ws['A1'] = 'AULE DISPONIBILI'
-    ws['A1'].font = Font(bold=True)
+    ws.write('A1', 'AULE DISPONIBILI', 'Grassetto')
     
     for idx, aula in enumerate(AULE_ATTIVITA.keys(), start=2):
-        ws[f'A{idx}'] = aula
+        ws.write(f'A{idx}', aula)
     
-    ws.column_dimensions['A'].width = 15
+    ws.set_width('A', 15)
+
+def formula_attivita_aula(col_aula, prima_riga):
+    """
+    Lista attività dipendente dall'aula della stessa riga.
+    La riga è relativa e scritta per prima_riga (cella in alto a sinistra dei
+    range della validazione): Excel la trasla su tutte le righe.
+    Aula vuota -> tutte le attività.
+    """
+    cella_aula = f'${get_column_letter(col_aula)}{prima_riga}'
+    return (f'=INDIRECT(IF({cella_aula}="","{NOME_TUTTE_ATTIVITA}",'
+            f'"{PREFISSO_ATTIVITA_AULA}"&{cella_aula}))')
 
-def add_validations_smart(ws, row):
+def add_validations_smart(ws, row, prima_riga):
     """
     Aggiunge validazioni INTELLIGENTI con:
     1. DataValidation per liste base
-    2. Formule per celle helper
+    2. Menu Attività filtrato in base all'aula (range nominati ATT_<aula>)
     3. Setup per conditional formatting
+    prima_riga: prima riga dati del foglio, riferimento delle formule relative
     """
     
     # ===== PERCORSO 1 (C-H) =====
-    # Formatore 1 (D)
-    dv = DataValidation(type="list", formula1='=FORMATORI!$A$51:$A$58', allow_blank=True)
-    dv.error = 'Seleziona un formatore valido'
-    dv.errorTitle = 'Formatore non valido'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=4))
-    
-    # Formatore 2 (E)
-    dv = DataValidation(type="list", formula1='=FORMATORI!$A$51:$A$58', allow_blank=True)
-    dv.error = 'Seleziona un formatore valido'
-    dv.errorTitle = 'Formatore non valido'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=5))
+    # Formatore 1 (D), Formatore 2 (E)
+    for col in [4, 5]:
+        ws.add_list_validation(row, col, LISTA_FORMATORI,
+                               error='Seleziona un formatore valido',
+                               error_title='Formatore non valido')
     
     # Aula (F)
-    dv = DataValidation(type="list", formula1='=CONTROLLO_AULE!$A$50:$A$54', allow_blank=True)
-    dv.error = 'Seleziona un\'aula valida'
-    dv.errorTitle = 'Aula non valida'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=6))
-    
-    # Attività (G) - CON VALIDAZIONE MIGLIORATA
-    # Mostra tutte le attività ma con prompt specifico per compatibilità
-    dv = DataValidation(type="list", formula1='=CONTROLLO_AULE!$C$50:$C$65', allow_blank=True)
-    dv.error = '⚠️ VERIFICA COMPATIBILITÀ!\n\n103/103a: tutte le attività\n108/110: AULA,CV,CS,RA\nUFF: UFF,COL,C'
-    dv.errorTitle = 'Attività - Verifica Aula'
-    dv.prompt = '⚠️ ATTENZIONE:\nSCEGLI PRIMA L\'AULA, POI VERIFICA:\n\n📌 103/103a: TUTTE le attività\n📌 108/110: solo AULA,CV,CS,RA\n📌 UFF: solo UFF,COL,C'
-    dv.promptTitle = '🏫 Compatibilità Aula-Attività'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=7))
+    ws.add_list_validation(row, 6, LISTA_AULE,
+                           error='Seleziona un\'aula valida',
+                           error_title='Aula non valida')
+    
+    # Attività (G) - SOLO LE ATTIVITÀ COMPATIBILI CON L'AULA (F)
+    ws.add_list_validation(
+        row, 7, formula_attivita_aula(6, prima_riga),
+        error='⚠️ Attività non compatibile con l\'aula scelta\n\n103/103a: tutte le attività\n108/110: AULA,CV,CS,RA\nUFF: UFF,COL,C',
+        error_title='Attività - Verifica Aula',
+        prompt='Scegli prima l\'aula: il menu mostra solo le attività compatibili',
+        prompt_title='🏫 Compatibilità Aula-Attività',
+        blocca=True
+    )
     
     # Test (H)
-    dv = DataValidation(type="list", formula1='=FORMATORI!$I$51:$I$55', allow_blank=True)
-    dv.error = 'Solo formatori TEST (per TT/TI)'
-    dv.errorTitle = 'Test'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=8))
-    
-    # ===== PERCORSO 2 (I-N) =====
-    for col in [10, 11]:  # Formatori
-        dv = DataValidation(type="list", formula1='=FORMATORI!$A$51:$A$58', allow_blank=True)
-        ws.add_data_validation(dv)
-        dv.add(ws.cell(row=row, column=col))
-    
-    dv = DataValidation(type="list", formula1='=CONTROLLO_AULE!$A$50:$A$54', allow_blank=True)
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=12))
-    
-    dv = DataValidation(type="list", formula1='=CONTROLLO_AULE!$C$50:$C$65', allow_blank=True)
-    dv.error = '⚠️ VERIFICA COMPATIBILITÀ!\n103/103a: tutte\n108/110: AULA,CV,CS,RA\nUFF: UFF,COL,C'
-    dv.errorTitle = 'Attività - Verifica Aula'
-    dv.prompt = '⚠️ SCEGLI PRIMA L\'AULA!\n\n103/103a: TUTTE\n108/110: AULA,CV,CS,RA\nUFF: UFF,COL,C'
-    dv.promptTitle = '🏫 Compatibilità'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=13))
-    
-    # Test percorso 2 (N/14)
-    dv = DataValidation(type="list", formula1='=FORMATORI!$I$51:$I$55', allow_blank=True)
-    dv.error = 'Solo formatori TEST (per TT/TI)'
-    dv.errorTitle = 'Test'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=14))
-    
-    # ===== PERCORSO 3 (O-T) =====
-    for col in [16, 17]:
-        dv = DataValidation(type="list", formula1='=FORMATORI!$A$51:$A$58', allow_blank=True)
-        ws.add_data_validation(dv)
-        dv.add(ws.cell(row=row, column=col))
-    
-    dv = DataValidation(type="list", formula1='=CONTROLLO_AULE!$A$50:$A$54', allow_blank=True)
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=18))
-    
-    dv = DataValidation(type="list", formula1='=CONTROLLO_AULE!$C$50:$C$65', allow_blank=True)
-    dv.error = '⚠️ VERIFICA COMPATIBILITÀ!\n103/103a: tutte\n108/110: AULA,CV,CS,RA\nUFF: UFF,COL,C'
-    dv.errorTitle = 'Attività - Verifica Aula'
-    dv.prompt = '⚠️ SCEGLI PRIMA L\'AULA!\n\n103/103a: TUTTE\n108/110: AULA,CV,CS,RA\nUFF: UFF,COL,C'
-    dv.promptTitle = '🏫 Compatibilità'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=19))
-    
-    # Test percorso 3 (T/20)
-    dv = DataValidation(type="list", formula1='=FORMATORI!$I$51:$I$55', allow_blank=True)
-    dv.error = 'Solo formatori TEST (per TT/TI)'
-    dv.errorTitle = 'Test'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=20))
-    # ===== PERCORSO 4 (U-Z) =====
-    for col in [22, 23]:
-        dv = DataValidation(type="list", formula1='=FORMATORI!$A$51:$A$58', allow_blank=True)
-        ws.add_data_validation(dv)
-        dv.add(ws.cell(row=row, column=col))
-    
-    dv = DataValidation(type="list", formula1='=CONTROLLO_AULE!$A$50:$A$54', allow_blank=True)
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=24))
-    
-    dv = DataValidation(type="list", formula1='=CONTROLLO_AULE!$C$50:$C$65', allow_blank=True)
-    dv.error = '⚠️ VERIFICA COMPATIBILITÀ!\n103/103a: tutte\n108/110: AULA,CV,CS,RA\nUFF: UFF,COL,C'
-    dv.errorTitle = 'Attività - Verifica Aula'
-    dv.prompt = '⚠️ SCEGLI PRIMA L\'AULA!\n\n103/103a: TUTTE\n108/110: AULA,CV,CS,RA\nUFF: UFF,COL,C'
-    dv.promptTitle = '🏫 Compatibilità'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=25))
-    
-    # Test percorso 4 (Z/26)
-    dv = DataValidation(type="list", formula1='=FORMATORI!$I$51:$I$55', allow_blank=True)
-    dv.error = 'Solo formatori TEST (per TT/TI)'
-    dv.errorTitle = 'Test'
-    ws.add_data_validation(dv)
-    dv.add(ws.cell(row=row, column=26))
+    ws.add_list_validation(row, 8, LISTA_FORMATORI_TEST,
+                           error='Solo formatori TEST (per TT/TI)',
+                           error_title='Test')
+    
+    # ===== PERCORSI 2-4 (I-N, O-T, U-Z) =====
+    for base in [9, 15, 21]:
+        for col in [base + 1, base + 2]:  # Formatori
+            ws.add_list_validation(row, col, LISTA_FORMATORI)
+        
+        ws.add_list_validation(row, base + 3, LISTA_AULE)
+        
+        ws.add_list_validation(
+            row, base + 4, formula_attivita_aula(base + 3, prima_riga),
+            error='⚠️ Attività non compatibile con l\'aula scelta\n103/103a: tutte\n108/110: AULA,CV,CS,RA\nUFF: UFF,COL,C',
+            error_title='Attività - Verifica Aula',
+            prompt='Scegli prima l\'aula: il menu mostra solo le attività compatibili',
+            prompt_title='🏫 Compatibilità',
+            blocca=True
+        )
+        
+        # Test percorso (N/14, T/20, Z/26)
+        ws.add_list_validation(row, base + 5, LISTA_FORMATORI_TEST,
+                               error='Solo formatori TEST (per TT/TI)',
+                               error_title='Test')
     
     # ===== FUORI AULA (AB-AK) =====
     # Alternanza: Form(28,30,32,34,36) + Att.Est(29,31,33,35,37) - colonne AB-AK
     
     # Formatori: colonne 28, 30, 32, 34, 36 (AB, AD, AF, AH, AJ)
     for col in [28, 30, 32, 34, 36]:
-        dv = DataValidation(type="list", formula1='=FORMATORI!$A$51:$A$58', allow_blank=True)
-        dv.error = 'Seleziona un formatore valido'
-        dv.errorTitle = 'Formatore non valido'
-        ws.add_data_validation(dv)
-        dv.add(ws.cell(row=row, column=col))
+        ws.add_list_validation(row, col, LISTA_FORMATORI,
+                               error='Seleziona un formatore valido',
+                               error_title='Formatore non valido')
     
     # Attività esterne: colonne 29, 31, 33, 35, 37 (AC, AE, AG, AI, AK)
     for col in [29, 31, 33, 35, 37]:
-        dv = DataValidation(type="list", formula1="='ATT. ESTERNE'!$B$50:$B$58", allow_blank=True)
-        dv.error = 'Seleziona un\'attività esterna valida'
-        dv.errorTitle = 'Attività Esterna'
-        dv.prompt = 'Attività svolte fuori dalle aule BCC'
-        dv.promptTitle = 'Attività Esterne'
-        ws.add_data_validation(dv)
-        dv.add(ws.cell(row=row, column=col))
-
-def add_conditional_formatting(ws, start_row, end_row):
+        ws.add_list_validation(row, col, "='ATT. ESTERNE'!$B$50:$B$58",
+                               error='Seleziona un\'attività esterna valida',
+                               error_title='Attività Esterna',
+                               prompt='Attività svolte fuori dalle aule BCC',
+                               prompt_title='Attività Esterne')
+
+def add_conditional_formatting(ws, blocchi_righe):
     """
     Aggiunge Conditional Formatting per evidenziare DUPLICATI
     
@@ -491,122 +860,115 @@ def add_conditional_formatting(ws, start_row, end_row):
     - Confronta ogni cella formatore con altre celle formatore nella stessa riga
     - Se trova duplicato → sfondo ROSSO
     - Confronta aule per duplicati → sfondo ROSSO
+    - Attività non compatibile con l'aula della riga → sfondo ARANCIO
+    
+    Le regole sono poche e applicate a interi blocchi di colonne: la formula usa
+    riferimenti relativi (riga e colonna) scritti per la prima cella del blocco,
+    Excel li trasla da solo su tutte le altre celle.
+    blocchi_righe: lista di (prima_riga, ultima_riga) con le sole righe dati
+    (una per mese, così le intestazioni mensili restano fuori dalle regole).
     """
     
+    def sqref(colonne):
+        """Range multiplo 'D7:E48 D51:E90 ...' per i blocchi di colonne dati"""
+        ranges = []
+        for col_inizio, col_fine in colonne:
+            for riga_inizio, riga_fine in blocchi_righe:
+                ranges.append(
+                    f'{get_column_letter(col_inizio)}{riga_inizio}:'
+                    f'{get_column_letter(col_fine)}{riga_fine}'
+                )
+        return ' '.join(ranges)
+    
+    prima_riga = blocchi_righe[0][0]
+    
     # FORMATORI: colonne D,E,J,K,P,Q,V,W + Fuori aula: AB,AD,AF,AH,AJ (28,30,32,34,36)
     formatori_cols = [4, 5, 10, 11, 16, 17, 22, 23, 28, 30, 32, 34, 36]
+    formatori_blocchi = [(4, 5), (10, 11), (16, 17), (22, 23), (28, 28), (30, 30), (32, 32), (34, 34), (36, 36)]
     
-    for row in range(start_row, end_row + 1):
-        for col in formatori_cols:
-            cell_ref = f'{get_column_letter(col)}{row}'
-            
-            # Formula per controllare se lo stesso valore appare in altre celle formatore
-            other_cols = [c for c in formatori_cols if c != col]
-            formula_parts = [f'{get_column_letter(c)}{row}={cell_ref}' for c in other_cols]
-            formula = f'=AND(LEN({cell_ref})>0, OR({",".join(formula_parts)}))'
-            
-            rule = FormulaRule(formula=[formula], fill=PatternFill(start_color=COLOR_DUPLICATE, end_color=COLOR_DUPLICATE, fill_type='solid'))
-            ws.conditional_formatting.add(cell_ref, rule)
+    # Formula scritta per la cella D{prima_riga}: conta quante celle formatore
+    # della stessa riga hanno lo stesso valore (la cella stessa conta 1)
+    cella = f'D{prima_riga}'
+    confronti = '+'.join(f'(${get_column_letter(c)}{prima_riga}={cella})' for c in formatori_cols)
+    formula = f'=AND(LEN({cella})>0,{confronti}>1)'
+    
+    ws.add_formula_format(sqref(formatori_blocchi), formula, COLOR_DUPLICATE)
     
     # AULE: colonne F, L, R, X (6, 12, 18, 24)
     aule_cols = [6, 12, 18, 24]
     
-    for row in range(start_row, end_row + 1):
-        for col in aule_cols:
-            cell_ref = f'{get_column_letter(col)}{row}'
-            
-            other_cols = [c for c in aule_cols if c != col]
-            formula_parts = [f'{get_column_letter(c)}{row}={cell_ref}' for c in other_cols]
-            formula = f'=AND(LEN({cell_ref})>0, OR({",".join(formula_parts)}))'
-            
-            rule = FormulaRule(formula=[formula], fill=PatternFill(start_color=COLOR_DUPLICATE, end_color=COLOR_DUPLICATE, fill_type='solid'))
-            ws.conditional_formatting.add(cell_ref, rule)
-    
-    # INCOMPATIBILITÀ AULA-ATTIVITÀ: evidenzia in ROSA
-    # Percorso 1: Aula F (6), Attività G (7)
-    # Percorso 2: Aula L (12), Attività M (13)
-    # Percorso 3: Aula R (18), Attività S (19)
-    # Percorso 4: Aula X (24), Attività Y (25)
-    
-    incompatibility_rules = [
-        # Formato: (col_aula, col_attivita)
-        (6, 7),    # Percorso 1
-        (12, 13),  # Percorso 2
-        (18, 19),  # Percorso 3
-        (24, 25),  # Percorso 4
-    ]
+    cella = f'F{prima_riga}'
+    confronti = '+'.join(f'(${get_column_letter(c)}{prima_riga}={cella})' for c in aule_cols)
+    formula = f'=AND(LEN({cella})>0,{confronti}>1)'
     
-    for row in range(start_row, end_row + 1):
-        for col_aula, col_attivita in incompatibility_rules:
-            cell_aula = f'{get_column_letter(col_aula)}{row}'
-            cell_att = f'{get_column_letter(col_attivita)}{row}'
-            
-            # Formula complessa per verificare compatibilità
-            # 108/110: solo AULA,CV,CS,RA
-            # UFF: solo UFF,COL,C
-            # 103/103a: tutte (nessuna incompatibilità)
-            formula = (
-                f'=AND('
-                f'LEN({cell_att})>0, '
-                f'OR('
-                # 108 con attività non compatibili
-                f'AND({cell_aula}="108", NOT(OR({cell_att}="AULA",{cell_att}="CV",{cell_att}="CS",{cell_att}="RA"))),'
-                # 110 con attività non compatibili
-                f'AND({cell_aula}="110", NOT(OR({cell_att}="AULA",{cell_att}="CV",{cell_att}="CS",{cell_att}="RA"))),'
-                # UFF con attività non compatibili
-                f'AND({cell_aula}="UFF", NOT(OR({cell_att}="UFF",{cell_att}="COL",{cell_att}="C")))'
-                f')'
-                f')'
-            )
-            
-            rule = FormulaRule(formula=[formula], fill=PatternFill(start_color=COLOR_WARNING, end_color=COLOR_WARNING, fill_type='solid'))
-            ws.conditional_formatting.add(cell_att, rule)
-
-def create_main_schedule_sheet(wb):
-    """Foglio 2026 - SISTEMA INTELLIGENTE"""
-    ws = wb.create_sheet('2026', 1)
+    ws.add_formula_format(sqref((c, c) for c in aule_cols), formula, COLOR_DUPLICATE)
     
-    # Titolo
-    ws['A1'] = 'ML5-05 Piano di dettaglio BCC'
-    ws['A1'].font = Font(bold=True, size=14)
-    ws.merge_cells('A1:G1')
+    # ATTIVITÀ: colonne G, M, S, Y (7, 13, 19, 25), aula nella colonna a sinistra.
+    # Il menu Attività controlla solo la cella attività: se l'aula viene cambiata
+    # dopo, l'attività non più compatibile (non in ATT_<aula>) resta evidenziata
+    attivita_cols = [7, 13, 19, 25]
     
-    ws['V1'] = f'Aggiornato il {datetime.now().strftime("%d.%m.%Y")}'
-    ws['V1'].font = Font(italic=True)
+    cella = f'G{prima_riga}'
+    cella_aula = f'F{prima_riga}'
+    formula = (f'=AND(LEN({cella})>0,LEN({cella_aula})>0,'
+               f'NOT(IFERROR(COUNTIF(INDIRECT("{PREFISSO_ATTIVITA_AULA}"&{cella_aula}),{cella})>0,FALSE)))')
+    
+    ws.add_formula_format(sqref((c, c) for c in attivita_cols), formula, COLOR_INCOMPATIBILE)
+
+def scrivi_titolo_piano(ws, leggero=False):
+    """Titolo e avviso (righe 1-2) di un foglio del piano"""
+    ws.write('A1', 'ML5-05 Piano di dettaglio BCC', 'Titolo piano')
+    ws.merge('A1:G1')
+    
+    ws.write('V1', f'Aggiornato il {datetime.now().strftime("%d.%m.%Y")}', 'Corsivo')
     
     # Istruzioni importanti
-    ws['A2'] = '⚠️ IMPORTANTE: Le celle ROSSE indicano DUPLICATI (formatori/aule ripetuti nello stesso turno)'
-    ws['A2'].font = Font(bold=True, color='FF0000', size=10)
-    ws.merge_cells('A2:Z2')
+    if leggero:
+        ws.write('A2', '⚠️ VERSIONE LEGGERA: duplicati e conteggi non sono evidenziati nel file, '
+                       'controllarli con sincronizza_risultati.py e con i PDF', 'Avviso')
+    else:
+        ws.write('A2', '⚠️ IMPORTANTE: Le celle ROSSE indicano DUPLICATI (formatori/aule ripetuti nello stesso turno), '
+                       'quelle ARANCIONI attività non compatibili con l\'aula',
+                 'Avviso')
+    ws.merge('A2:Z2')
+
+def create_main_schedule_sheet(backend, giorni=None, voci=None, nome=None, leggero=False):
+    """Foglio del piano (NOME_FOGLIO_PIANO, l'anno di DATA_INIZIO) - SISTEMA INTELLIGENTE
+    
+    giorni: giorni lavorativi da pianificare (predefinito: giorni_lavorativi())
+    voci: dati da precompilare {(data, turno): {colonna: valore}}
+    nome: nome del foglio (predefinito NOME_FOGLIO_PIANO; '2026 T1', '2026 GEN'... con il piano diviso)
+    leggero: senza conditional formatting dei duplicati (menu a tendina invariati)
+    Restituisce (prima_riga, ultima_riga) dei dati.
+    """
+    nome = nome or NOME_FOGLIO_PIANO
+    ws = backend.add_sheet(nome)
+    scrivi_titolo_piano(ws, leggero)
     
     current_row = 4
     
     # Genera giorni lavorativi
-    all_working_days = []
-    for month in range(1, 13):
-        num_days = calendar.monthrange(2026, month)[1]
-        for day in range(1, num_days + 1):
-            current_date = datetime(2026, month, day)
-            if not is_weekend(current_date) and not is_holiday(current_date):
-                all_working_days.append(current_date)
+    all_working_days = giorni if giorni is not None else giorni_lavorativi()
     
-    print(f"Giorni lavorativi totali: {len(all_working_days)}")
+    print(f"Giorni lavorativi {nome}: {len(all_working_days)}")
     
     current_month = None
     first_data_row = None
+    blocchi_righe = []  # (prima_riga, ultima_riga) delle righe dati di ogni mese
     
     for date_idx, current_date in enumerate(all_working_days):
-        if current_date.month != current_month:
-            current_month = current_date.month
-            month_name = calendar.month_name[current_month].upper()
+        if (current_date.year, current_date.month) != current_month:
+            if current_month is not None:
+                blocchi_righe.append((blocco_inizio, current_row - 1))
+            current_month = (current_date.year, current_date.month)
+            month_name = calendar.month_name[current_date.month].upper()
             
             # Header mese
-            ws.cell(row=current_row, column=1, value=month_name).font = Font(bold=True, size=12)
-            ws.cell(row=current_row, column=1).fill = PatternFill(start_color=COLOR_MONTH, end_color=COLOR_MONTH, fill_type='solid')
-            ws.merge_cells(f'A{current_row}:B{current_row}')
+            ws.cell(current_row, 1, month_name, 'Mese')
+            ws.merge(f'A{current_row}:B{current_row}')
             
-            ws.cell(row=current_row, column=3, value='BCC')
-            ws.cell(row=current_row, column=28, value='Fuori aula').font = Font(bold=True)
+            ws.cell(current_row, 3, 'BCC')
+            ws.cell(current_row, 28, 'Fuori aula', 'Grassetto')
             
             current_row += 1
             
@@ -614,85 +976,363 @@ def create_main_schedule_sheet(wb):
             headers = [
                 (1, '#REF!+1'), (2, 'Turno'),
                 # Percorso 1
-                (3, 'percorso'), (4, 'Formatore 1'), (5, 'Formatore 2'), 
+                (3, 'percorso'), (4, 'Formatore 1'), (5, 'Formatore 2'),
                 (6, 'Aula'), (7, 'Attività'), (8, 'Test'),
                 # Percorso 2
-                (9, 'percorso'), (10, 'Formatore 1'), (11, 'Formatore 2'), 
+                (9, 'percorso'), (10, 'Formatore 1'), (11, 'Formatore 2'),
                 (12, 'Aula'), (13, 'Attività'), (14, 'Test'),
                 # Percorso 3
-                (15, 'percorso'), (16, 'Formatore 1'), (17, 'Formatore 2'), 
+                (15, 'percorso'), (16, 'Formatore 1'), (17, 'Formatore 2'),
                 (18, 'Aula'), (19, 'Attività'), (20, 'Test'),
                 # Percorso 4
-                (21, 'percorso'), (22, 'Formatore 1'), (23, 'Formatore 2'), 
+                (21, 'percorso'), (22, 'Formatore 1'), (23, 'Formatore 2'),
                 (24, 'Aula'), (25, 'Attività'), (26, 'Test'),
                 # Fine corso + Fuori aula
                 (27, 'Fine corso'),
                 # Fuori aula: 5 coppie formatore-attività
-                (28, 'Form.1'), (29, 'Att.Est.1'), (30, 'Form.2'), (31, 'Att.Est.2'), 
+                (28, 'Form.1'), (29, 'Att.Est.1'), (30, 'Form.2'), (31, 'Att.Est.2'),
                 (32, 'Form.3'), (33, 'Att.Est.3'), (34, 'Form.4'), (35, 'Att.Est.4'),
                 (36, 'Form.5'), (37, 'Att.Est.5')
             ]
             
             for col, header_text in headers:
-                cell = ws.cell(row=current_row, column=col, value=header_text)
-                cell.font = Font(bold=True, size=9)
-                cell.fill = PatternFill(start_color=COLOR_HEADER, end_color=COLOR_HEADER, fill_type='solid')
-                cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+                ws.cell(current_row, col, header_text,
+                        'Intestazione piano')
             
             current_row += 1
+            blocco_inizio = current_row
         
         if first_data_row is None:
             first_data_row = current_row
         
         # Riga Mattina
-        ws.cell(row=current_row, column=1, value=current_date).number_format = 'DD/MM/YYYY'
-        ws.cell(row=current_row, column=2, value='mattina')
-        ws.cell(row=current_row, column=2).fill = PatternFill(start_color=COLOR_MORNING, end_color=COLOR_MORNING, fill_type='solid')
+        ws.cell(current_row, 1, current_date, 'Data')
+        ws.cell(current_row, 2, 'mattina', 'Mattina')
         
-        add_validations_smart(ws, current_row)
+        add_validations_smart(ws, current_row, first_data_row)
+        for col, valore in (voci or {}).get((current_date, 'mattina'), {}).items():
+            ws.cell(current_row, col, valore)
         current_row += 1
         
         # Riga Pomeriggio
-        ws.cell(row=current_row, column=2, value='Pomeriggio')
-        ws.cell(row=current_row, column=2).fill = PatternFill(start_color=COLOR_AFTERNOON, end_color=COLOR_AFTERNOON, fill_type='solid')
+        ws.cell(current_row, 2, 'Pomeriggio', 'Pomeriggio')
         
-        add_validations_smart(ws, current_row)
+        add_validations_smart(ws, current_row, first_data_row)
+        for col, valore in (voci or {}).get((current_date, 'Pomeriggio'), {}).items():
+            ws.cell(current_row, col, valore)
         current_row += 1
     
     last_data_row = current_row - 1
+    blocchi_righe.append((blocco_inizio, last_data_row))
     
     # APPLICA CONDITIONAL FORMATTING per evidenziare DUPLICATI
-    print(f"Applicazione Conditional Formatting righe {first_data_row}-{last_data_row}...")
-    add_conditional_formatting(ws, first_data_row, last_data_row)
+    if not leggero:
+        print(f"Applicazione Conditional Formatting righe {first_data_row}-{last_data_row}...")
+        add_conditional_formatting(ws, blocchi_righe)
     
     # Larghezza colonne
-    ws.column_dimensions['A'].width = 12
-    ws.column_dimensions['B'].width = 12
+    ws.set_width('A', 12)
+    ws.set_width('B', 12)
     for col_idx in range(3, 38):  # Fino a colonna 37 (AK)
-        ws.column_dimensions[get_column_letter(col_idx)].width = 11
+        ws.set_width(get_column_letter(col_idx), 11)
+    
+    if not leggero:
+        print("✅ Conditional Formatting applicato - Duplicati verranno evidenziati in ROSSO")
+    
+    return first_data_row, last_data_row
+
+def create_table_schedule_sheet(backend, giorni=None, voci=None, nome=None, leggero=False):
+    """Foglio del piano come tabella Excel unica: una riga per turno, data su ogni riga
+    
+    Stesse colonne, menu a tendina e duplicati del layout per mesi, senza
+    bande e intestazioni mensili: filtri e ordinamento di Excel lavorano
+    sull'intera tabella. Restituisce (prima_riga, ultima_riga) dei dati.
+    """
+    nome = nome or NOME_FOGLIO_PIANO
+    ws = backend.add_sheet(nome)
+    scrivi_titolo_piano(ws, leggero)
+    
+    all_working_days = giorni if giorni is not None else giorni_lavorativi()
+    print(f"Giorni lavorativi {nome}: {len(all_working_days)} (tabella)")
+    
+    for col, testo in enumerate(INTESTAZIONI_TABELLA, start=1):
+        ws.cell(RIGA_INTESTAZIONE_TABELLA, col, testo, 'Intestazione piano')
+    
+    first_data_row = current_row = RIGA_INTESTAZIONE_TABELLA + 1
+    for current_date in all_working_days:
+        for turno in ['mattina', 'Pomeriggio']:
+            ws.cell(current_row, 1, current_date, 'Data')
+            ws.cell(current_row, 2, turno, 'Mattina' if turno == 'mattina' else 'Pomeriggio')
+            
+            add_validations_smart(ws, current_row, first_data_row)
+            for col, valore in (voci or {}).get((current_date, turno), {}).items():
+                ws.cell(current_row, col, valore)
+            current_row += 1
+    
+    last_data_row = current_row - 1
+    ultima_colonna = get_column_letter(len(INTESTAZIONI_TABELLA))
+    ws.add_table(f'A{RIGA_INTESTAZIONE_TABELLA}:{ultima_colonna}{last_data_row}',
+                 'Turni_' + nome.replace(' ', '_'), INTESTAZIONI_TABELLA)
+    
+    if not leggero:
+        print(f"Applicazione Conditional Formatting righe {first_data_row}-{last_data_row}...")
+        add_conditional_formatting(ws, [(first_data_row, last_data_row)])
     
-    print("✅ Conditional Formatting applicato - Duplicati verranno evidenziati in ROSSO")
+    ws.set_width('A', 12)
+    ws.set_width('B', 12)
+    for col_idx in range(3, len(INTESTAZIONI_TABELLA) + 1):
+        ws.set_width(get_column_letter(col_idx), 11)
+    
+    return first_data_row, last_data_row
+
+FOGLI_PER_LAYOUT = {
+    'mesi': create_main_schedule_sheet,
+    'tabella': create_table_schedule_sheet,
+}
+
+# ===== PRECOMPILAZIONE DA FILE =====
+# Assegnazioni preparate fuori da Excel (CSV, JSON o SQLite), una per riga:
+#   data        GG/MM/AAAA o AAAA-MM-GG
+#   turno       mattina / pomeriggio
+#   blocco      1-4 = percorso, F = fuori aula
+#   corso, formatore1, formatore2, aula, attivita, test
+# Per il fuori aula servono formatore1 e attivita (attività esterna): va nella
+# prima coppia Form./Att.Est. libera del turno.
+# SQLite: tabella 'assegnazioni' con le stesse colonne.
 
-def main():
+CAMPI_PERCORSO = ['corso', 'formatore1', 'formatore2', 'aula', 'attivita', 'test']
+COLONNE_PERCORSI = {'1': 3, '2': 9, '3': 15, '4': 21}  # colonna 'percorso' di ogni blocco
+COLONNE_FUORI_AULA = [(28, 29), (30, 31), (32, 33), (34, 35), (36, 37)]
+
+def leggi_assegnazioni(filename):
+    """Righe del file sorgente come dizionari (chiavi in minuscolo)"""
+    estensione = os.path.splitext(filename)[1].lower()
+    if estensione == '.csv':
+        with open(filename, newline='', encoding='utf-8-sig') as f:
+            # Excel italiano esporta CSV separati da ';'
+            dialetto = csv.Sniffer().sniff(f.readline(), delimiters=';,')
+            f.seek(0)
+            return list(csv.DictReader(f, dialect=dialetto))
+    if estensione == '.json':
+        with open(filename, encoding='utf-8') as f:
+            return json.load(f)
+    if estensione in ('.db', '.sqlite', '.sqlite3'):
+        conn = sqlite3.connect(filename)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(riga) for riga in conn.execute('SELECT * FROM assegnazioni')]
+        finally:
+            conn.close()
+    raise ValueError(f"Formato non supportato: {filename} (usa .csv, .json o .db/.sqlite)")
+
+def _leggi_data(valore):
+    for formato in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime((valore or '')[:10], formato)
+        except ValueError:
+            pass
+    raise ValueError(valore)
+
+def valida_assegnazioni(righe, giorni):
+    """
+    Controlla ogni assegnazione e la colloca nel suo turno.
+    Restituisce (voci, errori): voci = {(data, turno): {colonna: valore}},
+    errori = [(n. assegnazione, messaggio)] per quelle scartate.
+    """
+    giorni_pianificati = set(giorni)
+    voci = defaultdict(dict)
+    formatori_turno = defaultdict(set)
+    aule_turno = defaultdict(set)
+    errori = []
+    
+    for n, riga in enumerate(righe, start=1):
+        riga = {chiave.strip().lower(): (str(valore).strip() if valore not in (None, '') else None)
+                for chiave, valore in riga.items() if chiave}
+        try:
+            data = _leggi_data(riga.get('data'))
+        except ValueError:
+            errori.append((n, f"data non valida: {riga.get('data')}"))
+            continue
+        turno = {'mattina': 'mattina', 'pomeriggio': 'Pomeriggio'}.get((riga.get('turno') or '').lower())
+        if turno is None:
+            errori.append((n, f"turno non valido: {riga.get('turno')}"))
+            continue
+        if data not in giorni_pianificati:
+            errori.append((n, f"{data.strftime('%d/%m/%Y')} non è un giorno pianificato"))
+            continue
+        
+        chiave = (data, turno)
+        blocco = (riga.get('blocco') or '').upper()
+        formatori = [f for f in (riga.get('formatore1'), riga.get('formatore2')) if f]
+        
+        # Formatori esistenti e liberi nel turno
+        sconosciuti = [f for f in formatori if f not in FORMATORI]
+        if riga.get('test') and riga['test'] not in FORMATORI_TEST:
+            sconosciuti.append(riga['test'])
+        if sconosciuti:
+            errori.append((n, f"formatore non in elenco: {', '.join(sconosciuti)}"))
+            continue
+        occupati = [f for f in formatori if f in formatori_turno[chiave]]
+        if len(set(formatori)) < len(formatori):
+            occupati.append(formatori[0])
+        if occupati:
+            errori.append((n, f"{', '.join(occupati)} già impegnato il {data.strftime('%d/%m/%Y')} {turno}"))
+            continue
+        
+        if blocco == 'F':
+            if len(formatori) != 1 or not riga.get('attivita'):
+                errori.append((n, "fuori aula: servono un formatore e l'attività esterna"))
+                continue
+            libere = [coppia for coppia in COLONNE_FUORI_AULA if coppia[0] not in voci[chiave]]
+            if not libere:
+                errori.append((n, "fuori aula: tutte e 5 le coppie del turno sono occupate"))
+                continue
+            col_formatore, col_attivita = libere[0]
+            voci[chiave][col_formatore] = formatori[0]
+            voci[chiave][col_attivita] = riga['attivita']
+        elif blocco in COLONNE_PERCORSI:
+            base = COLONNE_PERCORSI[blocco]
+            aula, attivita = riga.get('aula'), riga.get('attivita')
+            if any(base + offset in voci[chiave] for offset in range(len(CAMPI_PERCORSO))):
+                errori.append((n, f"percorso {blocco} già compilato nel turno"))
+                continue
+            if aula and aula not in AULE_ATTIVITA:
+                errori.append((n, f"aula sconosciuta: {aula}"))
+                continue
+            if aula and attivita and attivita not in AULE_ATTIVITA[aula]:
+                errori.append((n, f"attività {attivita} non compatibile con aula {aula}"))
+                continue
+            if aula and aula in aule_turno[chiave]:
+                errori.append((n, f"aula {aula} già occupata nel turno"))
+                continue
+            if aula:
+                aule_turno[chiave].add(aula)
+            for offset, campo in enumerate(CAMPI_PERCORSO):
+                if riga.get(campo):
+                    voci[chiave][base + offset] = riga[campo]
+        else:
+            errori.append((n, f"blocco non valido: {riga.get('blocco')} (1-4 o F)"))
+            continue
+        
+        formatori_turno[chiave].update(formatori)
+    
+    return voci, errori
+
+# ===== GENERAZIONE IN BATCH =====
+# Un file per ogni specifica (anno, sede) in un file JSON:
+# [
+#   {"anno": 2027, "sede": "Milano",
+#    "formatori": ["CL", "MC"], "formatori_test": ["URS"],
+#    "aule_attivita": {"103": ["AULA", "CV"], "UFF": ["UFF", "COL", "C"]},
+#    "festivita": ["10/08/2027", "11/08/2027"], "suddivisione": "trimestre", "layout": "tabella"}
+# ]
+# Le chiavi mancanti usano la configurazione in cima al file; "festivita"
+# si aggiunge alle festività nazionali dell'anno, "suddivisione", "layout" e
+# "leggero" come le opzioni omonime (predefinito: un solo foglio per mesi). Ogni file è creato in un
+# processo separato: la configurazione del processo viene sostituita da
+# quella della specifica prima di chiamare main().
+
+CONFIGURAZIONE_PREDEFINITA = {
+    'FORMATORI': FORMATORI,
+    'FORMATORI_TEST': FORMATORI_TEST,
+    'AULE_ATTIVITA': AULE_ATTIVITA,
+}
+
+def applica_specifica(spec):
+    """Imposta la configurazione del modulo per una specifica del batch"""
+    configurazione = dict(CONFIGURAZIONE_PREDEFINITA)
+    for chiave, nome in [('formatori', 'FORMATORI'), ('formatori_test', 'FORMATORI_TEST'),
+                         ('aule_attivita', 'AULE_ATTIVITA')]:
+        if chiave in spec:
+            configurazione[nome] = spec[chiave]
+    
+    anno = spec['anno']
+    ferie = [datetime.strptime(data, '%d/%m/%Y') for data in spec.get('festivita', [])]
+    configurazione['FESTIVITA'] = sorted(set(festivita_nazionali(anno) + ferie))
+    configurazione['DATA_INIZIO'] = datetime(anno, 1, 1)
+    configurazione['DATA_FINE'] = datetime(anno, 12, 31)
+    configurazione['NOME_FOGLIO_PIANO'] = str(anno)
+    configurazione['LISTA_FORMATORI'] = f'=FORMATORI!$A$51:$A${50 + len(configurazione["FORMATORI"])}'
+    configurazione['LISTA_FORMATORI_TEST'] = f'=FORMATORI!$I$51:$I${50 + len(configurazione["FORMATORI_TEST"])}'
+    configurazione['LISTA_AULE'] = f'=CONTROLLO_AULE!$A$50:$A${49 + len(configurazione["AULE_ATTIVITA"])}'
+    globals().update(configurazione)
+
+def nome_file_specifica(spec):
+    sede = spec.get('sede')
+    return f"Pianificazione_Corsi_{spec['anno']}{'_' + sede.replace(' ', '_') if sede else ''}.xlsx"
+
+def genera_da_specifica(spec, backend, cartella):
+    """Eseguita nel processo worker: restituisce (file, secondi, byte)"""
+    applica_specifica(spec)
+    filename = os.path.join(cartella, nome_file_specifica(spec))
+    
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        main(backend, filename, suddivisione=spec.get('suddivisione', 'anno'), layout=spec.get('layout', 'mesi'),
+             leggero=spec.get('leggero', False))
+    return filename, time.perf_counter() - start, os.path.getsize(filename)
+
+def main_batch(file_specifiche, backend='xlsxwriter', cartella='.', processi=None):
+    with open(file_specifiche, encoding='utf-8') as f:
+        specifiche = json.load(f)
+    os.makedirs(cartella, exist_ok=True)
+    
     print("=" * 70)
-    print("🎓 PIANIFICAZIONE CORSI 2026 - SISTEMA INTELLIGENTE")
+    print(f"🏭 GENERAZIONE BATCH: {len(specifiche)} file (backend: {backend})")
     print("=" * 70)
-    print()
     
-    wb = Workbook()
-    wb.remove(wb.active)
+    start = time.perf_counter()
+    errori = []
+    with ProcessPoolExecutor(max_workers=processi) as executor:
+        futures = {executor.submit(genera_da_specifica, spec, backend, cartella): spec for spec in specifiche}
+        for future in as_completed(futures):
+            spec = futures[future]
+            try:
+                filename, secondi, dimensione = future.result()
+                print(f"  ✅ {os.path.basename(filename):<45} {secondi:6.2f}s {dimensione / 1024:8.1f} KB")
+            except Exception as e:
+                errori.append((nome_file_specifica(spec), str(e)))
+                print(f"  ❌ {nome_file_specifica(spec)}: {e}")
+    
+    print()
+    print(f"⏱️  Totale: {time.perf_counter() - start:.2f}s per {len(specifiche) - len(errori)} file in {cartella}")
+    if errori:
+        print(f"⚠️  {len(errori)} file non creati")
+    return errori
+
+def main(backend='openpyxl', filename='Pianificazione_Corsi_2026.xlsx', precompila=None, suddivisione='anno',
+         layout='mesi', leggero=False):
+    print("=" * 70)
+    print(f"🎓 PIANIFICAZIONE CORSI {DATA_INIZIO.year} - SISTEMA INTELLIGENTE")
+    print("=" * 70)
+    print()
     
-    print("📋 Creazione fogli...")
-    create_assumptions_sheet(wb)
-    create_main_schedule_sheet(wb)
-    create_aule_sheet(wb)
-    create_formatori_sheet(wb)
-    create_controllo_aule_sheet(wb)
-    create_att_esterne_sheet(wb)
+    voci = None
+    errori = []
+    if precompila:
+        print(f"📥 Lettura assegnazioni: {precompila}...")
+        righe = leggi_assegnazioni(precompila)
+        voci, errori = valida_assegnazioni(righe, giorni_lavorativi())
+        print(f"   {len(righe) - len(errori)} assegnazioni valide, {len(errori)} scartate")
+        for n, messaggio in errori:
+            print(f"   ❌ assegnazione {n}: {messaggio}")
+        print()
+    
+    writer = BACKENDS[backend](filename, tabelle=(layout == 'tabella'))
+    
+    print(f"📋 Creazione fogli (backend: {writer.nome})...")
+    create_assumptions_sheet(writer)
+    righe_piano = [
+        (nome,) + FOGLI_PER_LAYOUT[layout](writer, giorni, voci, nome, leggero)
+        for nome, giorni in periodi_piano(giorni_lavorativi(), suddivisione)
+    ]
+    create_aule_sheet(writer)
+    create_formatori_sheet(writer, righe_piano, leggero)
+    create_controllo_aule_sheet(writer)
+    create_att_esterne_sheet(writer)
     
-    filename = 'Pianificazione_Corsi_2026.xlsx'
     print(f"\n💾 Salvataggio: {filename}...")
-    wb.save(filename)
+    writer.save()
     
     print()
     print("=" * 70)
@@ -701,12 +1341,45 @@ def main():
     print()
     print("🎯 FUNZIONALITÀ IMPLEMENTATE:")
     print("  ✅ Menu a tendina per formatori, aule, attività")
-    print("  ✅ CONDITIONAL FORMATTING: Duplicati evidenziati in ROSSO")
-    print("  ✅ Prompt per ricordare compatibilità aula-attività")
-    print("  ✅ Sezioni separate per ogni aula (per future implementazioni)")
+    if leggero:
+        print("  ✅ VERSIONE LEGGERA: niente formule né conditional formatting,")
+        print("     controlli con sincronizza_risultati.py e nei PDF")
+    else:
+        print("  ✅ CONDITIONAL FORMATTING: Duplicati evidenziati in ROSSO")
+        print("  ✅ Attività non compatibili con l'aula (aula cambiata dopo) in ARANCIO")
+    print("  ✅ Menu Attività filtrato in base all'aula (INDIRECT)")
+    print("  ✅ Range nominati ATT_<aula> nel foglio CONTROLLO_AULE")
+    if layout == 'tabella':
+        print("  ✅ Piano come tabella Excel: una riga per turno, filtri e ordinamento")
+    if len(righe_piano) > 1:
+        print(f"  ✅ Piano diviso in {len(righe_piano)} fogli ({suddivisione}), totali in FORMATORI")
     print()
     print("📁 File:", filename)
     print("=" * 70)
+    return errori
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Crea il file Excel di pianificazione corsi')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='openpyxl',
+                        help='libreria di scrittura (xlsxwriter = constant_memory, più veloce)')
+    parser.add_argument('--output', default='Pianificazione_Corsi_2026.xlsx', help='file Excel da creare')
+    parser.add_argument('--precompila', metavar='FILE',
+                        help='assegnazioni da scrivere nel foglio del piano (.csv, .json, .db/.sqlite)')
+    parser.add_argument('--suddivisione', choices=SUDDIVISIONI, default='anno',
+                        help='un foglio per l\'anno o uno per trimestre / mese')
+    parser.add_argument('--layout', choices=LAYOUT, default='mesi',
+                        help='mesi = intestazioni per ogni mese, tabella = tabella Excel con una riga per turno')
+    parser.add_argument('--leggero', action='store_true',
+                        help='senza formule né conditional formatting (controlli con sincronizza_risultati.py)')
+    parser.add_argument('--batch', metavar='SPECIFICHE.json',
+                        help='crea un file per ogni specifica (anno, sede) in processi paralleli')
+    parser.add_argument('--cartella', default='.', help='cartella dei file creati in batch')
+    parser.add_argument('--processi', type=int, help='numero di processi worker (predefinito: CPU)')
+    args = parser.parse_args()
+    
+    if args.batch:
+        errori = main_batch(args.batch, args.backend, args.cartella, args.processi)
+        sys.exit(1 if errori else 0)
+    else:
+        errori = main(args.backend, args.output, args.precompila, args.suddivisione, args.layout, args.leggero)
+        sys.exit(1 if errori else 0)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+COLORI E STILI CONDIVISI
+========================
+
+Unico punto in cui sono definiti i colori usati da:
+- crea_pianificazione_smart.py (file Excel)
+- genera_stampe_pdf.py / genera_stampe_pdf_filtrati.py (PDF)
+- genera_report_html.py (pagine HTML dei report)
+
+I colori sono in formato esadecimale RRGGBB senza '#'
+(openpyxl/xlsxwriter li usano così, reportlab con colors.HexColor('#' + colore)).
+"""
+
+# PALETTE
+BLU_SCURO = '1F4E78'       # Titoli PDF, testo intestazioni tabelle
+BLU = '2E75B5'             # Titoli fogli Excel, sottotitoli PDF
+BLU_REPORT = '1A5490'      # Report settimanali e specifici
+AZZURRO = 'D9E1F2'         # Intestazioni tabelle (Excel e PDF)
+AZZURRO_CHIARO = 'E8F0F8'  # Legenda attività PDF
+BLU_MESE = 'B4C7E7'        # Banda mese nel foglio 2026
+GRIGIO_RIGA = 'F2F2F2'     # Righe alterne PDF
+VERDE_MATTINA = 'E2EFDA'   # Turno mattina
+GIALLO = 'FFF2CC'          # Turno pomeriggio, campi modificabili
+VERDE_SVOLTI = 'E8F4EA'    # Colonna n.giorni svolti
+ARANCIO = 'FFC000'         # Sezione festività, attività non compatibili con l'aula
+ROSSO = 'FF0000'           # Duplicati, avvisi
+BIANCO = 'FFFFFF'
+
+# 40 colori per percorsi (uno per percorso)
+COLORI_PERCORSI = [
+    'B4C7E7', 'F8CBAD', 'C5E0B4', 'FFE699', 'B4C7E7', 'D5A6BD',
+    'A9D08E', 'F4B084', 'BDD7EE', 'F8CBAD', 'C6E0B4', 'FFD966',
+    '9DC3E6', 'F4B183', 'A8D08D', 'FFEB9C', '8FAADC', 'E2A293',
+    '9BBB59', 'FFD556', '7FA7D0', 'D99694', '92D050', 'FFC000',
+    '6FA8DC', 'CC8899', '76A35D', 'F9CB9C', '5B9BD5', 'B38EAC',
+    '70AD47', 'ED7D31', '4A7EBB', 'A87B9C', '548235', 'C65911',
+    '385D8A', '9B6B81', '375623', 'A04D00'
+]
+
+# STILI EXCEL CON NOME
+# Registrati una sola volta nel workbook (NamedStyle) e applicati per nome.
+# Chiavi: bold, italic, size, color (font), fill, align, valign, wrap, num_format
+STILI_EXCEL = {
+    'Titolo foglio': {'bold': True, 'size': 14, 'color': BIANCO, 'fill': BLU, 'align': 'center'},
+    'Titolo piano': {'bold': True, 'size': 14},
+    'Avviso': {'bold': True, 'size': 10, 'color': ROSSO},
+    'Intestazione': {'bold': True, 'fill': AZZURRO, 'align': 'center'},
+    'Intestazione a capo': {'bold': True, 'align': 'center', 'wrap': True},
+    'Intestazione svolti': {'bold': True, 'align': 'center', 'wrap': True, 'fill': VERDE_SVOLTI},
+    'Intestazione piano': {'bold': True, 'size': 9, 'fill': AZZURRO,
+                           'align': 'center', 'valign': 'center', 'wrap': True},
+    'Sezione festività': {'bold': True, 'size': 12, 'fill': ARANCIO},
+    'Mese': {'bold': True, 'size': 12, 'fill': BLU_MESE},
+    'Mattina': {'fill': VERDE_MATTINA},
+    'Pomeriggio': {'fill': GIALLO},
+    'Modificabile': {'fill': GIALLO},
+    'Giorni svolti': {'fill': VERDE_SVOLTI},
+    'Grassetto': {'bold': True},
+    'Corsivo': {'italic': True},
+    'Centrato': {'align': 'center'},
+    'A capo': {'wrap': True},
+    'Data': {'num_format': 'DD/MM/YYYY'},
+    'Percentuale': {'num_format': '0%'},
+}
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+AGGIORNAMENTO INCREMENTALE DEL FILE DI PIANIFICAZIONE
+=====================================================
+
+Applica a un file Excel già compilato le modifiche di struttura fatte nella
+CONFIGURAZIONE di crea_pianificazione_smart.py, senza perdere i dati inseriti:
+
+- nuovi formatori / formatori TEST  -> liste, menu a tendina, riga in FORMATORI
+- nuove aule o attività compatibili -> liste, range nominati ATT_<aula>, AULE_1
+- festività cambiate / periodo esteso (DATA_FINE o --fino-al)
+                                    -> foglio 2026 ricostruito e ricompilato
+                                       (per mesi o tabella, come nel file)
+
+Vengono toccati solo i range interessati: se la configurazione coincide con
+il file non viene modificato nulla.
+I blocchi percorso restano 4: le colonne del foglio 2026 sono lette in
+posizione fissa da genera_stampe_pdf.py.
+
+Uso:
+    python3 aggiorna_pianificazione.py Pianificazione_Corsi_2026.xlsx
+    python3 aggiorna_pianificazione.py Pianificazione_Corsi_2026.xlsx --fino-al 29/01/2027
+"""
+
+from openpyxl import load_workbook
+from datetime import datetime
+from copy import copy
+import argparse
+import re
+import sys
+import time
+
+from crea_pianificazione_smart import (
+    FORMATORI, FORMATORI_TEST, AULE_ATTIVITA, FESTIVITA, DATA_INIZIO, DATA_FINE,
+    PREFISSO_ATTIVITA_AULA, NOME_TUTTE_ATTIVITA,
+    OpenpyxlBackend, create_main_schedule_sheet, create_table_schedule_sheet, giorni_lavorativi,
+)
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.workbook.defined_name import DefinedName
+
+# Righe helper nascoste (50-69) usate dalle liste dei menu a tendina
+ULTIMA_RIGA_HELPER = 69
+
+# Colonne dati del foglio 2026: percorsi C-Z, Fine corso AA, Fuori aula AB-AK
+PRIMA_COLONNA_DATI = 3
+ULTIMA_COLONNA_DATI = 37
+
+
+def leggi_lista(ws, col, riga_inizio):
+    """Valori consecutivi di una lista helper (fino alla prima cella vuota)"""
+    valori = []
+    for row in range(riga_inizio, ULTIMA_RIGA_HELPER + 1):
+        valore = ws.cell(row=row, column=col).value
+        if valore in (None, ''):
+            break
+        valori.append(str(valore))
+    return valori
+
+
+def scrivi_lista(ws, col, riga_inizio, valori):
+    """Riscrive una lista helper e svuota le righe rimaste"""
+    if riga_inizio + len(valori) - 1 > ULTIMA_RIGA_HELPER:
+        raise ValueError(f"Lista troppo lunga per le righe helper {riga_inizio}-{ULTIMA_RIGA_HELPER}")
+    for row in range(riga_inizio, ULTIMA_RIGA_HELPER + 1):
+        idx = row - riga_inizio
+        ws.cell(row=row, column=col).value = valori[idx] if idx < len(valori) else None
+
+
+def allinea_validazioni(wb):
+    """
+    Porta i menu a tendina del foglio 2026 alla lunghezza attuale delle liste
+    helper (formatori, formatori TEST, aule)
+    """
+    liste = [('FORMATORI', 'A', 51), ('FORMATORI', 'I', 51), ('CONTROLLO_AULE', 'A', 50)]
+    for foglio, lettera, riga_inizio in liste:
+        n = len(leggi_lista(wb[foglio], column_index_from_string(lettera), riga_inizio))
+        modello = re.compile(rf'{foglio}!\${lettera}\${riga_inizio}:\${lettera}\$\d+')
+        nuovo = f'{foglio}!${lettera}${riga_inizio}:${lettera}${riga_inizio + n - 1}'
+        for ws in fogli_piano(wb):
+            for dv in ws.data_validations.dataValidation:
+                if dv.formula1:
+                    dv.formula1 = modello.sub(lambda m: nuovo, dv.formula1)
+
+
+def fogli_piano(wb):
+    """Foglio dell'anno ('2026') oppure fogli per trimestre / mese ('2026 T1', '2026 GEN'...)"""
+    return [wb[nome] for nome in wb.sheetnames if re.fullmatch(r'\d{4}( \S+)?', nome)]
+
+
+def foglio_anno(wb):
+    """Nome del foglio del piano di un anno intero ('2026'), None se il piano è diviso"""
+    return next((nome for nome in wb.sheetnames if re.fullmatch(r'\d{4}', nome)), None)
+
+
+def aggiorna_formatori(wb):
+    """Aggiunge i formatori presenti in configurazione ma non nel file"""
+    ws = wb['FORMATORI']
+    modifiche = []
+    
+    # (colonna lista e tabella, configurazione, descrizione)
+    for col, configurati, descrizione in [(1, FORMATORI, 'formatore'), (9, FORMATORI_TEST, 'formatore TEST')]:
+        attuali = leggi_lista(ws, col, 51)
+        nuovi = [nome for nome in configurati if nome not in attuali]
+        
+        for nome in attuali:
+            if nome not in configurati:
+                print(f"   ⚠️  {descrizione} {nome} non è più in configurazione: lasciato nel file")
+        
+        if not nuovi:
+            continue
+        
+        lista = attuali + nuovi
+        scrivi_lista(ws, col, 51, lista)
+        
+        # Tabella in alto: righe libere della colonna (le celle occupate, es. note, sono saltate)
+        row = 2
+        for nome in nuovi:
+            while ws.cell(row=row, column=col).value not in (None, ''):
+                row += 1
+            ws.cell(row=row, column=col).value = nome
+            if col == 1:
+                aggiungi_riga_formatore(ws, row)
+            row += 1
+        
+        modifiche.append(f"{descrizione}: aggiunti {', '.join(nuovi)}")
+    
+    return modifiche
+
+
+def aggiungi_riga_formatore(ws, row):
+    """Formule n.giorni disponibili/svolti/rimanenti copiate dalla riga 2"""
+    for col in range(1, 9):
+        ws.cell(row=row, column=col)._style = copy(ws.cell(row=2, column=col)._style)
+    
+    # File creato con --leggero: nessuna formula da copiare
+    if not str(ws.cell(row=2, column=6).value or '').startswith('='):
+        return
+    
+    # % / giorni previsti / non lavoro / ferie restano da compilare
+    ws.cell(row=row, column=6).value = f'=C{row}-E{row}'
+    modello = ws.cell(row=2, column=7).value or ''
+    ws.cell(row=row, column=7).value = re.sub(r',A2\)', f',A{row})', modello)
+    ws.cell(row=row, column=8).value = f'=F{row}-G{row}'
+
+
+def leggi_attivita_aule(ws):
+    """Sezioni per aula del foglio CONTROLLO_AULE: {aula: [attività]}"""
+    aule = {}
+    col = 5  # Colonna E
+    while True:
+        intestazione = ws.cell(row=1, column=col).value
+        if not intestazione:
+            break
+        aula = str(intestazione)
+        # Intestazione ATT_103 (o 103_ATT nei file meno recenti)
+        if aula.startswith(PREFISSO_ATTIVITA_AULA):
+            aula = aula[len(PREFISSO_ATTIVITA_AULA):]
+        elif aula.endswith('_ATT'):
+            aula = aula[:-len('_ATT')]
+        aule[aula] = leggi_lista(ws, col, 50)
+        col += 1
+    return aule
+
+
+def aggiorna_aule(wb, backend):
+    """Nuove aule e attività compatibili: liste, range nominati, AULE_1"""
+    ws = wb['CONTROLLO_AULE']
+    
+    attuali = leggi_lista(ws, 1, 50)
+    attivita_file = leggi_attivita_aule(ws)
+    
+    # Le aule tolte dalla configurazione restano con le loro attività
+    aule = {aula: attivita_file.get(aula, []) for aula in attuali}
+    aule.update(AULE_ATTIVITA)
+    nuove = [aula for aula in aule if aula not in attuali]
+    cambiate = [aula for aula in attuali if aule[aula] != attivita_file.get(aula)]
+    
+    if not nuove and not cambiate:
+        return []
+    
+    # Lista aule (menu a tendina)
+    lista = attuali + nuove
+    scrivi_lista(ws, 1, 50, lista)
+    
+    # Sezione descrittiva in alto (righe 2-49, colonne A-C)
+    for row in range(2, 50):
+        for col in range(1, 4):
+            ws.cell(row=row, column=col).value = None
+    current_row = 2
+    for aula in lista:
+        ws.cell(row=current_row, column=1).value = aula
+        ws.cell(row=current_row, column=2).value = f'Aula {aula}'
+        for idx, att in enumerate(aule[aula]):
+            ws.cell(row=current_row + idx, column=3).value = att
+        current_row += len(aule[aula]) + 1
+    
+    # Tutte le attività
+    tutte = sorted(set(att for atts in aule.values() for att in atts))
+    scrivi_lista(ws, 3, 50, tutte)
+    wb.defined_names[NOME_TUTTE_ATTIVITA] = DefinedName(
+        NOME_TUTTE_ATTIVITA, attr_text=f'CONTROLLO_AULE!$C$50:$C${max(65, 49 + len(tutte))}')
+    
+    # Sezioni per aula + range nominati
+    for col, aula in enumerate(lista, start=5):
+        col_letter = get_column_letter(col)
+        nome = PREFISSO_ATTIVITA_AULA + aula
+        cella = ws.cell(row=1, column=col, value=nome)
+        cella.style = backend.stile('Grassetto')
+        scrivi_lista(ws, col, 50, aule[aula])
+        wb.defined_names[nome] = DefinedName(
+            nome, attr_text=f'CONTROLLO_AULE!${col_letter}$50:${col_letter}${49 + len(aule[aula])}')
+    
+    # AULE_1
+    ws_aule = wb['AULE_1']
+    for idx, aula in enumerate(lista, start=2):
+        ws_aule.cell(row=idx, column=1).value = aula
+    
+    modifiche = []
+    if nuove:
+        modifiche.append(f"aule: aggiunte {', '.join(nuove)}")
+    if cambiate:
+        modifiche.append(f"attività compatibili aggiornate per {', '.join(cambiate)}")
+    return modifiche
+
+
+def leggi_piano(ws):
+    """
+    Dati inseriti nel foglio 2026.
+    Restituisce (date pianificate, {(data, turno): {colonna: valore}})
+    
+    Ogni riga usa la propria data se presente (layout a tabella, anche
+    riordinato dall'utente); nel layout per mesi il pomeriggio non ha data
+    e usa quella della mattina precedente.
+    """
+    date = set()
+    voci = {}
+    ultima_data = None
+    for row in range(1, ws.max_row + 1):
+        turno = ws.cell(row=row, column=2).value
+        if turno not in ['mattina', 'Pomeriggio']:
+            continue
+        data = ws.cell(row=row, column=1).value
+        if isinstance(data, str):
+            try:
+                data = datetime.strptime(data.strip(), '%d/%m/%Y')
+            except ValueError:
+                data = None
+        if isinstance(data, datetime):
+            ultima_data = data
+            date.add(data)
+        if ultima_data is None:
+            continue
+        valori = {}
+        for col in range(PRIMA_COLONNA_DATI, ULTIMA_COLONNA_DATI + 1):
+            valore = ws.cell(row=row, column=col).value
+            if valore not in (None, ''):
+                valori[col] = valore
+        if valori:
+            voci[(ultima_data, turno)] = valori
+    return sorted(date), voci
+
+
+def aggiorna_calendario(wb, backend, giorni, forza=False):
+    """Festività o periodo cambiati: ricostruisce il foglio del piano e lo ricompila"""
+    nome = foglio_anno(wb)
+    if nome is None:
+        print("   ⚠️  Piano diviso per trimestre / mese: calendario non aggiornato "
+              "(ricrea il file con crea_pianificazione_smart.py --suddivisione)")
+        return []
+    
+    date_file, voci = leggi_piano(wb[nome])
+    if set(date_file) == set(giorni):
+        return []
+    
+    nuovi_giorni = set(giorni)
+    perse = sorted(chiave for chiave in voci if chiave[0] not in nuovi_giorni)
+    if perse and not forza:
+        print("❌ Questi turni compilati cadono su giorni non più pianificati:")
+        for data, turno in perse:
+            print(f"   {data.strftime('%d/%m/%Y')} {turno}: {list(voci[(data, turno)].values())}")
+        print("   Sposta i dati o usa --forza per scartarli.")
+        sys.exit(1)
+    
+    # Stesso layout del file: per mesi o tabella Excel (--layout tabella)
+    # e senza conditional formatting se il file è stato creato con --leggero
+    crea_foglio = create_table_schedule_sheet if wb[nome].tables else create_main_schedule_sheet
+    leggero = not wb[nome].conditional_formatting
+    indice = wb.sheetnames.index(nome)
+    wb.remove(wb[nome])
+    prima, ultima = crea_foglio(backend, giorni, nome=nome, leggero=leggero)
+    ws = wb[nome]
+    wb.move_sheet(ws, offset=indice - wb.sheetnames.index(nome))
+    
+    # Ricompila i dati inseriti
+    ultima_data = None
+    ricopiati = 0
+    for row in range(prima, ultima + 1):
+        turno = ws.cell(row=row, column=2).value
+        ultima_data = ws.cell(row=row, column=1).value or ultima_data
+        valori = voci.get((ultima_data, turno), {})
+        for col, valore in valori.items():
+            ws.cell(row=row, column=col).value = valore
+        ricopiati += bool(valori)
+    
+    # Conteggi FORMATORI: range limitati alle nuove righe dati
+    ws_formatori = wb['FORMATORI']
+    for row in range(2, 50):
+        cella = ws_formatori.cell(row=row, column=7)
+        if isinstance(cella.value, str) and cella.value.startswith('='):
+            cella.value = re.sub(r'\$([A-Z]+)\$\d+:\$([A-Z]+)\$\d+',
+                                 rf'$\1${prima}:$\2${ultima}', cella.value)
+    
+    # Festività in Assumptions
+    ws_ass = wb['Assumptions']
+    row = 10
+    while ws_ass.cell(row=row, column=1).value is not None:
+        ws_ass.cell(row=row, column=1).value = None
+        row += 1
+    for idx, festivita in enumerate(sorted(FESTIVITA), start=10):
+        cella = ws_ass.cell(row=idx, column=1, value=festivita)
+        cella.style = backend.stile('Data')
+    
+    aggiunti = len(nuovi_giorni - set(date_file))
+    tolti = len(set(date_file) - nuovi_giorni)
+    modifiche = [f"calendario: {aggiunti} giorni aggiunti, {tolti} tolti, "
+                 f"{ricopiati} turni compilati ricopiati"]
+    if perse:
+        modifiche.append(f"scartati {len(perse)} turni su giorni non più pianificati (--forza)")
+    return modifiche
+
+
+def main(filename, output=None, data_fine=None, forza=False):
+    print("=" * 70)
+    print("🔧 AGGIORNAMENTO PIANIFICAZIONE")
+    print("=" * 70)
+    
+    start = time.perf_counter()
+    output = output or filename
+    
+    print(f"📖 Apertura: {filename}...")
+    wb = load_workbook(filename)
+    backend = OpenpyxlBackend(output, wb)
+    
+    giorni = giorni_lavorativi(DATA_INIZIO, data_fine or DATA_FINE)
+    
+    modifiche = []
+    modifiche += aggiorna_formatori(wb)
+    modifiche += aggiorna_aule(wb, backend)
+    modifiche += aggiorna_calendario(wb, backend, giorni, forza)
+    
+    if not modifiche:
+        print("\n✅ Il file è già allineato alla configurazione: nessuna modifica")
+        return
+    
+    backend.chiudi_fogli()
+    allinea_validazioni(wb)
+    
+    print("\n📋 Modifiche applicate:")
+    for modifica in modifiche:
+        print(f"  ✅ {modifica}")
+    
+    print(f"\n💾 Salvataggio: {output}...")
+    backend.save()
+    print(f"⏱️  Completato in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Aggiorna la struttura di un file di pianificazione esistente')
+    parser.add_argument('filename', help='file Excel da aggiornare')
+    parser.add_argument('--output', help='salva in un altro file (predefinito: sovrascrive)')
+    parser.add_argument('--fino-al', help='estende il periodo fino alla data GG/MM/AAAA')
+    parser.add_argument('--forza', action='store_true',
+                        help='scarta i turni compilati su giorni non più pianificati')
+    args = parser.parse_args()
+    
+    data_fine = datetime.strptime(args.fino_al, '%d/%m/%Y') if args.fino_al else None
+    main(args.filename, args.output, data_fine, args.forza)
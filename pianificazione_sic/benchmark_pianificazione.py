@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK FILE EXCEL CON BUDGET
+===============================
+
+Genera il file con crea_pianificazione_smart.main e misura:
+- tempo di generazione dei fogli e tempo di salvataggio
+- dimensione del file .xlsx
+- numero di DataValidation e di regole di Conditional Formatting
+- tempo di riapertura con openpyxl (completa e read-only)
+
+I valori sono confrontati con la baseline salvata in benchmark_baseline.json:
+se una metrica supera il budget (baseline + tolleranza in BUDGET) lo script
+termina con codice 1.
+
+Uso:
+    python3 benchmark_pianificazione.py                      # confronto con la baseline
+    python3 benchmark_pianificazione.py --backend xlsxwriter
+    python3 benchmark_pianificazione.py --aggiorna-baseline  # salva i valori attuali
+
+I tempi dipendono dalla macchina: aggiornare la baseline quando si cambia PC.
+
+RICALCOLO DEL FOGLIO FORMATORI (richiede 'pip install formulas', facoltativo):
+il piano è riempito con un formatore in ogni cella formatore (seme fisso) e le
+formule 'n.giorni svolti' sono ricalcolate con il valutatore locale 'formulas';
+i conteggi sono confrontati con quelli contati direttamente in Python.
+
+    python3 benchmark_pianificazione.py --ricalcolo
+    python3 benchmark_pianificazione.py --ricalcolo --colonne-intere  # formule precedenti (D:D...)
+
+Le formule a colonne intere espandono 1.048.576 righe per ogni COUNTIF:
+il confronto richiede diversi minuti e oltre 5 GB di RAM.
+"""
+
+from openpyxl import load_workbook
+from collections import Counter
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+import crea_pianificazione_smart
+
+FILE_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Tolleranza ammessa rispetto alla baseline (frazione: 0.5 = +50%)
+# I tempi oscillano da un'esecuzione all'altra, dimensione e conteggi no
+BUDGET = {
+    'generazione_s': 0.5,
+    'salvataggio_s': 0.5,
+    'dimensione_kb': 0.1,
+    'validazioni': 0.0,
+    'formati_condizionali': 0.0,
+    'apertura_s': 0.5,
+    'apertura_read_only_s': 0.5,
+}
+
+# Margine fisso sui tempi (secondi): sotto il decimo di secondo conta il rumore
+MARGINE_TEMPI_S = 0.05
+
+# Colonne formatore del foglio 2026 (percorsi e fuori aula) e seme del riempimento
+COLONNE_FORMATORI = ['D', 'E', 'J', 'K', 'P', 'Q', 'V', 'W', 'AB', 'AD', 'AF', 'AH', 'AJ']
+SEME_RICALCOLO = 1
+
+
+def limite_budget(chiave, valore_baseline):
+    limite = valore_baseline * (1 + BUDGET[chiave])
+    if chiave.endswith('_s'):
+        limite += MARGINE_TEMPI_S
+    return limite
+
+
+def misura_generazione(backend, filename):
+    """Esegue main() cronometrando a parte il salvataggio del backend"""
+    base = crea_pianificazione_smart.BACKENDS[backend]
+    tempi = {}
+    
+    class BackendCronometrato(base):
+        def save(self):
+            start = time.perf_counter()
+            super().save()
+            tempi['salvataggio_s'] = time.perf_counter() - start
+    
+    crea_pianificazione_smart.BACKENDS['benchmark'] = BackendCronometrato
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            crea_pianificazione_smart.main('benchmark', filename)
+        totale = time.perf_counter() - start
+    finally:
+        del crea_pianificazione_smart.BACKENDS['benchmark']
+    
+    tempi['generazione_s'] = totale - tempi['salvataggio_s']
+    return tempi
+
+
+def misura_file(filename):
+    """Dimensione, validazioni, formati condizionali e tempi di riapertura"""
+    start = time.perf_counter()
+    wb = load_workbook(filename)
+    apertura = time.perf_counter() - start
+    
+    validazioni = sum(len(ws.data_validations.dataValidation) for ws in wb.worksheets)
+    formati = sum(len(cf.rules) for ws in wb.worksheets for cf in ws.conditional_formatting)
+    
+    # In read-only le righe sono lette solo quando si scorrono
+    start = time.perf_counter()
+    wb_ro = load_workbook(filename, read_only=True)
+    for _ in wb_ro['2026'].iter_rows(values_only=True):
+        pass
+    wb_ro.close()
+    apertura_ro = time.perf_counter() - start
+    
+    return {
+        'dimensione_kb': os.path.getsize(filename) / 1024,
+        'validazioni': validazioni,
+        'formati_condizionali': formati,
+        'apertura_s': apertura,
+        'apertura_read_only_s': apertura_ro,
+    }
+
+
+def esegui(backend, ripetizioni):
+    """Metriche migliori su più ripetizioni (i conteggi non cambiano)"""
+    migliori = {}
+    with tempfile.TemporaryDirectory() as cartella:
+        filename = os.path.join(cartella, 'benchmark.xlsx')
+        for _ in range(ripetizioni):
+            metriche = misura_generazione(backend, filename)
+            metriche.update(misura_file(filename))
+            for chiave, valore in metriche.items():
+                migliori[chiave] = min(valore, migliori.get(chiave, valore))
+    return migliori
+
+
+def riempi_piano(filename):
+    """Un formatore in ogni cella formatore del foglio 2026: restituisce i conteggi attesi"""
+    casuale = random.Random(SEME_RICALCOLO)
+    formatori = crea_pianificazione_smart.FORMATORI
+    wb = load_workbook(filename)
+    ws = wb['2026']
+    conteggi = Counter()
+    for row in range(1, ws.max_row + 1):
+        if ws.cell(row=row, column=2).value not in ('mattina', 'Pomeriggio'):
+            continue
+        for col in COLONNE_FORMATORI:
+            nome = casuale.choice(formatori)
+            ws[f'{col}{row}'] = nome
+            conteggi[nome] += 1
+    return wb, conteggi
+
+
+def usa_colonne_intere(wb):
+    """Formule 'n.giorni svolti' come prima dei range limitati: 13 COUNTIF su colonne intere"""
+    ws = wb['FORMATORI']
+    for idx in range(2, 2 + len(crea_pianificazione_smart.FORMATORI)):
+        ws[f'G{idx}'] = '=SUM(' + ','.join(
+            f"COUNTIF('2026'!{col}:{col},A{idx})" for col in COLONNE_FORMATORI
+        ) + ')'
+
+
+def misura_ricalcolo(backend, colonne_intere=False):
+    """Tempi di caricamento e ricalcolo del modello con 'formulas' e verifica dei conteggi"""
+    try:
+        import formulas
+    except ImportError:
+        raise RuntimeError("Valutatore non disponibile: installa con 'pip install formulas'")
+    
+    with tempfile.TemporaryDirectory() as cartella:
+        filename = os.path.join(cartella, 'ricalcolo.xlsx')
+        with contextlib.redirect_stdout(io.StringIO()):
+            crea_pianificazione_smart.main(backend, filename)
+        wb, conteggi = riempi_piano(filename)
+        if colonne_intere:
+            usa_colonne_intere(wb)
+        wb.save(filename)
+        
+        start = time.perf_counter()
+        modello = formulas.ExcelModel().loads(filename).finish()
+        caricamento = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        soluzione = modello.calculate()
+        calcolo = time.perf_counter() - start
+    
+    # Chiavi del tipo "'[ricalcolo.xlsx]FORMATORI'!G2"
+    svolti = {}
+    for chiave, valore in soluzione.items():
+        trovato = re.search(r"FORMATORI'!G(\d+)$", chiave)
+        if trovato:
+            svolti[int(trovato.group(1))] = valore.value[0][0]
+    
+    errati = [
+        (nome, svolti.get(idx), conteggi[nome])
+        for idx, nome in enumerate(crea_pianificazione_smart.FORMATORI, start=2)
+        if svolti.get(idx) != conteggi[nome]
+    ]
+    return caricamento, calcolo, errati
+
+
+def main_ricalcolo(backend='openpyxl', colonne_intere=False):
+    formule = 'colonne intere' if colonne_intere else 'range limitati'
+    print("=" * 70)
+    print(f"⏱️  RICALCOLO FORMATORI (backend: {backend}, formule: {formule})")
+    print("=" * 70)
+    
+    try:
+        caricamento, calcolo, errati = misura_ricalcolo(backend, colonne_intere)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return False
+    
+    print(f"\n{'Caricamento modello':<24}{caricamento:>10.2f}s")
+    print(f"{'Ricalcolo':<24}{calcolo:>10.2f}s")
+    
+    if errati:
+        print("\n❌ CONTEGGI DIVERSI DA QUELLI ATTESI:")
+        for nome, calcolato, atteso in errati:
+            print(f"   {nome}: {calcolato} invece di {atteso}")
+        return False
+    
+    print(f"\n✅ n.giorni svolti corretti per {len(crea_pianificazione_smart.FORMATORI)} formatori")
+    return True
+
+
+def confronta(metriche, baseline):
+    """Restituisce le metriche oltre budget: [(nome, valore, limite)]"""
+    sforate = []
+    for chiave in BUDGET:
+        if chiave not in baseline:
+            continue
+        limite = limite_budget(chiave, baseline[chiave])
+        if metriche[chiave] > limite:
+            sforate.append((chiave, metriche[chiave], limite))
+    return sforate
+
+
+def main(backend='openpyxl', ripetizioni=3, aggiorna_baseline=False):
+    print("=" * 70)
+    print(f"⏱️  BENCHMARK FILE EXCEL (backend: {backend}, {ripetizioni} ripetizioni)")
+    print("=" * 70)
+    
+    metriche = esegui(backend, ripetizioni)
+    
+    baselines = {}
+    if os.path.exists(FILE_BASELINE):
+        with open(FILE_BASELINE, encoding='utf-8') as f:
+            baselines = json.load(f)
+    baseline = baselines.get(backend, {})
+    
+    print(f"\n{'Metrica':<24}{'Attuale':>12}{'Baseline':>12}{'Budget':>12}")
+    for chiave in BUDGET:
+        valore = metriche[chiave]
+        if chiave in baseline:
+            limite = limite_budget(chiave, baseline[chiave])
+            print(f"{chiave:<24}{valore:>12.3f}{baseline[chiave]:>12.3f}{limite:>12.3f}")
+        else:
+            print(f"{chiave:<24}{valore:>12.3f}{'-':>12}{'-':>12}")
+    
+    if aggiorna_baseline:
+        baselines[backend] = {chiave: round(valore, 4) for chiave, valore in metriche.items()}
+        with open(FILE_BASELINE, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\n💾 Baseline aggiornata: {FILE_BASELINE}")
+        return True
+    
+    if not baseline:
+        print(f"\n⚠️  Nessuna baseline per {backend}: esegui con --aggiorna-baseline")
+        return True
+    
+    sforate = confronta(metriche, baseline)
+    if sforate:
+        print("\n❌ BUDGET SUPERATO:")
+        for chiave, valore, limite in sforate:
+            print(f"   {chiave}: {valore:.3f} > {limite:.3f}")
+        return False
+    
+    print("\n✅ Tutte le metriche entro il budget")
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark del file Excel con budget rispetto alla baseline')
+    parser.add_argument('--backend', choices=sorted(crea_pianificazione_smart.BACKENDS), default='openpyxl')
+    parser.add_argument('--ripetizioni', type=int, default=3, help='si tiene il tempo migliore')
+    parser.add_argument('--aggiorna-baseline', action='store_true', help='salva le metriche attuali come baseline')
+    parser.add_argument('--ricalcolo', action='store_true',
+                        help='tempo di ricalcolo del foglio FORMATORI con il piano pieno (richiede formulas)')
+    parser.add_argument('--colonne-intere', action='store_true',
+                        help='con --ricalcolo: formule precedenti su colonne intere (lento, molta RAM)')
+    args = parser.parse_args()
+    
+    if args.ricalcolo:
+        ok = main_ricalcolo(args.backend, args.colonne_intere)
+    else:
+        ok = main(args.backend, args.ripetizioni, args.aggiorna_baseline)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK DEI REPORT PDF SU UN PIANO TUTTO PRENOTATO
+====================================================
+
+Costruisce in memoria un piano sintetico "tutto prenotato" dal 2026 (uno o
+più anni): ogni giorno feriale, mattina e pomeriggio, i 4 percorsi sono
+occupati, ognuno con un'aula e due formatori a rotazione (ogni formatore è
+impegnato in tutti i turni, circa 520 turni all'anno).
+
+Per i report aule (per aula e mese), formatori (per mese) e formatore per
+periodo (tutto il piano in una tabella) misura, con i PDF costruiti in memoria:
+- tempo di generazione (il migliore su --ripetizioni)
+- pagine e dimensione dei PDF
+- picco di memoria (tracemalloc, giro a parte, con --memoria: molto più lento)
+
+Le tabelle sono LongTable con l'intestazione ripetuta (tabella_report): il
+report per periodo mette in una sola tabella circa 520 turni per anno.
+
+Con --profili misura invece tutti i report (anche corsi e piano settimanale)
+con ogni profilo di compressione (PROFILI_PDF), per scegliere PROFILO_PDF in
+base al peso dei file da scaricare: tempo, dimensione totale e media per PDF,
+e il controllo che nessun PDF incorpori font o immagini.
+
+Uso:
+    python3 benchmark_stampe_pdf.py
+    python3 benchmark_stampe_pdf.py --anni 4 --memoria
+    python3 benchmark_stampe_pdf.py --profili
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import contextlib
+import io
+import re
+import time
+import tracemalloc
+
+import genera_stampe_pdf
+import genera_stampe_pdf_filtrati
+
+CORSI_SINTETICI = ['1a', '1b', '2a', '2b', '3a', '3b', '4a', '4b', '5a', '5b', '6a', '6b']
+
+# Report con le tabelle di tabella_report
+REPORT_TABELLE = ['aule', 'formatori', 'formatore per periodo']
+
+
+def piano_pieno(anni=1, primo_anno=2026):
+    """Turni di uno o più anni con tutti i percorsi, le aule e i formatori occupati"""
+    formatori = genera_stampe_pdf.FORMATORI
+    aule = genera_stampe_pdf.AULE
+    dati = []
+    giorno = datetime(primo_anno, 1, 1)
+    while giorno.year < primo_anno + anni:
+        if giorno.weekday() < 5:
+            for turno in ('mattina', 'Pomeriggio'):
+                k = len(dati)
+                percorsi = []
+                for i in range(4):
+                    percorsi.append((f'Percorso {i + 1}', {
+                        'nome': CORSI_SINTETICI[(i + k // 20) % len(CORSI_SINTETICI)],
+                        'formatore1': formatori[(2 * i + k) % len(formatori)],
+                        'formatore2': formatori[(2 * i + 1 + k) % len(formatori)],
+                        'aula': aule[(i + k) % len(aule)],
+                        'attivita': 'LEZIONE',
+                        'test': None,
+                    }))
+                dati.append({'data': giorno, 'turno': turno, 'percorsi': percorsi,
+                             'fuori_aula': [], 'attivita_esterne': []})
+        giorno += timedelta(days=1)
+    return dati
+
+
+def lavori_benchmark(dati):
+    """{report: lavori} dei report misurati"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return {
+            'aule': genera_stampe_pdf.lavori_report_aule(dati),
+            'formatori': genera_stampe_pdf.lavori_report_formatori(dati),
+            'formatore per periodo': genera_stampe_pdf_filtrati.lavori_formatori_periodo(
+                dati, sorted(genera_stampe_pdf.FORMATORI)),
+            'corsi': genera_stampe_pdf.lavori_report_corsi(dati),
+            'settimanale': genera_stampe_pdf.lavori_report_settimanale(dati),
+        }
+
+
+def costruisci(lavori):
+    """I byte dei PDF dei lavori, costruiti in memoria"""
+    return [genera_stampe_pdf.pdf_in_memoria(lavoro, cache=False)[0] for lavoro in lavori]
+
+
+def misura(lavori, ripetizioni, memoria=False):
+    tempi = []
+    for _ in range(ripetizioni):
+        inizio = time.perf_counter()
+        pdf = costruisci(lavori)
+        tempi.append(time.perf_counter() - inizio)
+    
+    metriche = {
+        'tempo_s': min(tempi),
+        'pagine': sum(len(re.findall(rb'/Type /Page\b', contenuto)) for contenuto in pdf),
+        'dimensione_kb': sum(len(contenuto) for contenuto in pdf) / 1024,
+        'pdf': len(pdf),
+        # Font incorporati e immagini: devono restare 0 (solo font standard, nessuna immagine)
+        'incorporati': sum(len(re.findall(rb'/FontFile|/Subtype /Image', contenuto)) for contenuto in pdf),
+    }
+    if memoria:
+        tracemalloc.start()
+        costruisci(lavori)
+        metriche['picco_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return metriche
+
+
+def main_profili(dati, ripetizioni=3):
+    """Tempo e dimensione di tutti i report per ogni profilo di compressione"""
+    print(f"   Profilo attuale: {genera_stampe_pdf.PROFILO_PDF}")
+    
+    totali = {profilo: {'tempo_s': 0, 'dimensione_kb': 0, 'pdf': 0, 'incorporati': 0}
+              for profilo in genera_stampe_pdf.PROFILI_PDF}
+    profilo_attuale = genera_stampe_pdf.PROFILO_PDF
+    try:
+        for report, lavori in lavori_benchmark(dati).items():
+            print(f"\n📄 {report}: {len(lavori)} PDF")
+            for profilo in genera_stampe_pdf.PROFILI_PDF:
+                genera_stampe_pdf.PROFILO_PDF = profilo
+                m = misura(lavori, ripetizioni)
+                for chiave in totali[profilo]:
+                    totali[profilo][chiave] += m[chiave]
+                print(f"   {profilo:<10} {m['tempo_s']:6.2f}s  {m['dimensione_kb']:8.1f} KB  "
+                      f"{m['dimensione_kb'] / m['pdf']:6.1f} KB/PDF")
+    finally:
+        genera_stampe_pdf.PROFILO_PDF = profilo_attuale
+    
+    print("\n📦 Totale:")
+    for profilo, m in totali.items():
+        print(f"   {profilo:<10} {m['tempo_s']:6.2f}s  {m['dimensione_kb']:8.1f} KB  "
+              f"{m['pdf']} PDF, font incorporati / immagini: {m['incorporati']}")
+
+
+def main(anni=1, ripetizioni=3, memoria=False, profili=False):
+    print("=" * 70)
+    print("📊 BENCHMARK REPORT PDF - PIANO TUTTO PRENOTATO")
+    print("=" * 70)
+    
+    dati = piano_pieno(anni)
+    print(f"📅 {anni} anni: {len(dati)} turni, {sum(len(riga['percorsi']) for riga in dati)} prenotazioni")
+    if profili:
+        main_profili(dati, ripetizioni)
+        return
+    
+    for report, lavori in lavori_benchmark(dati).items():
+        if report not in REPORT_TABELLE:
+            continue
+        righe = max(len(lavoro[3][2]) for lavoro in lavori) if report == 'formatore per periodo' else None
+        print(f"\n📄 {report}: {len(lavori)} PDF" + (f", fino a {righe} turni per tabella" if righe else ""))
+        m = misura(lavori, ripetizioni, memoria)
+        picco = f"  picco {m['picco_mb']:6.1f} MB" if memoria else ""
+        print(f"   {m['tempo_s']:6.2f}s{picco}  {m['pagine']:4d} pagine  {m['dimensione_kb']:8.1f} KB")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark dei report PDF su un piano tutto prenotato')
+    parser.add_argument('--anni', type=int, default=1, help='anni del piano sintetico (circa 520 turni ciascuno)')
+    parser.add_argument('--ripetizioni', type=int, default=3, help='si tiene il tempo migliore')
+    parser.add_argument('--memoria', action='store_true', help='misura anche il picco di memoria (tracemalloc)')
+    parser.add_argument('--profili', action='store_true', help='confronta i profili di compressione (PROFILI_PDF)')
+    args = parser.parse_args()
+    main(args.anni, args.ripetizioni, args.memoria, args.profili)
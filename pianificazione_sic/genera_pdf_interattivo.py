@@ -9,6 +9,7 @@ import re
 from openpyxl import load_workbook
 from genera_stampe_pdf import (
     carica_dati_excel,
+    fogli_piano,
     genera_report_aule,
     genera_report_formatori,
     genera_report_corsi,
@@ -17,6 +18,7 @@ from genera_stampe_pdf import (
 from genera_stampe_pdf_filtrati import (
     genera_report_aule_settimane,
     genera_report_formatore_periodo,
+    genera_report_formatori_periodo,
     genera_report_corso_specifico
 )
 
@@ -24,19 +26,20 @@ from genera_stampe_pdf_filtrati import (
 def get_lista_corsi():
     """Restituisce lista corsi disponibili dalle colonne percorso (C, I, O, U)"""
     try:
-        wb = load_workbook('Pianificazione_Corsi_2026.xlsx')
-        ws = wb['2026']
+        wb = load_workbook('Pianificazione_Corsi_2026.xlsx', read_only=True)
         
         percorsi = set()
-        # Colonne percorso: C(3), I(9), O(15), U(21)
-        for row in range(6, ws.max_row + 1):
-            for col in [3, 9, 15, 21]:
-                val = ws.cell(row=row, column=col).value
-                if val and str(val).strip():
-                    val_str = str(val).strip()
-                    # Esclude intestazioni e valori non validi
-                    if val_str.lower() not in ['percorso', 'bcc', 'none']:
-                        percorsi.add(val_str)
+        # Colonne percorso: C(3), I(9), O(15), U(21) di tutti i fogli del piano
+        # dalla riga 5 (primo turno nel layout a tabella, intestazioni in quello per mesi)
+        for nome in fogli_piano(wb.sheetnames):
+            for valori in wb[nome].iter_rows(min_row=5, max_col=21, values_only=True):
+                for val in valori[2::6]:
+                    if val and str(val).strip():
+                        val_str = str(val).strip()
+                        # Esclude intestazioni e valori non validi
+                        if val_str.lower() not in ['percorso', 'bcc', 'none']:
+                            percorsi.add(val_str)
+        wb.close()
         
         # Ordina naturalmente (1a, 1b, 2a, 2b, ..., 10a, 10b, ...)
         def sort_key(x):
@@ -145,6 +148,25 @@ if __name__ == '__main__':
         except Exception as e:
             print(json.dumps({'error': str(e)}))
     
+    elif comando == 'genera_formatori_periodo':
+        # Parametri: formatori ("CL,MC" o "tutti"), data_inizio, data_fine
+        if len(sys.argv) < 3:
+            print(json.dumps({'error': 'Parametri mancanti'}))
+            sys.exit(1)
+        
+        formatori = None if sys.argv[2] == 'tutti' else [f.strip() for f in sys.argv[2].split(',')]
+        data_inizio = sys.argv[3] if len(sys.argv) > 3 and sys.argv[3] != 'null' else None
+        data_fine = sys.argv[4] if len(sys.argv) > 4 and sys.argv[4] != 'null' else None
+        
+        try:
+            errori = genera_report_formatori_periodo(formatori, data_inizio, data_fine)
+            if errori:
+                print(json.dumps({'error': f'{len(errori)} PDF non generati: ' + '; '.join(f'{f}: {e}' for f, e in errori)}))
+            else:
+                print(json.dumps({'success': True, 'message': 'PDF generati per i formatori nel periodo'}))
+        except Exception as e:
+            print(json.dumps({'error': str(e)}))
+    
     elif comando == 'genera_corso':
         # Parametro: nome corso
         if len(sys.argv) < 3:
@@ -162,16 +184,22 @@ if __name__ == '__main__':
     elif comando == 'genera_tutti_formatori':
         try:
             dati = carica_dati_excel('Pianificazione_Corsi_2026.xlsx')
-            genera_report_formatori(dati)
-            print(json.dumps({'success': True, 'message': 'PDF generati per tutti i formatori'}))
+            errori = genera_report_formatori(dati)
+            if errori:
+                print(json.dumps({'error': f'{len(errori)} PDF non generati: ' + '; '.join(f'{f}: {e}' for f, e in errori)}))
+            else:
+                print(json.dumps({'success': True, 'message': 'PDF generati per tutti i formatori'}))
         except Exception as e:
             print(json.dumps({'error': str(e)}))
     
     elif comando == 'genera_settimanale':
         try:
             dati = carica_dati_excel('Pianificazione_Corsi_2026.xlsx')
-            genera_report_settimanale(dati)
-            print(json.dumps({'success': True, 'message': 'PDF settimanali generati'}))
+            errori = genera_report_settimanale(dati)
+            if errori:
+                print(json.dumps({'error': f'{len(errori)} PDF non generati: ' + '; '.join(f'{f}: {e}' for f, e in errori)}))
+            else:
+                print(json.dumps({'success': True, 'message': 'PDF settimanali generati'}))
         except Exception as e:
             print(json.dumps({'error': str(e)}))
     
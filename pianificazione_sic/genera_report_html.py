@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+REPORT HTML
+===========
+
+Pagine HTML statiche per consultare il piano nel browser senza passare da
+un PDF:
+- settimana_AAAA_Wss.html: il piano di una settimana (come genera_report_settimanale)
+- formatore_XX_MM.html: gli impegni di un formatore in un mese (come genera_report_formatori)
+- aule_MM.html: le prenotazioni di tutte le aule in un mese (come genera_report_aule)
+- index.html: l'elenco delle pagine
+
+Le pagine usano le stesse viste dei PDF (aggrega_dati: 'settimane',
+'formatori', 'aule') e i colori di stili.py, senza reportlab: ognuna si
+costruisce in pochi millisecondi. server.py le serve da /report/<nome>.
+
+Uso (nella cartella di Pianificazione_Corsi_2026.xlsx), per salvarle in stampe_html/:
+    python3 genera_report_html.py
+"""
+
+from html import escape
+from urllib.parse import quote
+import calendar
+import os
+import re
+
+import stili
+from genera_stampe_pdf import (carica_dati_excel, carica_attivita_esterne, aggrega_dati,
+                               fuori_aula_turno, turno_a_orario)
+
+FILE_EXCEL = 'Pianificazione_Corsi_2026.xlsx'
+
+STILE_CSS = f"""
+body {{ font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 24px; color: #222; }}
+h1 {{ color: #{stili.BLU_REPORT}; font-size: 20px; }}
+h2 {{ color: #{stili.BLU_SCURO}; font-size: 16px; margin-top: 28px; }}
+table {{ border-collapse: collapse; margin-bottom: 16px; }}
+th {{ background: #{stili.AZZURRO}; color: #{stili.BLU_SCURO}; text-align: left; }}
+th, td {{ border: 1px solid #999; padding: 4px 8px; vertical-align: top; }}
+tr:nth-child(even) td {{ background: #{stili.GRIGIO_RIGA}; }}
+td.mattina {{ background: #{stili.VERDE_MATTINA} !important; }}
+td.pomeriggio {{ background: #{stili.GIALLO} !important; }}
+.nota {{ color: #777; font-size: 11px; }}
+"""
+
+# Pagine già costruite per la stessa lista 'dati' (come _AGGREGATI in genera_stampe_pdf):
+# [dati, mappature attività esterne, {nome: html}]
+_PAGINE = [None, None, {}]
+
+
+def pagina_html(titolo, corpo):
+    """Documento HTML completo con il foglio di stile dei report"""
+    return (f'<!DOCTYPE html>\n<html lang="it">\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{escape(titolo)}</title>\n<style>{STILE_CSS}</style>\n</head>\n'
+            f'<body>\n<p><a href="index.html">Tutti i report</a></p>\n{corpo}\n</body>\n</html>\n')
+
+
+def cella_html(valore, classe=None):
+    testo = escape(str(valore)).replace('\n', '<br>')
+    return f'<td class="{classe}">{testo}</td>' if classe else f'<td>{testo}</td>'
+
+
+def tabella_html(intestazione, righe):
+    """Tabella HTML: righe = [[valore, ...]] o [[(valore, classe css), ...]]"""
+    parti = ['<table>', '<tr>' + ''.join(f'<th>{escape(titolo)}</th>' for titolo in intestazione) + '</tr>']
+    for riga in righe:
+        parti.append('<tr>' + ''.join(cella_html(*cella) if isinstance(cella, tuple) else cella_html(cella)
+                                      for cella in riga) + '</tr>')
+    parti.append('</table>')
+    return '\n'.join(parti)
+
+
+def html_settimana(turni):
+    """Il piano settimanale (vista 'settimane' di aggrega_dati), come pdf_settimana"""
+    prima_data = turni[0]['data']
+    ultima_data = turni[-1]['data']
+    num_settimana = prima_data.isocalendar()[1]
+    
+    righe = []
+    for riga in turni:
+        percorsi_txt = []
+        for i in range(4):
+            if i < len(riga['percorsi']):
+                _, perc = riga['percorsi'][i]
+                txt = f"{perc.get('nome', '-')}\nForm: {perc.get('formatore1', '-')}"
+                if perc.get('formatore2'):
+                    txt += f", {perc['formatore2']}"
+                txt += f"\nAula: {perc.get('aula', '-')}\nAtt: {perc.get('attivita', '-')}"
+                if perc.get('test'):
+                    txt += f"\nTest: {perc['test']}"
+                percorsi_txt.append(txt)
+            else:
+                percorsi_txt.append('-')
+        
+        fa_txt = []
+        if riga.get('fuori_aula'):
+            fa_txt.append("Form: " + ", ".join(str(formatore) for formatore, _ in fuori_aula_turno(riga)))
+        if riga.get('attivita_esterne'):
+            fa_txt.append("Att: " + ", ".join(riga['attivita_esterne']))
+        
+        righe.append([riga['data'].strftime('%d/%m'), (riga['turno'], riga['turno'].lower())]
+                     + percorsi_txt + ['\n'.join(fa_txt) or '-'])
+    
+    titolo = f"Piano settimanale - Settimana {num_settimana}/{prima_data.year}"
+    corpo = (f"<h1>{escape(titolo)}</h1>\n"
+             f"<p>Dal {prima_data.strftime('%d/%m/%Y')} al {ultima_data.strftime('%d/%m/%Y')}</p>\n"
+             + tabella_html(['Data', 'Turno', 'Percorso 1', 'Percorso 2', 'Percorso 3', 'Percorso 4', 'Fuori Aula'],
+                            righe)
+             + '\n<p class="nota">Form = Formatore | Att = Attività | Test = Formatore TEST</p>')
+    return pagina_html(titolo, corpo)
+
+
+def html_formatore_mese(formatore, mese, impegni, mappature_attivita):
+    """Gli impegni del mese di un formatore (vista 'formatori' di aggrega_dati), come pdf_formatore"""
+    righe = []
+    for imp in impegni:
+        attivita_display = imp['attivita'] or '-'
+        if imp['tipo'] == 'Fuori aula' and imp['attivita'] in mappature_attivita:
+            attivita_display = mappature_attivita[imp['attivita']]
+        righe.append([imp['data'].strftime('%d/%m/%Y'), turno_a_orario(imp['turno']),
+                      imp['percorso'] or '-', imp['aula'] or '-', attivita_display])
+    
+    anno = impegni[0]['data'].year
+    titolo = f"Programma formatore {formatore} - {calendar.month_name[mese].capitalize()} {anno}"
+    corpo = (f"<h1>{escape(titolo)}</h1>\n"
+             f"<p><b>Impegni:</b> {len(impegni)} turni ({len(impegni) * 0.5:.1f} giorni)</p>\n"
+             + tabella_html(['Data', 'Orario', 'Percorso', 'Aula', 'Attività'], righe))
+    return pagina_html(titolo, corpo)
+
+
+def html_aule_mese(mese, aule_mensili, anno):
+    """Le prenotazioni del mese per aula (vista 'aule' di aggrega_dati), come pdf_aule"""
+    sezioni = []
+    for aula in sorted(aule_mensili):
+        prenotazioni = aule_mensili[aula].get(mese)
+        if not prenotazioni:
+            continue
+        righe = [[pren['data'].strftime('%d/%m/%Y'), turno_a_orario(pren['turno']), pren['percorso'] or '-',
+                  pren['attivita'] or '-', ', '.join(pren['formatori']) if pren['formatori'] else '-']
+                 for pren in prenotazioni]
+        sezioni.append(f"<h2>Aula {escape(str(aula))}</h2>\n<p><b>Prenotazioni:</b> {len(prenotazioni)}</p>\n"
+                       + tabella_html(['Data', 'Orario', 'Percorso', 'Attività', 'Formatori'], righe))
+    
+    titolo = f"Prenotazione aule - {calendar.month_name[mese].capitalize()} {anno}"
+    return pagina_html(titolo, f"<h1>{escape(titolo)}</h1>\n" + '\n'.join(sezioni or ['<p>Nessuna prenotazione</p>']))
+
+
+def html_indice(aggregati, anno):
+    """Elenco di tutte le pagine disponibili"""
+    mesi_aule = sorted({mese for mesi in aggregati['aule'].values() for mese in mesi})
+    corpo = [f"<h1>Report del piano {anno}</h1>", "<h2>Piano settimanale</h2>", "<p>"]
+    corpo += [f'<a href="settimana_{settimana}.html">{settimana[-3:]}</a>' for settimana in sorted(aggregati['settimane'])]
+    corpo += ["</p>", "<h2>Prenotazione aule</h2>", "<p>"]
+    corpo += [f'<a href="aule_{mese:02d}.html">{calendar.month_name[mese].capitalize()}</a>' for mese in mesi_aule]
+    corpo += ["</p>", "<h2>Programma formatori</h2>"]
+    for formatore in sorted(aggregati['formatori']):
+        collegamenti = [f'<a href="formatore_{quote(formatore)}_{mese:02d}.html">{calendar.month_abbr[mese]}</a>'
+                        for mese in sorted(aggregati['formatori'][formatore])]
+        corpo.append(f"<p><b>{escape(formatore)}</b>: " + ' '.join(collegamenti) + "</p>")
+    return pagina_html(f"Report del piano {anno}", '\n'.join(corpo))
+
+
+def crea_pagina(dati, nome, mappature_attivita):
+    """L'HTML della pagina 'nome' (vedi docstring del modulo), None se non esiste"""
+    aggregati = aggrega_dati(dati)
+    # Anno del piano: i turni sono in ordine di data
+    anno = dati[0]['data'].year if dati else ''
+    if nome == 'index.html':
+        return html_indice(aggregati, anno)
+    
+    trovato = re.fullmatch(r'settimana_(\d{4}_W\d{2})\.html', nome)
+    if trovato and trovato.group(1) in aggregati['settimane']:
+        return html_settimana(aggregati['settimane'][trovato.group(1)])
+    
+    trovato = re.fullmatch(r'formatore_(.+)_(\d{2})\.html', nome)
+    if trovato:
+        mesi = aggregati['formatori'].get(trovato.group(1), {})
+        if int(trovato.group(2)) in mesi:
+            return html_formatore_mese(trovato.group(1), int(trovato.group(2)), mesi[int(trovato.group(2))],
+                                       mappature_attivita)
+    
+    trovato = re.fullmatch(r'aule_(\d{2})\.html', nome)
+    if trovato and 1 <= int(trovato.group(1)) <= 12:
+        return html_aule_mese(int(trovato.group(1)), aggregati['aule'], anno)
+    return None
+
+
+def pagina_per_nome(dati, nome, file_excel=FILE_EXCEL):
+    """
+    L'HTML della pagina 'nome' per i turni 'dati', None se non esiste
+    
+    Le pagine sono tenute in memoria finché 'dati' è la stessa lista: il
+    server (che rilegge l'Excel solo quando cambia) le costruisce una volta sola.
+    """
+    if _PAGINE[0] is not dati:
+        _PAGINE[:] = [dati, carica_attivita_esterne(file_excel), {}]
+    pagine = _PAGINE[2]
+    if nome not in pagine:
+        pagine[nome] = crea_pagina(dati, nome, _PAGINE[1])
+    return pagine[nome]
+
+
+def nomi_pagine(dati):
+    """I nomi di tutte le pagine, indice compreso"""
+    aggregati = aggrega_dati(dati)
+    nomi = ['index.html']
+    nomi += [f'settimana_{settimana}.html' for settimana in sorted(aggregati['settimane'])]
+    nomi += [f'aule_{mese:02d}.html' for mese in sorted({mese for mesi in aggregati['aule'].values() for mese in mesi})]
+    nomi += [f'formatore_{formatore}_{mese:02d}.html'
+             for formatore in sorted(aggregati['formatori']) for mese in sorted(aggregati['formatori'][formatore])]
+    return nomi
+
+
+def genera_report_html(dati, output_dir='stampe_html', file_excel=FILE_EXCEL):
+    """Salva tutte le pagine in output_dir"""
+    print(f"🌐 Generazione report HTML in {output_dir}/")
+    os.makedirs(output_dir, exist_ok=True)
+    nomi = nomi_pagine(dati)
+    for nome in nomi:
+        with open(os.path.join(output_dir, nome), 'w', encoding='utf-8') as f:
+            f.write(pagina_per_nome(dati, nome, file_excel))
+    print(f"✅ {len(nomi)} pagine salvate")
+    return nomi
+
+
+if __name__ == '__main__':
+    if not os.path.exists(FILE_EXCEL):
+        print(f"❌ File non trovato: {FILE_EXCEL}")
+    else:
+        genera_report_html(carica_dati_excel(FILE_EXCEL))
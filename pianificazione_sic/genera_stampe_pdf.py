@@ -14,13 +14,307 @@ from openpyxl import load_workbook
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.units import cm
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab import rl_config
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import calendar
+import contextlib
+import hashlib
+import io
+import json
 import os
+import re
+import shutil
+
+import stili
+
+# COLORI (definiti in stili.py, condivisi con il file Excel)
+COLORE_BLU_SCURO = colors.HexColor('#' + stili.BLU_SCURO)
+COLORE_BLU_REPORT = colors.HexColor('#' + stili.BLU_REPORT)
+COLORE_BLU = colors.HexColor('#' + stili.BLU)
+COLORE_AZZURRO = colors.HexColor('#' + stili.AZZURRO)
+COLORE_AZZURRO_CHIARO = colors.HexColor('#' + stili.AZZURRO_CHIARO)
+COLORE_GRIGIO_RIGA = colors.HexColor('#' + stili.GRIGIO_RIGA)
+
+# CATALOGO STILI PDF
+# Paragrafi e tabelle creati una sola volta all'import e condivisi da tutti i
+# report (anche da genera_stampe_pdf_filtrati.py), invece di ricrearli a ogni
+# report e a ogni aula / mese / giorno nei cicli. Un TableStyle non viene
+# modificato da Table.setStyle: lo stesso oggetto serve tutte le tabelle.
+STILI_BASE = getSampleStyleSheet()
+
+
+def stile_paragrafo(nome, base, **attributi):
+    return ParagraphStyle(nome, parent=STILI_BASE[base], **attributi)
+
+
+STILI_PARAGRAFO = {
+    'normale': STILI_BASE['Normal'],
+    # Titoli documento
+    'titolo': stile_paragrafo('CustomTitle', 'Heading1', fontSize=18, textColor=COLORE_BLU_SCURO,
+                              spaceAfter=20, alignment=TA_CENTER),
+    'titolo_piccolo': stile_paragrafo('CustomTitle', 'Heading1', fontSize=16, textColor=COLORE_BLU_SCURO,
+                                      spaceAfter=20, alignment=TA_CENTER),
+    'titolo_formatore': stile_paragrafo('CustomTitle', 'Heading1', fontSize=16, textColor=COLORE_BLU_SCURO,
+                                        spaceAfter=10, alignment=TA_CENTER),
+    'titolo_corso': stile_paragrafo('CustomTitle', 'Heading1', fontSize=18, textColor=COLORE_BLU_SCURO,
+                                    spaceAfter=15, alignment=TA_CENTER),
+    'titolo_report': stile_paragrafo('CustomTitle', 'Heading1', fontSize=18, textColor=COLORE_BLU_REPORT,
+                                     spaceAfter=20, alignment=TA_CENTER, fontName='Helvetica-Bold'),
+    'titolo_settimana': stile_paragrafo('CustomTitle', 'Heading1', fontSize=16, textColor=COLORE_BLU_REPORT,
+                                        spaceAfter=20, alignment=TA_CENTER, fontName='Helvetica-Bold'),
+    # Sezioni
+    'aula': stile_paragrafo('AulaTitle', 'Heading1', fontSize=14, textColor=COLORE_BLU,
+                            spaceBefore=20, spaceAfter=15, alignment=TA_LEFT),
+    'mese_aule': stile_paragrafo('MonthTitle', 'Heading2', fontSize=11, textColor=COLORE_BLU,
+                                 spaceBefore=10, spaceAfter=10),
+    'mese': stile_paragrafo('MonthTitle', 'Heading2', fontSize=12, textColor=COLORE_BLU,
+                            spaceBefore=10, spaceAfter=10),
+    'sezione': stile_paragrafo('InfoStyle', 'Heading2', fontSize=12, textColor=COLORE_BLU, spaceAfter=10),
+    # Testo
+    'date_corso': stile_paragrafo('DateStyle', 'Normal', fontSize=11, alignment=TA_CENTER, spaceAfter=20),
+    'cella': stile_paragrafo('CellStyle', 'Normal', fontSize=7, alignment=TA_CENTER, leading=9),
+    'legenda': stile_paragrafo('LegendTitle', 'Normal', fontSize=8, textColor=COLORE_BLU_SCURO),
+    'piede': stile_paragrafo('Footer', 'Normal', fontSize=7, textColor=colors.grey),
+    'nota': stile_paragrafo('Note', 'Normal', fontSize=10),
+}
+
+STILI_TABELLA = {
+    # Prenotazioni per aula e mese
+    'aule': TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COLORE_AZZURRO),
+        ('TEXTCOLOR', (0, 0), (-1, 0), COLORE_BLU_SCURO),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 8),
+        ('FONTSIZE', (0, 1), (-1, -1), 7),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, COLORE_GRIGIO_RIGA])
+    ]),
+    # Statistiche annuali del formatore
+    'statistiche': TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COLORE_BLU),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BACKGROUND', (0, 1), (-1, 1), COLORE_AZZURRO),
+        ('BACKGROUND', (0, 3), (-1, 3), COLORE_AZZURRO),
+        ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 3), (-1, 3), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('SPAN', (0, 0), (-1, 0)),
+        ('SPAN', (1, 4), (-1, 4)),
+    ]),
+    # Impegni mensili del formatore
+    'impegni': TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COLORE_AZZURRO),
+        ('TEXTCOLOR', (0, 0), (-1, 0), COLORE_BLU_SCURO),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, COLORE_GRIGIO_RIGA])
+    ]),
+    # Elenchi dei report filtrati (aule per settimane, formatore per periodo)
+    'elenco': TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COLORE_AZZURRO),
+        ('TEXTCOLOR', (0, 0), (-1, 0), COLORE_BLU_SCURO),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, COLORE_GRIGIO_RIGA])
+    ]),
+    # Informazioni generali del corso
+    'info_corso': TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), COLORE_AZZURRO),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ]),
+    # Calendario del corso (giorni in colonna, mattina / pomeriggio in riga)
+    'calendario': TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COLORE_BLU),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('BACKGROUND', (0, 1), (0, -1), COLORE_AZZURRO),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 8),
+        ('FONTSIZE', (0, 1), (0, -1), 7),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('LEFTPADDING', (0, 1), (-1, -1), 3),
+        ('RIGHTPADDING', (0, 1), (-1, -1), 3),
+    ]),
+    # Calendario del corso specifico (filtrati): anche i turni vuoti '-' in corpo 7
+    'calendario_specifico': TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COLORE_BLU),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('BACKGROUND', (0, 1), (0, -1), COLORE_AZZURRO),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 8),
+        ('FONTSIZE', (0, 1), (-1, -1), 7),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('LEFTPADDING', (0, 1), (-1, -1), 3),
+        ('RIGHTPADDING', (0, 1), (-1, -1), 3),
+    ]),
+    # Legenda attività su 2 colonne
+    'legenda': TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), COLORE_AZZURRO_CHIARO),
+        ('BACKGROUND', (2, 0), (2, -1), COLORE_AZZURRO_CHIARO),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 6),
+        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+        ('ALIGN', (3, 0), (3, -1), 'LEFT'),
+        ('GRID', (0, 0), (-1, -1), 0.3, colors.lightgrey),
+        ('LEFTPADDING', (0, 0), (-1, -1), 3),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+        ('TOPPADDING', (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    ]),
+    # Piano settimanale
+    'settimana': TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COLORE_BLU_REPORT),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 7),
+        ('ALIGN', (0, 1), (1, -1), 'CENTER'),
+        ('ALIGN', (2, 1), (-1, -1), 'LEFT'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('LINEBELOW', (0, 0), (-1, 0), 2, COLORE_BLU_REPORT),
+        ('LEFTPADDING', (0, 0), (-1, -1), 4),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ]),
+    # Formatore / corso specifico
+    'specifico': TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COLORE_BLU_REPORT),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('LINEBELOW', (0, 0), (-1, 0), 2, COLORE_BLU_REPORT),
+    ]),
+}
+
+# Legenda attività dei programmi corso
+LEGENDA_ATTIVITA = [
+    ['AULA', 'Lezione in aula', 'TT', 'Test Tedesco'],
+    ['DIGI', 'Attività digitali', 'TI', 'Test Inglese'],
+    ['CV', 'Curriculum Vitae', 'UFF', 'Ufficio'],
+    ['CS', 'Colloquio selezione', 'COL', 'Colloquio'],
+    ['RA', 'Ricerca attiva', 'C', 'Corso']
+]
+
+
+# PDF RIPRODUCIBILI
+# Con PDF_RIPRODUCIBILI = True ogni report è costruito in modalità invariant di
+# reportlab (data di creazione fissa, ID del documento calcolato dal contenuto)
+# e con metadati fissi: gli stessi dati producono un PDF identico byte per byte
+# (cache dei PDF, confronti tra esecuzioni). Con False data e ID sono quelli reali.
+# Verifica: python3 verifica_pdf_riproducibili.py
+PDF_RIPRODUCIBILI = True
+METADATI_PDF = {
+    'author': 'Pianificazione Corsi SIC',
+    'creator': 'genera_stampe_pdf',
+    'producer': 'ReportLab',
+    'subject': 'Pianificazione corsi 2026',
+}
+
+
+# PROFILI DI COMPRESSIONE (PROFILO_PDF)
+# I report usano solo i font standard del PDF (Helvetica, non incorporati) e
+# nessuna immagine: il peso dei file è quasi tutto nei flussi delle pagine.
+# - 'leggibile': flussi non compressi, per confrontare due PDF a occhio
+# - 'standard': zlib + ASCII85, il predefinito di reportlab (solo testo ASCII)
+# - 'compatto': zlib binario, circa il 16% più leggero dello standard
+# Dimensioni e tempi per profilo: python3 benchmark_stampe_pdf.py --profili
+PROFILI_PDF = {
+    'leggibile': {'pageCompression': 0, 'useA85': 0},
+    'standard': {'pageCompression': 1, 'useA85': 1},
+    'compatto': {'pageCompression': 1, 'useA85': 0},
+}
+PROFILO_PDF = 'compatto'
+
+
+class DocumentoReport(SimpleDocTemplate):
+    """
+    SimpleDocTemplate con l'opzione ASCII85 del proprio profilo
+    
+    useA85 è un'impostazione globale di reportlab, letta al salvataggio del
+    PDF: vale solo durante build ed è poi rimessa com'era, così non passa ad
+    altri documenti dello stesso processo.
+    """
+    
+    def __init__(self, filename, useA85, **kw):
+        self.useA85 = useA85
+        SimpleDocTemplate.__init__(self, filename, **kw)
+    
+    def build(self, *args, **kwargs):
+        precedente = rl_config.useA85
+        rl_config.useA85 = self.useA85
+        try:
+            SimpleDocTemplate.build(self, *args, **kwargs)
+        finally:
+            rl_config.useA85 = precedente
+
+
+def nuovo_documento(filename, titolo, **impaginazione):
+    """Documento di un report con titolo e metadati fissi (vedi PDF_RIPRODUCIBILI) e il PROFILO_PDF"""
+    profilo = PROFILI_PDF[PROFILO_PDF]
+    return DocumentoReport(filename, profilo['useA85'], title=titolo, invariant=1 if PDF_RIPRODUCIBILI else 0,
+                           pageCompression=profilo['pageCompression'], **METADATI_PDF, **impaginazione)
+
+
+# TABELLE DEI REPORT AULE E FORMATORI
+# Sono LongTable con l'intestazione ripetuta in ogni pagina (repeatRows=1):
+# anche con il piano di un anno tutto prenotato in una sola tabella una
+# LongTable resta la più rapida (benchmark_stampe_pdf.py).
+def tabella_report(table_data, colWidths, stile):
+    """La tabella di un report (prima riga = intestazione), con l'intestazione ripetuta in ogni pagina"""
+    return LongTable(table_data, colWidths=colWidths, repeatRows=1, style=stile)
+
 
 # Carica configurazione orari dall'Excel
 def carica_orari_da_excel(filename='Pianificazione_Corsi_2026.xlsx'):
@@ -69,10 +363,25 @@ FORMATORI_DATA = {
 }
 
 
+# Orari già letti: {filename: (data di modifica del file, orari)}
+_ORARI_LETTI = {}
+
+
+def orari_turni(filename='Pianificazione_Corsi_2026.xlsx'):
+    """Orari del foglio Assumptions, riletti dall'Excel solo se il file è cambiato"""
+    try:
+        versione = os.path.getmtime(filename)
+    except OSError:
+        versione = None
+    if filename not in _ORARI_LETTI or _ORARI_LETTI[filename][0] != versione:
+        _ORARI_LETTI[filename] = (versione, carica_orari_da_excel(filename))
+    return _ORARI_LETTI[filename][1]
+
+
 def turno_a_orario(turno):
     """Converte 'mattina' o 'Pomeriggio' in formato orario es: '09:00-13:00'"""
-    # Ricarica gli orari ogni volta per avere i valori aggiornati dall'Excel
-    orari_config = carica_orari_da_excel()
+    # Valori aggiornati dall'Excel: il file è riletto quando viene modificato
+    orari_config = orari_turni()
     
     turno_lower = turno.lower() if turno else ''
     if turno_lower == 'mattina':
@@ -115,23 +424,88 @@ def carica_attivita_esterne(filename='Pianificazione_Corsi_2026.xlsx'):
         }
 
 
-def carica_dati_excel(filename):
-    """Carica tutti i dati dal file Excel"""
+# Fogli con i turni: l'anno del piano ('2026') oppure uno per periodo
+# ('2026 T1'..., '2026 GEN'...), come NOME_FOGLIO_PIANO di crea_pianificazione_smart
+FOGLIO_ANNO = re.compile(r'\d{4}')
+FOGLIO_PERIODO = re.compile(r'\d{4} \S+')
+
+# Colonna 'percorso' dei 4 blocchi (percorso, F1, F2, aula, attività, test)
+COLONNE_PERCORSI = [3, 9, 15, 21]
+
+# Layout a tabella: intestazione 'Data' | 'Turno' in riga 4, un turno per riga sotto
+RIGA_INTESTAZIONE_TABELLA = 4
+INTESTAZIONE_TABELLA = ('Data', 'Turno')
+
+
+def fogli_piano(nomi_fogli):
+    """Nomi dei fogli del piano nell'ordine del file"""
+    anni = [nome for nome in nomi_fogli if FOGLIO_ANNO.fullmatch(nome)]
+    if anni:
+        return anni[:1]
+    return [nome for nome in nomi_fogli if FOGLIO_PERIODO.fullmatch(nome)]
+
+
+def leggi_foglio(filename, nome_foglio):
+    """Turni di un solo foglio del piano (usata dai processi di carica_dati_excel con processi > 1)"""
+    wb = load_workbook(filename, read_only=True)
+    try:
+        return leggi_turni(wb[nome_foglio])
+    finally:
+        wb.close()
+
+
+def carica_dati_excel(filename, processi=None):
+    """Carica tutti i dati dal file Excel
+    
+    Di norma tutti i fogli del piano sono letti in sequenza dalla stessa
+    apertura read-only. Con processi > 1 (e piano diviso per trimestre /
+    mese) ogni foglio è letto da un processo separato che riapre il file:
+    conviene solo con fogli molto grandi, su un piano di un anno l'avvio
+    dei processi costa più della lettura (1,31s contro 0,12s in sequenza).
+    I turni sono restituiti in ordine di foglio.
+    """
     print(f"📖 Caricamento dati da {filename}...")
     
-    wb = load_workbook(filename)
-    ws = wb['2026']
+    wb = load_workbook(filename, read_only=True)
+    fogli = fogli_piano(wb.sheetnames)
+    processi = min(len(fogli), processi or 1)
+    if processi == 1:
+        dati = [turno for nome in fogli for turno in leggi_turni(wb[nome])]
+        wb.close()
+    else:
+        wb.close()
+        with ProcessPoolExecutor(max_workers=processi) as executor:
+            parti = executor.map(leggi_foglio, [filename] * len(fogli), fogli)
+            dati = [turno for parte in parti for turno in parte]
+    if len(fogli) > 1:
+        print(f"   {len(fogli)} fogli: {', '.join(fogli)}")
+    
+    print(f"✅ Caricati {len(dati)} turni\n")
+    return dati
+
+
+def leggi_turni(ws):
+    """Turni di un foglio del piano (già aperto) nel formato usato da tutti i report
+    
+    Le righe sono lette in sequenza come tuple di valori: funziona anche
+    con i file aperti in read-only.
+    """
+    intestazione = next(ws.iter_rows(min_row=RIGA_INTESTAZIONE_TABELLA, max_row=RIGA_INTESTAZIONE_TABELLA,
+                                      max_col=2, values_only=True), ())
+    if tuple(intestazione) == INTESTAZIONE_TABELLA:
+        return leggi_turni_tabella(ws)
     
     dati = []
     ultima_data = None  # Memorizza l'ultima data valida per i pomeriggi
     
-    for row in range(1, ws.max_row + 1):
-        turno = ws.cell(row=row, column=2).value
+    for valori in ws.iter_rows(max_col=37, values_only=True):
+        valori = tuple(valori) + (None,) * (37 - len(valori))
+        turno = valori[1]
         
         if turno not in ['mattina', 'Pomeriggio']:
             continue
         
-        data = ws.cell(row=row, column=1).value
+        data = valori[0]
         
         # Se non c'è data e il turno è Pomeriggio, usa l'ultima data valida
         if not data and turno == 'Pomeriggio' and ultima_data:
@@ -147,84 +521,404 @@ def carica_dati_excel(filename):
                 continue
         
         # Aggiorna l'ultima data valida se presente
-        if ws.cell(row=row, column=1).value:
+        if valori[0]:
             ultima_data = data
         
-        # Estrai tutti i dati della riga
-        riga_dati = {
-            'data': data,
-            'turno': turno,
-            'percorsi': []
-        }
-        
-        # PERCORSO 1 (C-H)
-        perc1 = {
-            'nome': ws.cell(row=row, column=3).value,
-            'formatore1': ws.cell(row=row, column=4).value,
-            'formatore2': ws.cell(row=row, column=5).value,
-            'aula': ws.cell(row=row, column=6).value,
-            'attivita': ws.cell(row=row, column=7).value,
-            'test': ws.cell(row=row, column=8).value,
-        }
-        if any(perc1.values()):
-            riga_dati['percorsi'].append(('Percorso 1', perc1))
-        
-        # PERCORSO 2 (I-N)
-        perc2 = {
-            'nome': ws.cell(row=row, column=9).value,
-            'formatore1': ws.cell(row=row, column=10).value,
-            'formatore2': ws.cell(row=row, column=11).value,
-            'aula': ws.cell(row=row, column=12).value,
-            'attivita': ws.cell(row=row, column=13).value,
-            'test': ws.cell(row=row, column=14).value,
-        }
-        if any(perc2.values()):
-            riga_dati['percorsi'].append(('Percorso 2', perc2))
-        
-        # PERCORSO 3 (O-T)
-        perc3 = {
-            'nome': ws.cell(row=row, column=15).value,
-            'formatore1': ws.cell(row=row, column=16).value,
-            'formatore2': ws.cell(row=row, column=17).value,
-            'aula': ws.cell(row=row, column=18).value,
-            'attivita': ws.cell(row=row, column=19).value,
-            'test': ws.cell(row=row, column=20).value,
+        dati.append(turno_da_valori(data, turno, valori))
+    
+    return dati
+
+
+def leggi_turni_tabella(ws):
+    """
+    Layout a tabella (--layout tabella): ogni riga sotto l'intestazione è un
+    turno con la sua data. Stesse verifiche del layout per mesi (turno valido,
+    date scritte come testo GG/MM/AAAA); la tabella può essere stata
+    riordinata in Excel, quindi i turni sono rimessi in ordine di data.
+    """
+    dati = []
+    for valori in ws.iter_rows(min_row=RIGA_INTESTAZIONE_TABELLA + 1, max_col=37, values_only=True):
+        valori = tuple(valori) + (None,) * (37 - len(valori))
+        data, turno = valori[0], valori[1]
+        if turno not in ['mattina', 'Pomeriggio'] or not data:
+            continue
+        if isinstance(data, str):
+            try:
+                data = datetime.strptime(data.strip(), '%d/%m/%Y')
+            except ValueError:
+                continue
+        dati.append(turno_da_valori(data, turno, valori))
+    
+    dati.sort(key=lambda riga: (riga['data'], riga['turno'] != 'mattina'))
+    return dati
+
+
+def turno_da_valori(data, turno, valori):
+    """Dizionario del turno dai valori di una riga (colonne A-AK)"""
+    riga_dati = {
+        'data': data,
+        'turno': turno,
+        'percorsi': []
+    }
+    
+    # PERCORSI 1-4 (C-H, I-N, O-T, U-Z)
+    for numero, col in enumerate(COLONNE_PERCORSI, start=1):
+        nome, formatore1, formatore2, aula, attivita, test = valori[col - 1:col + 5]
+        perc = {
+            'nome': nome,
+            'formatore1': formatore1,
+            'formatore2': formatore2,
+            'aula': aula,
+            'attivita': attivita,
+            'test': test,
         }
-        if any(perc3.values()):
-            riga_dati['percorsi'].append(('Percorso 3', perc3))
+        if any(perc.values()):
+            riga_dati['percorsi'].append((f'Percorso {numero}', perc))
+    
+    # FUORI AULA (AB-AK) - 5 coppie formatore/attività
+    formatori_fa = []
+    attivita_fa = []
+    for i in range(5):
+        formatore = valori[27 + i * 2]  # colonne 28,30,32,34,36
+        attivita = valori[28 + i * 2]   # colonne 29,31,33,35,37
+        if formatore:
+            formatori_fa.append({'formatore': formatore, 'attivita': attivita or ''})
+        if attivita:
+            attivita_fa.append(attivita)
+    
+    riga_dati['fuori_aula'] = formatori_fa
+    riga_dati['attivita_esterne'] = attivita_fa
+    return riga_dati
+
+
+def fuori_aula_turno(riga):
+    """[(formatore, attività)] fuori aula di un turno"""
+    return [(fa.get('formatore'), fa.get('attivita', '')) if isinstance(fa, dict) else (fa, '')
+            for fa in riga.get('fuori_aula', [])]
+
+
+def giorni_svolti_formatori(dati):
+    """Giorni svolti per formatore: 0.5 per ogni turno in un percorso o fuori aula"""
+    totali = defaultdict(float)
+    for riga in dati:
+        if not riga['data']:
+            continue
+        for perc_label, perc_dati in riga['percorsi']:
+            for formatore in [perc_dati.get('formatore1'), perc_dati.get('formatore2')]:
+                if formatore and formatore in FORMATORI:
+                    totali[formatore] += 0.5
+        for fa_item in riga.get('fuori_aula', []):
+            formatore = fa_item.get('formatore') if isinstance(fa_item, dict) else fa_item
+            if formatore in FORMATORI:
+                totali[formatore] += 0.5
+    return totali
+
+
+# AGGREGAZIONE DEI TURNI
+# Le viste usate dai report (aule, formatori, corsi, settimane, report
+# filtrati) sono calcolate in un solo passaggio sui turni e memorizzate per
+# l'ultima lista 'dati' ricevuta: con l'opzione 7 i quattro report e i report
+# filtrati le condividono invece di riscorrere i turni ognuno per conto suo.
+# Le viste non vanno modificate; 'dati' non va modificato dopo l'aggregazione.
+_AGGREGATI = [None, None]
+
+
+def aggrega_dati(dati):
+    """
+    Viste dei turni per i report, calcolate una sola volta per la stessa lista 'dati':
+    
+    - 'aule': {aula: {mese: [prenotazioni]}}
+    - 'aule_settimane': {numero settimana ISO: {aula: [prenotazioni]}}
+    - 'formatori': {formatore: {mese: [impegni]}} (solo formatori in FORMATORI)
+    - 'giorni_svolti': {formatore: giorni} (come giorni_svolti_formatori)
+    - 'percorsi': {percorso: [turni del percorso]}
+    - 'settimane': {'AAAA_Wss': [turni]}
+    - 'turni_formatore': {formatore: [turni]} (qualsiasi formatore, in aula o fuori aula,
+      in ordine di data)
+    - 'ordinali_formatore': {formatore: [date.toordinal() dei turni_formatore]}, per
+      trovare i turni di un periodo con bisect
+    - 'turni_corso': {corso: [(turno, percorso)]}
+    """
+    if _AGGREGATI[0] is dati:
+        return _AGGREGATI[1]
+    
+    aule = defaultdict(lambda: defaultdict(list))
+    aule_settimane = defaultdict(lambda: defaultdict(list))
+    formatori = defaultdict(lambda: defaultdict(list))
+    giorni_svolti = defaultdict(float)
+    percorsi = defaultdict(list)
+    settimane = defaultdict(list)
+    turni_formatore = defaultdict(list)
+    turni_corso = defaultdict(list)
+    
+    for riga in dati:
+        if not riga['data']:
+            continue
         
-        # PERCORSO 4 (U-Z)
-        perc4 = {
-            'nome': ws.cell(row=row, column=21).value,
-            'formatore1': ws.cell(row=row, column=22).value,
-            'formatore2': ws.cell(row=row, column=23).value,
-            'aula': ws.cell(row=row, column=24).value,
-            'attivita': ws.cell(row=row, column=25).value,
-            'test': ws.cell(row=row, column=26).value,
-        }
-        if any(perc4.values()):
-            riga_dati['percorsi'].append(('Percorso 4', perc4))
+        data = riga['data']
+        mese = data.month
+        num_settimana = data.isocalendar()[1]
+        settimane[f"{data.year}_W{num_settimana:02d}"].append(riga)
+        presenti = []
+        corsi = []
         
-        # FUORI AULA (AB-AK) - 5 coppie formatore/attività
-        formatori_fa = []
-        attivita_fa = []
-        for i in range(5):
-            form_col = 28 + (i * 2)  # 28,30,32,34,36
-            att_col = 29 + (i * 2)   # 29,31,33,35,37
-            formatore = ws.cell(row=row, column=form_col).value
-            attivita = ws.cell(row=row, column=att_col).value
-            if formatore:
-                formatori_fa.append({'formatore': formatore, 'attivita': attivita or ''})
-            if attivita:
-                attivita_fa.append(attivita)
+        for perc_label, perc_dati in riga['percorsi']:
+            nome_percorso = perc_dati.get('nome')
+            formatori_perc = [f for f in [perc_dati.get('formatore1'), perc_dati.get('formatore2')] if f]
+            
+            if perc_dati.get('aula'):
+                prenotazione = {
+                    'data': data,
+                    'turno': riga['turno'],
+                    'percorso': perc_dati.get('nome', ''),
+                    'attivita': perc_dati.get('attivita', ''),
+                    'formatori': formatori_perc
+                }
+                aule[perc_dati['aula']][mese].append(prenotazione)
+                aule_settimane[num_settimana][perc_dati['aula']].append(prenotazione)
+            
+            for formatore in formatori_perc:
+                presenti.append(formatore)
+                if formatore in FORMATORI:
+                    giorni_svolti[formatore] += 0.5
+                    formatori[formatore][mese].append({
+                        'data': data,
+                        'turno': riga['turno'],
+                        'percorso': perc_dati.get('nome', ''),
+                        'aula': perc_dati.get('aula', ''),
+                        'attivita': perc_dati.get('attivita', ''),
+                        'tipo': 'Corso'
+                    })
+            
+            if nome_percorso:
+                percorsi[nome_percorso].append({
+                    'data': data,
+                    'turno': riga['turno'],
+                    'formatore1': perc_dati.get('formatore1'),
+                    'formatore2': perc_dati.get('formatore2'),
+                    'aula': perc_dati.get('aula'),
+                    'attivita': perc_dati.get('attivita'),
+                    'test': perc_dati.get('test')
+                })
+                if nome_percorso not in corsi:
+                    corsi.append(nome_percorso)
+                    turni_corso[nome_percorso].append((riga, perc_dati))
         
-        riga_dati['fuori_aula'] = formatori_fa
-        riga_dati['attivita_esterne'] = attivita_fa
+        # Fuori aula - con mappatura attività
+        for formatore, attivita_codice in fuori_aula_turno(riga):
+            presenti.append(formatore)
+            if formatore in FORMATORI:
+                giorni_svolti[formatore] += 0.5
+                formatori[formatore][mese].append({
+                    'data': data,
+                    'turno': riga['turno'],
+                    'percorso': '-',
+                    'aula': 'Fuori aula',
+                    'attivita': attivita_codice or 'Attività esterna',
+                    'tipo': 'Fuori aula'
+                })
         
-        dati.append(riga_dati)
+        for formatore in dict.fromkeys(presenti):
+            turni_formatore[formatore].append(riga)
+    
+    # Turni in ordine di data (sort stabile: mattina prima del pomeriggio);
+    # i fogli del piano sono già in ordine, l'ordinamento costa solo un passaggio
+    for turni in turni_formatore.values():
+        turni.sort(key=lambda riga: riga['data'])
+    
+    aggregati = {
+        'aule': {aula: dict(mesi) for aula, mesi in aule.items()},
+        'aule_settimane': {settimana: dict(aule_sett) for settimana, aule_sett in aule_settimane.items()},
+        'formatori': {formatore: dict(mesi) for formatore, mesi in formatori.items()},
+        'giorni_svolti': dict(giorni_svolti),
+        'percorsi': dict(percorsi),
+        'settimane': dict(settimane),
+        'turni_formatore': dict(turni_formatore),
+        'ordinali_formatore': {formatore: [riga['data'].toordinal() for riga in turni]
+                               for formatore, turni in turni_formatore.items()},
+        'turni_corso': dict(turni_corso),
+    }
+    _AGGREGATI[:] = [dati, aggregati]
+    return aggregati
+
+
+# CACHE DEI PDF
+# Ogni PDF è identificato dall'impronta (sha256) dei suoi dati: turni dell'aula /
+# formatore / corso / settimana, orari dei turni, mappature delle attività,
+# FORMATORI_DATA e versione del modello. Se <output_dir>/.cache_pdf contiene già
+# un PDF con la stessa impronta, doc.build è saltato e il file viene solo copiato.
+# VERSIONE_MODELLO_PDF va incrementata quando cambia l'impaginazione dei report.
+# La cache non cresce all'infinito: INDICE_CACHE_PDF registra per ogni impronta
+# i PDF che la usano e dopo ogni esecuzione sono tolte le impronte superate dei
+# PDF appena prodotti (gli altri report della stessa cartella restano in cache).
+VERSIONE_MODELLO_PDF = 3
+CARTELLA_CACHE_PDF = '.cache_pdf'
+INDICE_CACHE_PDF = 'indice.json'
+
+# PDF riutilizzati / generati dall'avvio del programma (riepilogo di main)
+CONTEGGIO_CACHE_PDF = {'riutilizzati': 0, 'generati': 0}
+
+
+def valori_impronta(valore):
+    """Dati in forma confrontabile per l'impronta: dizionari come coppie ordinate per chiave"""
+    if isinstance(valore, dict):
+        return sorted(([str(chiave), valori_impronta(v)] for chiave, v in valore.items()),
+                      key=lambda coppia: coppia[0])
+    if isinstance(valore, (list, tuple)):
+        return [valori_impronta(v) for v in valore]
+    return valore
+
+
+def impronta_pdf(funzione, argomenti):
+    """Impronta sha256 di un PDF: funzione e argomenti (senza il nome del file), orari, versione, opzioni del profilo"""
+    contenuto = json.dumps([VERSIONE_MODELLO_PDF, PDF_RIPRODUCIBILI, PROFILI_PDF[PROFILO_PDF], funzione.__name__,
+                            orari_turni(), valori_impronta(FORMATORI_DATA), valori_impronta(argomenti[1:])], default=str)
+    return hashlib.sha256(contenuto.encode('utf-8')).hexdigest()
+
+
+def file_cache_pdf(filename, impronta):
+    return os.path.join(os.path.dirname(filename), CARTELLA_CACHE_PDF, impronta + '.pdf')
+
+
+def pulisci_cache_pdf(cartella, impronte):
+    """
+    Toglie dalla cache 'cartella' i PDF superati; impronte = {impronta: [nomi dei PDF]} dei lavori appena eseguiti
     
-    print(f"✅ Caricati {len(dati)} turni\n")
-    return dati
+    Un'impronta in cache è tolta quando nessuno dei PDF che la usavano la
+    usa ancora (sono stati tutti prodotti con un'altra impronta). Restano le
+    impronte dei PDF non coinvolti, per esempio degli altri report. I PDF
+    in cache non registrati nell'indice (cache di versioni precedenti) sono tolti.
+    Restituisce il numero di PDF tolti.
+    """
+    file_indice = os.path.join(cartella, INDICE_CACHE_PDF)
+    indice = {}
+    if os.path.exists(file_indice):
+        with open(file_indice, encoding='utf-8') as f:
+            indice = json.load(f)
+    
+    prodotti = {nome for nomi in impronte.values() for nome in nomi}
+    for impronta in list(indice):
+        indice[impronta] = [nome for nome in indice[impronta] if nome not in prodotti]
+    for impronta, nomi in impronte.items():
+        indice[impronta] = sorted(set(indice.get(impronta, [])) | set(nomi))
+    
+    tolti = 0
+    for nome_file in os.listdir(cartella):
+        impronta, estensione = os.path.splitext(nome_file)
+        if estensione == '.pdf' and not indice.get(impronta):
+            os.remove(os.path.join(cartella, nome_file))
+            tolti += 1
+    indice = {impronta: nomi for impronta, nomi in indice.items() if nomi}
+    
+    with open(file_indice, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, indent=1, sort_keys=True)
+    return tolti
+
+
+def esegui_lavori_pdf(lavori, processi=None, cache=True):
+    """
+    Genera i PDF indipendenti di un report: lavori = [(intestazione, filename, funzione, argomenti)]
+    
+    Con più CPU ogni PDF è costruito in un processo del pool (processi =
+    numero di CPU se non indicato); l'avanzamento è stampato nell'ordine dei
+    lavori. Un PDF che fallisce non ferma gli altri: restituisce [(filename, errore)].
+    cache=True: i PDF con dati invariati sono copiati dalla cache senza doc.build
+    (vedi impronta_pdf), quelli generati vi sono aggiunti e le impronte
+    superate degli stessi PDF sono tolte (pulisci_cache_pdf).
+    """
+    in_cache = {}
+    da_generare = []
+    for idx, (_, filename, funzione, argomenti) in enumerate(lavori):
+        if cache:
+            in_cache[idx] = file_cache_pdf(filename, impronta_pdf(funzione, argomenti))
+            if os.path.exists(in_cache[idx]):
+                continue
+        da_generare.append(idx)
+    
+    processi = min(len(da_generare), processi or os.cpu_count() or 1)
+    errori = []
+    with contextlib.ExitStack() as stack:
+        futures = {}
+        if processi > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=processi))
+            futures = {idx: executor.submit(lavori[idx][2], *lavori[idx][3]) for idx in da_generare}
+        
+        for idx, (intestazione, filename, funzione, argomenti) in enumerate(lavori):
+            print(intestazione)
+            if idx not in da_generare:
+                shutil.copyfile(in_cache[idx], filename)
+                print("   ♻️  Invariato: copiato dalla cache")
+                continue
+            try:
+                esito = futures[idx].result() if futures else funzione(*argomenti)
+                if cache:
+                    os.makedirs(os.path.dirname(in_cache[idx]), exist_ok=True)
+                    shutil.copyfile(filename, in_cache[idx])
+                print(f"   ✅ {esito}")
+            except Exception as e:
+                errori.append((filename, str(e)))
+                print(f"   ❌ Errore: {e}")
+    
+    riutilizzati = len(lavori) - len(da_generare)
+    CONTEGGIO_CACHE_PDF['riutilizzati'] += riutilizzati
+    CONTEGGIO_CACHE_PDF['generati'] += len(da_generare) - len(errori)
+    if cache:
+        # Impronte dei PDF di questa esecuzione per cartella della cache
+        impronte = {}
+        for idx, (_, filename, _, _) in enumerate(lavori):
+            cartella, nome_file = os.path.split(in_cache[idx])
+            if os.path.exists(in_cache[idx]):
+                impronte.setdefault(cartella, {}).setdefault(os.path.splitext(nome_file)[0], []).append(
+                    os.path.basename(filename))
+        tolti = sum(pulisci_cache_pdf(cartella, impronte_cartella) for cartella, impronte_cartella in impronte.items())
+        print(f"♻️  Cache PDF: {riutilizzati} riutilizzati, {len(da_generare) - len(errori)} generati"
+              + (f", {tolti} superati tolti" if tolti else ""))
+    if errori:
+        print(f"⚠️  {len(errori)} PDF non generati")
+    return errori
+
+
+def pdf_in_memoria(lavoro, cache=True):
+    """
+    Il PDF di un lavoro (vedi esegui_lavori_pdf) costruito in un BytesIO, senza scrivere file
+    
+    Restituisce (byte del PDF, nome del file suggerito): il server li invia
+    direttamente, un lavoro batch può metterli in uno zip. Con cache=True un
+    PDF con la stessa impronta già presente in cache è letto da lì.
+    """
+    _, filename, funzione, argomenti = lavoro
+    if cache:
+        in_cache = file_cache_pdf(filename, impronta_pdf(funzione, argomenti))
+        if os.path.exists(in_cache):
+            with open(in_cache, 'rb') as f:
+                return f.read(), os.path.basename(filename)
+    
+    buffer = io.BytesIO()
+    funzione(buffer, *argomenti[1:])
+    return buffer.getvalue(), os.path.basename(filename)
+
+
+# Lavori dei quattro report standard per nome del PDF, costruiti una volta
+# per la stessa lista 'dati' (come _AGGREGATI): [dati, output_dir, {nome: lavoro}]
+_LAVORI_PER_NOME = [None, None, {}]
+
+
+def lavoro_per_nome(dati, nome, output_dir='stampe_pdf'):
+    """
+    Il lavoro che produce il PDF 'nome' tra quelli di aule, formatori, corsi e settimane (None se nessuno)
+    
+    I nomi dei report filtrati (formatore per periodo, corso specifico, aule per
+    settimane) sono diversi da quelli dei quattro report: per loro la risposta
+    è None senza ricostruire i lavori.
+    """
+    if _LAVORI_PER_NOME[0] is not dati or _LAVORI_PER_NOME[1] != output_dir:
+        lavori = {}
+        for lavori_report in (lavori_report_aule, lavori_report_formatori, lavori_report_corsi,
+                              lavori_report_settimanale):
+            for lavoro in lavori_report(dati, output_dir):
+                lavori[os.path.basename(lavoro[1])] = lavoro
+        _LAVORI_PER_NOME[:] = [dati, output_dir, lavori]
+    return _LAVORI_PER_NOME[2].get(nome)
 
 
 def genera_report_aule(dati, output_dir='stampe_pdf', data_inizio=None, data_fine=None):
@@ -242,35 +936,27 @@ def genera_report_aule(dati, output_dir='stampe_pdf', data_inizio=None, data_fin
     
     os.makedirs(output_dir, exist_ok=True)
     
-    # Organizza dati per aula e mese
-    aule_mensili = defaultdict(lambda: defaultdict(list))
+    lavori = lavori_report_aule(dati, output_dir, data_inizio, data_fine)
+    errori = esegui_lavori_pdf(lavori, 1)
     
-    for riga in dati:
-        if not riga['data']:
-            continue
-        
-        data = riga['data']
-        
-        # Filtra per periodo se specificato
-        if data_inizio and data < data_inizio:
-            continue
-        if data_fine and data > data_fine:
-            continue
-        
-        mese = data.month
-        
-        for perc_label, perc_dati in riga['percorsi']:
-            aula = perc_dati.get('aula')
-            if not aula:
-                continue
-            
-            aule_mensili[aula][mese].append({
-                'data': data,
-                'turno': riga['turno'],
-                'percorso': perc_dati.get('nome', ''),
-                'attivita': perc_dati.get('attivita', ''),
-                'formatori': [f for f in [perc_dati.get('formatore1'), perc_dati.get('formatore2')] if f]
-            })
+    print(f"✅ Report aule completato: {lavori[0][1]}\n")
+    return errori
+
+
+def lavori_report_aule(dati, output_dir='stampe_pdf', data_inizio=None, data_fine=None):
+    """Il lavoro del PDF prenotazione aule (vedi esegui_lavori_pdf)"""
+    # Prenotazioni per aula e mese (aggrega_dati), filtrate per periodo se specificato
+    aule_mensili = aggrega_dati(dati)['aule']
+    if data_inizio or data_fine:
+        aule_periodo = {}
+        for aula, mesi in aule_mensili.items():
+            for mese, prenotazioni in mesi.items():
+                nel_periodo = [p for p in prenotazioni
+                               if not (data_inizio and p['data'] < data_inizio)
+                               and not (data_fine and p['data'] > data_fine)]
+                if nel_periodo:
+                    aule_periodo.setdefault(aula, {})[mese] = nel_periodo
+        aule_mensili = aule_periodo
     
     # Genera UN SOLO PDF con TUTTE le aule
     if data_inizio and data_fine:
@@ -278,45 +964,31 @@ def genera_report_aule(dati, output_dir='stampe_pdf', data_inizio=None, data_fin
     else:
         filename = os.path.join(output_dir, 'Prenotazione_Aule_2026.pdf')
     
-    doc = SimpleDocTemplate(filename, pagesize=A4, 
-                           leftMargin=1.5*cm, rightMargin=1.5*cm,
-                           topMargin=2*cm, bottomMargin=2*cm)
+    return [(f"📄 Generazione: {filename}", filename, pdf_aule,
+             (filename, aule_mensili, data_inizio, data_fine))]
+
+
+def pdf_aule(filename, aule_mensili, data_inizio=None, data_fine=None):
+    """Il PDF della prenotazione aule: aule_mensili = {aula: {mese: [prenotazioni]}}"""
+    doc = nuovo_documento(filename, "Prenotazione aule 2026", pagesize=A4,
+                          leftMargin=1.5*cm, rightMargin=1.5*cm,
+                          topMargin=2*cm, bottomMargin=2*cm)
     
     elements = []
-    styles = getSampleStyleSheet()
-    
-    # Stile titolo principale
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1F4E78'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
     
     # Titolo documento
     if data_inizio and data_fine:
-        elements.append(Paragraph(f"<b>PRENOTAZIONE AULE 2026</b>", title_style))
-        elements.append(Paragraph(f"Dal {data_inizio.strftime('%d/%m/%Y')} al {data_fine.strftime('%d/%m/%Y')}", styles['Normal']))
+        elements.append(Paragraph(f"<b>PRENOTAZIONE AULE 2026</b>", STILI_PARAGRAFO['titolo']))
+        elements.append(Paragraph(f"Dal {data_inizio.strftime('%d/%m/%Y')} al {data_fine.strftime('%d/%m/%Y')}", STILI_PARAGRAFO['normale']))
     else:
-        elements.append(Paragraph(f"<b>PRENOTAZIONE AULE 2026</b>", title_style))
-        elements.append(Paragraph(f"Tutte le aule - Anno 2026", styles['Normal']))
+        elements.append(Paragraph(f"<b>PRENOTAZIONE AULE 2026</b>", STILI_PARAGRAFO['titolo']))
+        elements.append(Paragraph(f"Tutte le aule - Anno 2026", STILI_PARAGRAFO['normale']))
     elements.append(Spacer(1, 1*cm))
     
     # Per ogni aula
     for idx_aula, aula in enumerate(sorted(aule_mensili.keys())):
         # Titolo aula
-        aula_style = ParagraphStyle(
-            'AulaTitle',
-            parent=styles['Heading1'],
-            fontSize=14,
-            textColor=colors.HexColor('#2E75B5'),
-            spaceBefore=20,
-            spaceAfter=15,
-            alignment=TA_LEFT
-        )
-        elements.append(Paragraph(f"<b>AULA {aula}</b>", aula_style))
+        elements.append(Paragraph(f"<b>AULA {aula}</b>", STILI_PARAGRAFO['aula']))
         
         # Per ogni mese
         for mese in sorted(aule_mensili[aula].keys()):
@@ -327,15 +999,7 @@ def genera_report_aule(dati, output_dir='stampe_pdf', data_inizio=None, data_fin
             
             # Titolo mese
             nome_mese = calendar.month_name[mese].upper()
-            month_style = ParagraphStyle(
-                'MonthTitle',
-                parent=styles['Heading2'],
-                fontSize=11,
-                textColor=colors.HexColor('#2E75B5'),
-                spaceBefore=10,
-                spaceAfter=10
-            )
-            elements.append(Paragraph(f"<b>{nome_mese} 2026</b>", month_style))
+            elements.append(Paragraph(f"<b>{nome_mese} 2026</b>", STILI_PARAGRAFO['mese_aule']))
             
             # Statistiche
             num_prenotazioni = len(prenotazioni)
@@ -348,11 +1012,11 @@ def genera_report_aule(dati, output_dir='stampe_pdf', data_inizio=None, data_fin
                     attivita_count[p['attivita']] += 1
             
             stats_text = f"<b>Prenotazioni:</b> {num_prenotazioni} (Mattina: {num_mattine}, Pomeriggio: {num_pomeriggi})"
-            elements.append(Paragraph(stats_text, styles['Normal']))
+            elements.append(Paragraph(stats_text, STILI_PARAGRAFO['normale']))
             
             if attivita_count:
                 att_text = "<b>Attività:</b> " + ", ".join([f"{att} ({cnt})" for att, cnt in sorted(attivita_count.items())])
-                elements.append(Paragraph(att_text, styles['Normal']))
+                elements.append(Paragraph(att_text, STILI_PARAGRAFO['normale']))
             
             elements.append(Spacer(1, 0.3*cm))
             
@@ -368,18 +1032,7 @@ def genera_report_aule(dati, output_dir='stampe_pdf', data_inizio=None, data_fin
                     ', '.join(pren['formatori']) if pren['formatori'] else '-'
                 ])
             
-            table = Table(table_data, colWidths=[2.2*cm, 2.2*cm, 2.2*cm, 2.2*cm, 4.5*cm])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#D9E1F2')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1F4E78')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('FONTSIZE', (0, 1), (-1, -1), 7),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F2F2F2')])
-            ]))
+            table = tabella_report(table_data, [2.2*cm, 2.2*cm, 2.2*cm, 2.2*cm, 4.5*cm], STILI_TABELLA['aule'])
             
             elements.append(table)
             elements.append(Spacer(1, 0.6*cm))
@@ -391,11 +1044,89 @@ def genera_report_aule(dati, output_dir='stampe_pdf', data_inizio=None, data_fin
     doc.build(elements)
     
     total_prenotazioni = sum(len(aule_mensili[a][m]) for a in aule_mensili for m in aule_mensili[a])
-    print(f"   ✅ Generato: {len(aule_mensili)} aule, {total_prenotazioni} prenotazioni totali\n")
-    print(f"✅ Report aule completato: {filename}\n")
+    return f"Generato: {len(aule_mensili)} aule, {total_prenotazioni} prenotazioni totali\n"
 
 
-def genera_report_formatori(dati, output_dir='stampe_pdf'):
+def pdf_formatore(filename, formatore, impegni_mensili, giorni_svolti, mappature_attivita):
+    """Un PDF del report formatori (eseguita anche nei processi di esegui_lavori_pdf)"""
+    doc = nuovo_documento(filename, f"Programma formatore {formatore} 2026", pagesize=A4,
+                          leftMargin=1.5*cm, rightMargin=1.5*cm,
+                          topMargin=2*cm, bottomMargin=2*cm)
+    
+    elements = []
+    
+    # Titolo
+    elements.append(Paragraph(f"<b>PROGRAMMA FORMATORE {formatore}</b>", STILI_PARAGRAFO['titolo_formatore']))
+    elements.append(Paragraph(f"Anno 2026", STILI_PARAGRAFO['normale']))
+    elements.append(Spacer(1, 0.5*cm))
+    
+    # STATISTICHE ANNUALI
+    turni_svolti = int(giorni_svolti * 2)
+    
+    if formatore in FORMATORI_DATA:
+        giorni_previsti = FORMATORI_DATA[formatore]['giorni_previsti']
+        percentuale = FORMATORI_DATA[formatore]['perc']
+        giorni_rimanenti = giorni_previsti - giorni_svolti
+        perc_svolti = (giorni_svolti / giorni_previsti * 100) if giorni_previsti > 0 else 0
+        
+        stats_data = [
+            ['STATISTICHE ANNUALI', '', '', ''],
+            ['% Contratto', 'Giorni Previsti', 'Giorni Svolti', 'Giorni Rimanenti'],
+            [f'{int(percentuale*100)}%', f'{giorni_previsti}', f'{giorni_svolti:.1f}', f'{giorni_rimanenti:.1f}'],
+            ['Turni Svolti', 'Percentuale Completata', '', ''],
+            [f'{turni_svolti}', f'{perc_svolti:.1f}%', '', '']
+        ]
+        
+        stats_table = Table(stats_data, colWidths=[3.5*cm, 3.5*cm, 3.5*cm, 3.5*cm])
+        stats_table.setStyle(STILI_TABELLA['statistiche'])
+        
+        elements.append(stats_table)
+        elements.append(Spacer(1, 1*cm))
+    
+    # Per ogni mese
+    for mese in sorted(impegni_mensili.keys()):
+        impegni = impegni_mensili[mese]
+        
+        if not impegni:
+            continue
+        
+        # Titolo mese
+        nome_mese = calendar.month_name[mese].upper()
+        elements.append(Paragraph(f"<b>{nome_mese} 2026</b>", STILI_PARAGRAFO['mese']))
+        
+        # Conteggio mensile
+        giorni_mese = len(impegni) * 0.5
+        turni_mese = len(impegni)
+        elements.append(Paragraph(f"<b>Impegni:</b> {turni_mese} turni ({giorni_mese:.1f} giorni)", STILI_PARAGRAFO['normale']))
+        elements.append(Spacer(1, 0.3*cm))
+        
+        # Tabella impegni
+        table_data = [['Data', 'Orario', 'Percorso', 'Aula', 'Attività']]
+        
+        for imp in sorted(impegni, key=lambda x: (x['data'], x['turno'])):
+            # Mappatura nome attività se è fuori aula
+            attivita_display = imp['attivita'] or '-'
+            if imp['tipo'] == 'Fuori aula' and imp['attivita'] in mappature_attivita:
+                attivita_display = mappature_attivita[imp['attivita']]
+            
+            table_data.append([
+                imp['data'].strftime('%d/%m/%Y'),
+                turno_a_orario(imp['turno']),
+                imp['percorso'] or '-',
+                imp['aula'] or '-',
+                attivita_display
+            ])
+        
+        table = tabella_report(table_data, [2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 4.5*cm], STILI_TABELLA['impegni'])
+        
+        elements.append(table)
+        elements.append(Spacer(1, 0.8*cm))
+    
+    doc.build(elements)
+    return f"Generato per {formatore}: {giorni_svolti:.1f} giorni, {len(impegni_mensili)} mesi\n"
+
+
+def genera_report_formatori(dati, output_dir='stampe_pdf', processi=None):
     """
     REPORT 2: Programma Formatori (mensile)
     Per ogni formatore: calendario mensile + conteggio ore, rimanenti, percentuale
@@ -407,180 +1138,195 @@ def genera_report_formatori(dati, output_dir='stampe_pdf'):
     
     os.makedirs(output_dir, exist_ok=True)
     
-    # Organizza dati per formatore e mese
-    formatori_mensili = defaultdict(lambda: defaultdict(list))
-    formatori_totali = defaultdict(float)  # Conta turni (0.5 giorni per turno)
-    
-    for riga in dati:
-        if not riga['data']:
-            continue
-        
-        data = riga['data']
-        mese = data.month
-        
-        # Percorsi
-        for perc_label, perc_dati in riga['percorsi']:
-            for formatore in [perc_dati.get('formatore1'), perc_dati.get('formatore2')]:
-                if formatore and formatore in FORMATORI:
-                    formatori_mensili[formatore][mese].append({
-                        'data': data,
-                        'turno': riga['turno'],
-                        'percorso': perc_dati.get('nome', ''),
-                        'aula': perc_dati.get('aula', ''),
-                        'attivita': perc_dati.get('attivita', ''),
-                        'tipo': 'Corso'
-                    })
-                    formatori_totali[formatore] += 0.5
-        
-        # Fuori aula - con mappatura attività
-        for fa_item in riga.get('fuori_aula', []):
-            formatore = fa_item.get('formatore') if isinstance(fa_item, dict) else fa_item
-            attivita_codice = fa_item.get('attivita', '') if isinstance(fa_item, dict) else ''
-            
-            if formatore in FORMATORI:
-                formatori_mensili[formatore][mese].append({
-                    'data': data,
-                    'turno': riga['turno'],
-                    'percorso': '-',
-                    'aula': 'Fuori aula',
-                    'attivita': attivita_codice or 'Attività esterna',
-                    'tipo': 'Fuori aula'
-                })
-                formatori_totali[formatore] += 0.5
-    
+    lavori = lavori_report_formatori(dati, output_dir)
+    errori = esegui_lavori_pdf(lavori, processi)
+    
+    print(f"✅ Report formatori completati in: {output_dir}/\n")
+    return errori
+
+
+def lavori_report_formatori(dati, output_dir='stampe_pdf'):
+    """I lavori dei PDF formatori, uno per formatore (vedi esegui_lavori_pdf)"""
+    # Impegni per formatore e mese, giorni svolti (0.5 giorni per turno)
+    aggregati = aggrega_dati(dati)
+    formatori_mensili = aggregati['formatori']
+    formatori_totali = aggregati['giorni_svolti']
+    
     # Carica mappature attività esterne
     mappature_attivita = carica_attivita_esterne()
     
     # Genera un PDF per ogni formatore
+    lavori = []
     for formatore in sorted(formatori_mensili.keys()):
         filename = os.path.join(output_dir, f'Programma_Formatore_{formatore}_2026.pdf')
+        lavori.append((f"📄 Generazione: {filename}", filename, pdf_formatore,
+                       (filename, formatore, formatori_mensili[formatore],
+                        formatori_totali[formatore], mappature_attivita)))
+    return lavori
+
+
+def pdf_corso(filename, nome_percorso, turni, giorni_unici):
+    """Un PDF del report corsi (eseguita anche nei processi di esegui_lavori_pdf)"""
+    doc = nuovo_documento(filename, f"Programma corso {nome_percorso} 2026", pagesize=A4,
+                          leftMargin=2*cm, rightMargin=2*cm,
+                          topMargin=2.5*cm, bottomMargin=2.5*cm)
+    
+    elements = []
+    
+    # Titolo principale
+    elements.append(Paragraph(f"<b>PROGRAMMA CORSO {nome_percorso}</b>", STILI_PARAGRAFO['titolo_corso']))
+    elements.append(Paragraph(f"Anno 2026", STILI_PARAGRAFO['normale']))
+    
+    # Date corso
+    turni_ordinati = sorted(turni, key=lambda x: (x['data'], x['turno']))
+    data_inizio = turni_ordinati[0]['data']
+    data_fine = turni_ordinati[-1]['data']
+    
+    elements.append(Paragraph(
+        f"<b>Dal {data_inizio.strftime('%d/%m/%Y')} al {data_fine.strftime('%d/%m/%Y')}</b>",
+        STILI_PARAGRAFO['date_corso']
+    ))
+    elements.append(Spacer(1, 0.5*cm))
+    
+    # Informazioni generali
+    elements.append(Paragraph("<b>INFORMAZIONI CORSO</b>", STILI_PARAGRAFO['sezione']))
+    
+    # Estrai info uniche
+    aule_usate = sorted(set(t['aula'] for t in turni if t['aula']))
+    formatori_usati = sorted(set(
+        f for t in turni 
+        for f in [t.get('formatore1'), t.get('formatore2')] 
+        if f
+    ))
+    
+    attivita_usate = sorted(set(t['attivita'] for t in turni if t['attivita']))
+    
+    info_data = [
+        ['Durata', f'{giorni_unici} giorni ({len(turni)} turni)'],
+        ['Aule', ', '.join(aule_usate) if aule_usate else '-'],
+        ['Formatori', ', '.join(formatori_usati) if formatori_usati else '-'],
+        ['Attività', ', '.join(attivita_usate) if attivita_usate else '-'],
+    ]
+    
+    info_table = Table(info_data, colWidths=[4*cm, 10*cm])
+    info_table.setStyle(STILI_TABELLA['info_corso'])
+    
+    elements.append(info_table)
+    elements.append(Spacer(1, 1*cm))
+    
+    # Calendario dettagliato
+    elements.append(Paragraph("<b>CALENDARIO DETTAGLIATO</b>", STILI_PARAGRAFO['sezione']))
+    elements.append(Spacer(1, 0.5*cm))
+    
+    # Organizza turni per giorno (mattina e pomeriggio separati)
+    giorni_dict = defaultdict(lambda: {'mattina': None, 'pomeriggio': None})
+    
+    for turno in turni_ordinati:
+        data_key = turno['data'].date()
+        turno_tipo = turno['turno'].lower()
+        giorni_dict[data_key][turno_tipo] = turno
+    
+    # Tabella: colonne per ogni giorno, righe per mattina/pomeriggio
+    # MASSIMO 5 GIORNI PER TABELLA
+    giorni_ordinati = sorted(giorni_dict.keys())
+    
+    # Dividi i giorni in gruppi di massimo 5
+    for gruppo_idx in range(0, len(giorni_ordinati), 5):
+        giorni_gruppo = giorni_ordinati[gruppo_idx:gruppo_idx + 5]
         
-        print(f"📄 Generazione: {filename}")
-        
-        doc = SimpleDocTemplate(filename, pagesize=A4,
-                               leftMargin=1.5*cm, rightMargin=1.5*cm,
-                               topMargin=2*cm, bottomMargin=2*cm)
-        
-        elements = []
-        styles = getSampleStyleSheet()
+        if gruppo_idx > 0:
+            # Aggiungi spazio tra le tabelle
+            elements.append(Spacer(1, 0.8*cm))
         
-        # Titolo
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#1F4E78'),
-            spaceAfter=10,
-            alignment=TA_CENTER
-        )
+        # Header: Date
+        header_row = ['Orario'] + [g.strftime('%d/%m\n%a')[:10] for g in giorni_gruppo]
+        table_data = [header_row]
+        
+        # Riga Mattina
+        mattina_row = ['Mattina\n' + turno_a_orario('mattina')]
+        for giorno in giorni_gruppo:
+            turno = giorni_dict[giorno]['mattina']
+            if turno:
+                formatori = []
+                if turno.get('formatore1'):
+                    formatori.append(turno['formatore1'])
+                if turno.get('formatore2'):
+                    formatori.append(turno['formatore2'])
+                
+                # Formato migliorato con etichette
+                attivita = turno.get('attivita', '-')
+                aula = turno.get('aula', '-')
+                
+                cell_text = f"<b>Attività:</b> {attivita}\n"
+                cell_text += f"<b>Aula:</b> {aula}\n"
+                if formatori:
+                    cell_text += f"<b>Formatore:</b>\n" + '\n'.join(formatori)
+                else:
+                    cell_text += "<b>Formatore:</b> -"
+                
+                # Usa Paragraph per supportare tag HTML
+                mattina_row.append(Paragraph(cell_text, STILI_PARAGRAFO['cella']))
+            else:
+                mattina_row.append('-')
+        
+        table_data.append(mattina_row)
+        
+        # Riga Pomeriggio
+        pomeriggio_row = ['Pomeriggio\n' + turno_a_orario('Pomeriggio')]
+        for giorno in giorni_gruppo:
+            turno = giorni_dict[giorno]['pomeriggio']
+            if turno:
+                formatori = []
+                if turno.get('formatore1'):
+                    formatori.append(turno['formatore1'])
+                if turno.get('formatore2'):
+                    formatori.append(turno['formatore2'])
+                
+                # Formato migliorato con etichette
+                attivita = turno.get('attivita', '-')
+                aula = turno.get('aula', '-')
+                
+                cell_text = f"<b>Attività:</b> {attivita}\n"
+                cell_text += f"<b>Aula:</b> {aula}\n"
+                if formatori:
+                    cell_text += f"<b>Formatore:</b>\n" + '\n'.join(formatori)
+                else:
+                    cell_text += "<b>Formatore:</b> -"
+                
+                # Usa Paragraph per supportare tag HTML
+                pomeriggio_row.append(Paragraph(cell_text, STILI_PARAGRAFO['cella']))
+            else:
+                pomeriggio_row.append('-')
         
-        elements.append(Paragraph(f"<b>PROGRAMMA FORMATORE {formatore}</b>", title_style))
-        elements.append(Paragraph(f"Anno 2026", styles['Normal']))
-        elements.append(Spacer(1, 0.5*cm))
+        table_data.append(pomeriggio_row)
         
-        # STATISTICHE ANNUALI
-        giorni_svolti = formatori_totali[formatore]
-        turni_svolti = int(giorni_svolti * 2)
+        # Calcola larghezza colonne: massimo 5 giorni
+        num_giorni = len(giorni_gruppo)
+        col_width = 3*cm  # Larghezza fissa per 5 giorni
         
-        if formatore in FORMATORI_DATA:
-            giorni_previsti = FORMATORI_DATA[formatore]['giorni_previsti']
-            percentuale = FORMATORI_DATA[formatore]['perc']
-            giorni_rimanenti = giorni_previsti - giorni_svolti
-            perc_svolti = (giorni_svolti / giorni_previsti * 100) if giorni_previsti > 0 else 0
-            
-            stats_data = [
-                ['STATISTICHE ANNUALI', '', '', ''],
-                ['% Contratto', 'Giorni Previsti', 'Giorni Svolti', 'Giorni Rimanenti'],
-                [f'{int(percentuale*100)}%', f'{giorni_previsti}', f'{giorni_svolti:.1f}', f'{giorni_rimanenti:.1f}'],
-                ['Turni Svolti', 'Percentuale Completata', '', ''],
-                [f'{turni_svolti}', f'{perc_svolti:.1f}%', '', '']
-            ]
-            
-            stats_table = Table(stats_data, colWidths=[3.5*cm, 3.5*cm, 3.5*cm, 3.5*cm])
-            stats_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E75B5')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BACKGROUND', (0, 1), (-1, 1), colors.HexColor('#D9E1F2')),
-                ('BACKGROUND', (0, 3), (-1, 3), colors.HexColor('#D9E1F2')),
-                ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 3), (-1, 3), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('SPAN', (0, 0), (-1, 0)),
-                ('SPAN', (1, 4), (-1, 4)),
-            ]))
-            
-            elements.append(stats_table)
-            elements.append(Spacer(1, 1*cm))
+        col_widths = [2.5*cm] + [col_width] * num_giorni
         
-        # Per ogni mese
-        for mese in sorted(formatori_mensili[formatore].keys()):
-            impegni = formatori_mensili[formatore][mese]
-            
-            if not impegni:
-                continue
-            
-            # Titolo mese
-            nome_mese = calendar.month_name[mese].upper()
-            month_style = ParagraphStyle(
-                'MonthTitle',
-                parent=styles['Heading2'],
-                fontSize=12,
-                textColor=colors.HexColor('#2E75B5'),
-                spaceBefore=10,
-                spaceAfter=10
-            )
-            elements.append(Paragraph(f"<b>{nome_mese} 2026</b>", month_style))
-            
-            # Conteggio mensile
-            giorni_mese = len(impegni) * 0.5
-            turni_mese = len(impegni)
-            elements.append(Paragraph(f"<b>Impegni:</b> {turni_mese} turni ({giorni_mese:.1f} giorni)", styles['Normal']))
-            elements.append(Spacer(1, 0.3*cm))
-            
-            # Tabella impegni
-            table_data = [['Data', 'Orario', 'Percorso', 'Aula', 'Attività']]
-            
-            for imp in sorted(impegni, key=lambda x: (x['data'], x['turno'])):
-                # Mappatura nome attività se è fuori aula
-                attivita_display = imp['attivita'] or '-'
-                if imp['tipo'] == 'Fuori aula' and imp['attivita'] in mappature_attivita:
-                    attivita_display = mappature_attivita[imp['attivita']]
-                
-                table_data.append([
-                    imp['data'].strftime('%d/%m/%Y'),
-                    turno_a_orario(imp['turno']),
-                    imp['percorso'] or '-',
-                    imp['aula'] or '-',
-                    attivita_display
-                ])
-            
-            table = Table(table_data, colWidths=[2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 4.5*cm])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#D9E1F2')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1F4E78')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F2F2F2')])
-            ]))
-            
-            elements.append(table)
-            elements.append(Spacer(1, 0.8*cm))
+        cal_table = Table(table_data, colWidths=col_widths)
+        cal_table.setStyle(STILI_TABELLA['calendario'])
         
-        doc.build(elements)
-        print(f"   ✅ Generato per {formatore}: {giorni_svolti:.1f} giorni, {len(formatori_mensili[formatore])} mesi\n")
+        elements.append(cal_table)
     
-    print(f"✅ Report formatori completati in: {output_dir}/\n")
+    # Legenda attività (più piccola)
+    elements.append(Spacer(1, 0.8*cm))
+    
+    elements.append(Paragraph("<b>LEGENDA ATTIVITÀ:</b>", STILI_PARAGRAFO['legenda']))
+    elements.append(Spacer(1, 0.1*cm))
+    
+    legenda_table = Table(LEGENDA_ATTIVITA, colWidths=[1*cm, 3.5*cm, 1*cm, 3.5*cm])
+    legenda_table.setStyle(STILI_TABELLA['legenda'])
+    
+    elements.append(legenda_table)
+    
+    doc.build(elements)
+    return f"Generato corso {nome_percorso}\n"
 
 
-def genera_report_corsi(dati, output_dir='stampe_pdf'):
+def genera_report_corsi(dati, output_dir='stampe_pdf', processi=None):
     """
     REPORT 3: Programma Corso (5 giorni)
     Per studenti: orari inizio/fine, formatori, aule, test
@@ -592,29 +1338,19 @@ def genera_report_corsi(dati, output_dir='stampe_pdf'):
     
     os.makedirs(output_dir, exist_ok=True)
     
-    # Organizza per percorso
-    percorsi = defaultdict(list)
+    lavori = lavori_report_corsi(dati, output_dir)
+    errori = esegui_lavori_pdf(lavori, processi)
     
-    for riga in dati:
-        if not riga['data']:
-            continue
-        
-        for perc_label, perc_dati in riga['percorsi']:
-            nome_percorso = perc_dati.get('nome')
-            if not nome_percorso:
-                continue
-            
-            percorsi[nome_percorso].append({
-                'data': riga['data'],
-                'turno': riga['turno'],
-                'formatore1': perc_dati.get('formatore1'),
-                'formatore2': perc_dati.get('formatore2'),
-                'aula': perc_dati.get('aula'),
-                'attivita': perc_dati.get('attivita'),
-                'test': perc_dati.get('test')
-            })
+    print(f"✅ Report corsi completati in: {output_dir}/\n")
+    return errori
+
+
+def lavori_report_corsi(dati, output_dir='stampe_pdf'):
+    """I lavori dei PDF corsi, uno per percorso con almeno 3 giorni (vedi esegui_lavori_pdf)"""
+    percorsi = aggrega_dati(dati)['percorsi']
     
     # Genera PDF per ogni percorso (solo quelli con almeno 3 giorni)
+    lavori = []
     for nome_percorso in sorted(percorsi.keys()):
         turni = percorsi[nome_percorso]
         
@@ -625,272 +1361,118 @@ def genera_report_corsi(dati, output_dir='stampe_pdf'):
             continue
         
         filename = os.path.join(output_dir, f'Programma_Corso_{nome_percorso}_2026.pdf')
+        lavori.append((f"📄 Generazione: {filename}", filename, pdf_corso,
+                       (filename, nome_percorso, turni, giorni_unici)))
+    return lavori
+
+
+def pdf_settimana(filename, turni):
+    """Un PDF del piano settimanale (eseguita anche nei processi di esegui_lavori_pdf)"""
+    prima_data = turni[0]['data']
+    ultima_data = turni[-1]['data']
+    anno = prima_data.year
+    num_settimana = prima_data.isocalendar()[1]
+    
+    doc = nuovo_documento(
+        filename,
+        f"Piano settimanale W{num_settimana:02d} {anno}",
+        pagesize=landscape(A4),
+        rightMargin=1*cm,
+        leftMargin=1*cm,
+        topMargin=1.5*cm,
+        bottomMargin=1*cm
+    )
+    
+    story = []
+    
+    story.append(Paragraph(
+        f"PIANO SETTIMANALE - Settimana {num_settimana}/{anno}<br/>"
+        f"<font size=10>Dal {prima_data.strftime('%d/%m/%Y')} al {ultima_data.strftime('%d/%m/%Y')}</font>",
+        STILI_PARAGRAFO['titolo_settimana']
+    ))
+    story.append(Spacer(1, 0.5*cm))
+    
+    table_data = [['Data', 'Turno', 'Percorso 1', 'Percorso 2', 'Percorso 3', 'Percorso 4', 'Fuori Aula']]
+    
+    for riga in turni:
+        data_str = riga['data'].strftime('%d/%m')
+        turno = riga['turno']
         
-        print(f"📄 Generazione: {filename}")
-        
-        doc = SimpleDocTemplate(filename, pagesize=A4,
-                               leftMargin=2*cm, rightMargin=2*cm,
-                               topMargin=2.5*cm, bottomMargin=2.5*cm)
-        
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Titolo principale
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#1F4E78'),
-            spaceAfter=15,
-            alignment=TA_CENTER
-        )
-        
-        elements.append(Paragraph(f"<b>PROGRAMMA CORSO {nome_percorso}</b>", title_style))
-        elements.append(Paragraph(f"Anno 2026", styles['Normal']))
-        
-        # Date corso
-        turni_ordinati = sorted(turni, key=lambda x: (x['data'], x['turno']))
-        data_inizio = turni_ordinati[0]['data']
-        data_fine = turni_ordinati[-1]['data']
-        
-        date_style = ParagraphStyle(
-            'DateStyle',
-            parent=styles['Normal'],
-            fontSize=11,
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
-        
-        elements.append(Paragraph(
-            f"<b>Dal {data_inizio.strftime('%d/%m/%Y')} al {data_fine.strftime('%d/%m/%Y')}</b>",
-            date_style
-        ))
-        elements.append(Spacer(1, 0.5*cm))
-        
-        # Informazioni generali
-        info_style = ParagraphStyle(
-            'InfoStyle',
-            parent=styles['Heading2'],
-            fontSize=12,
-            textColor=colors.HexColor('#2E75B5'),
-            spaceAfter=10
-        )
-        
-        elements.append(Paragraph("<b>INFORMAZIONI CORSO</b>", info_style))
-        
-        # Estrai info uniche
-        aule_usate = sorted(set(t['aula'] for t in turni if t['aula']))
-        formatori_usati = sorted(set(
-            f for t in turni 
-            for f in [t.get('formatore1'), t.get('formatore2')] 
-            if f
-        ))
-        
-        attivita_usate = sorted(set(t['attivita'] for t in turni if t['attivita']))
-        
-        info_data = [
-            ['Durata', f'{giorni_unici} giorni ({len(turni)} turni)'],
-            ['Aule', ', '.join(aule_usate) if aule_usate else '-'],
-            ['Formatori', ', '.join(formatori_usati) if formatori_usati else '-'],
-            ['Attività', ', '.join(attivita_usate) if attivita_usate else '-'],
-        ]
-        
-        info_table = Table(info_data, colWidths=[4*cm, 10*cm])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#D9E1F2')),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        
-        elements.append(info_table)
-        elements.append(Spacer(1, 1*cm))
-        
-        # Calendario dettagliato
-        elements.append(Paragraph("<b>CALENDARIO DETTAGLIATO</b>", info_style))
-        elements.append(Spacer(1, 0.5*cm))
-        
-        # Organizza turni per giorno (mattina e pomeriggio separati)
-        giorni_dict = defaultdict(lambda: {'mattina': None, 'pomeriggio': None})
-        
-        for turno in turni_ordinati:
-            data_key = turno['data'].date()
-            turno_tipo = turno['turno'].lower()
-            giorni_dict[data_key][turno_tipo] = turno
-        
-        # Tabella: colonne per ogni giorno, righe per mattina/pomeriggio
-        # MASSIMO 5 GIORNI PER TABELLA
-        giorni_ordinati = sorted(giorni_dict.keys())
-        
-        # Dividi i giorni in gruppi di massimo 5
-        for gruppo_idx in range(0, len(giorni_ordinati), 5):
-            giorni_gruppo = giorni_ordinati[gruppo_idx:gruppo_idx + 5]
-            
-            if gruppo_idx > 0:
-                # Aggiungi spazio tra le tabelle
-                elements.append(Spacer(1, 0.8*cm))
-            
-            # Header: Date
-            header_row = ['Orario'] + [g.strftime('%d/%m\n%a')[:10] for g in giorni_gruppo]
-            table_data = [header_row]
-            
-            # Riga Mattina
-            mattina_row = ['Mattina\n' + turno_a_orario('mattina')]
-            for giorno in giorni_gruppo:
-                turno = giorni_dict[giorno]['mattina']
-                if turno:
-                    formatori = []
-                    if turno.get('formatore1'):
-                        formatori.append(turno['formatore1'])
-                    if turno.get('formatore2'):
-                        formatori.append(turno['formatore2'])
-                    
-                    # Formato migliorato con etichette
-                    attivita = turno.get('attivita', '-')
-                    aula = turno.get('aula', '-')
-                    
-                    cell_text = f"<b>Attività:</b> {attivita}\n"
-                    cell_text += f"<b>Aula:</b> {aula}\n"
-                    if formatori:
-                        cell_text += f"<b>Formatore:</b>\n" + '\n'.join(formatori)
-                    else:
-                        cell_text += "<b>Formatore:</b> -"
-                    
-                    # Usa Paragraph per supportare tag HTML
-                    cell_style = ParagraphStyle(
-                        'CellStyle',
-                        parent=styles['Normal'],
-                        fontSize=7,
-                        alignment=TA_CENTER,
-                        leading=9
-                    )
-                    mattina_row.append(Paragraph(cell_text, cell_style))
-                else:
-                    mattina_row.append('-')
-            
-            table_data.append(mattina_row)
-            
-            # Riga Pomeriggio
-            pomeriggio_row = ['Pomeriggio\n' + turno_a_orario('Pomeriggio')]
-            for giorno in giorni_gruppo:
-                turno = giorni_dict[giorno]['pomeriggio']
-                if turno:
-                    formatori = []
-                    if turno.get('formatore1'):
-                        formatori.append(turno['formatore1'])
-                    if turno.get('formatore2'):
-                        formatori.append(turno['formatore2'])
-                    
-                    # Formato migliorato con etichette
-                    attivita = turno.get('attivita', '-')
-                    aula = turno.get('aula', '-')
-                    
-                    cell_text = f"<b>Attività:</b> {attivita}\n"
-                    cell_text += f"<b>Aula:</b> {aula}\n"
-                    if formatori:
-                        cell_text += f"<b>Formatore:</b>\n" + '\n'.join(formatori)
-                    else:
-                        cell_text += "<b>Formatore:</b> -"
-                    
-                    # Usa Paragraph per supportare tag HTML
-                    cell_style = ParagraphStyle(
-                        'CellStyle',
-                        parent=styles['Normal'],
-                        fontSize=7,
-                        alignment=TA_CENTER,
-                        leading=9
-                    )
-                    pomeriggio_row.append(Paragraph(cell_text, cell_style))
-                else:
-                    pomeriggio_row.append('-')
-            
-            table_data.append(pomeriggio_row)
-            
-            # Calcola larghezza colonne: massimo 5 giorni
-            num_giorni = len(giorni_gruppo)
-            col_width = 3*cm  # Larghezza fissa per 5 giorni
-            
-            col_widths = [2.5*cm] + [col_width] * num_giorni
-            
-            cal_table = Table(table_data, colWidths=col_widths)
-            cal_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E75B5')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#D9E1F2')),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('FONTSIZE', (0, 1), (0, -1), 7),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('LEFTPADDING', (0, 1), (-1, -1), 3),
-                ('RIGHTPADDING', (0, 1), (-1, -1), 3),
-            ]))
-            
-            elements.append(cal_table)
-        
-        # Legenda attività (più piccola)
-        elements.append(Spacer(1, 0.8*cm))
-        
-        legend_title_style = ParagraphStyle(
-            'LegendTitle',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#1F4E78'),
-        )
-        
-        elements.append(Paragraph("<b>LEGENDA ATTIVITÀ:</b>", legend_title_style))
-        elements.append(Spacer(1, 0.1*cm))
-        
-        # Legenda su 2 colonne
-        legenda_data = [
-            ['AULA', 'Lezione in aula', 'TT', 'Test Tedesco'],
-            ['DIGI', 'Attività digitali', 'TI', 'Test Inglese'],
-            ['CV', 'Curriculum Vitae', 'UFF', 'Ufficio'],
-            ['CS', 'Colloquio selezione', 'COL', 'Colloquio'],
-            ['RA', 'Ricerca attiva', 'C', 'Corso']
-        ]
-        
-        legenda_table = Table(legenda_data, colWidths=[1*cm, 3.5*cm, 1*cm, 3.5*cm])
-        legenda_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E8F0F8')),
-            ('BACKGROUND', (2, 0), (2, -1), colors.HexColor('#E8F0F8')),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 6),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-            ('ALIGN', (3, 0), (3, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 0.3, colors.lightgrey),
-            ('LEFTPADDING', (0, 0), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-            ('TOPPADDING', (0, 0), (-1, -1), 2),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-        ]))
-        
-        elements.append(legenda_table)
-        
-        doc.build(elements)
-        print(f"   ✅ Generato corso {nome_percorso}\n")
+        percorsi_txt = []
+        for i in range(4):
+            if i < len(riga['percorsi']):
+                nome_perc, perc = riga['percorsi'][i]
+                txt = f"{perc.get('nome', '-')}\n"
+                txt += f"Form: {perc.get('formatore1', '-')}"
+                if perc.get('formatore2'):
+                    txt += f", {perc['formatore2']}"
+                txt += f"\nAula: {perc.get('aula', '-')}\n"
+                txt += f"Att: {perc.get('attivita', '-')}"
+                if perc.get('test'):
+                    txt += f"\nTest: {perc['test']}"
+                percorsi_txt.append(txt)
+            else:
+                percorsi_txt.append('-')
+        
+        fa_txt = ""
+        if riga.get('fuori_aula'):
+            fa_txt = "Form: " + ", ".join(str(formatore) for formatore, _ in fuori_aula_turno(riga))
+        if riga.get('attivita_esterne'):
+            if fa_txt:
+                fa_txt += "\n"
+            fa_txt += "Att: " + ", ".join(riga['attivita_esterne'])
+        if not fa_txt:
+            fa_txt = "-"
+        
+        table_data.append([
+            data_str,
+            turno,
+            percorsi_txt[0],
+            percorsi_txt[1],
+            percorsi_txt[2],
+            percorsi_txt[3],
+            fa_txt
+        ])
+    
+    table = Table(table_data, colWidths=[2*cm, 2.5*cm, 4.5*cm, 4.5*cm, 4.5*cm, 4.5*cm, 4*cm])
+    
+    table.setStyle(STILI_TABELLA['settimana'])
     
-    print(f"✅ Report corsi completati in: {output_dir}/\n")
+    story.append(table)
+    story.append(Spacer(1, 0.5*cm))
+    story.append(Paragraph("Form = Formatore | Att = Attività | Test = Formatore TEST", STILI_PARAGRAFO['piede']))
+    
+    doc.build(story)
+    return f"Salvato: {filename}"
+
 
+MANIFEST_SETTIMANE = '.manifest_settimane.json'
 
-def genera_report_settimanale(dati, output_dir='stampe_pdf'):
+
+def leggi_manifest_settimane(output_dir):
+    """{nome del PDF: impronta dei turni} dell'ultima generazione settimanale in output_dir"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_SETTIMANE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def scrivi_manifest_settimane(output_dir, manifest):
+    percorso = os.path.join(output_dir, MANIFEST_SETTIMANE)
+    with open(percorso + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(percorso + '.tmp', percorso)
+
+
+def genera_report_settimanale(dati, output_dir='stampe_pdf', processi=None, incrementale=False):
     """
     REPORT 4: Piano Settimanale Completo
     Un PDF per settimana con TUTTE le informazioni (aule, formatori, corsi, fuori aula)
+    
+    incrementale=True: rigenera solo le settimane i cui turni sono cambiati
+    dall'ultima esecuzione (impronte in output_dir/.manifest_settimane.json);
+    le altre non vengono né ricostruite né riscritte.
     """
     print("=" * 70)
     print("📅 REPORT SETTIMANALE: PIANO COMPLETO")
@@ -899,24 +1481,43 @@ def genera_report_settimanale(dati, output_dir='stampe_pdf'):
     
     os.makedirs(output_dir, exist_ok=True)
     
-    # Organizza dati per settimana
-    settimane = defaultdict(list)
-    
-    for riga in dati:
-        if not riga['data']:
-            continue
-        
-        data = riga['data']
-        anno = data.year
-        settimana = data.isocalendar()[1]
-        chiave = f"{anno}_W{settimana:02d}"
-        settimane[chiave].append(riga)
+    lavori = lavori_report_settimanale(dati, output_dir)
+    da_generare = lavori
+    
+    if incrementale:
+        manifest = leggi_manifest_settimane(output_dir)
+        impronte = {lavoro[1]: impronta_pdf(lavoro[2], lavoro[3]) for lavoro in lavori}
+        da_generare = [lavoro for lavoro in lavori
+                       if manifest.get(os.path.basename(lavoro[1])) != impronte[lavoro[1]]
+                       or not os.path.exists(lavoro[1])]
+        print(f"⏭️  Settimane invariate dall'ultima generazione: {len(lavori) - len(da_generare)}, "
+              f"da rigenerare: {len(da_generare)}")
+        print()
+    
+    errori = esegui_lavori_pdf(da_generare, processi)
+    
+    if incrementale:
+        falliti = {filename for filename, _ in errori}
+        for _, filename, _, _ in da_generare:
+            if filename in falliti:
+                manifest.pop(os.path.basename(filename), None)
+            else:
+                manifest[os.path.basename(filename)] = impronte[filename]
+        scrivi_manifest_settimane(output_dir, manifest)
+    
+    print(f"\n✅ Generati {len(lavori)} report settimanali")
+    print()
+    return errori
+
+
+def lavori_report_settimanale(dati, output_dir='stampe_pdf'):
+    """I lavori dei PDF del piano settimanale, uno per settimana (vedi esegui_lavori_pdf)"""
+    settimane = aggrega_dati(dati)['settimane']
     
     # Genera un PDF per ogni settimana
+    lavori = []
     for settimana_key in sorted(settimane.keys()):
         turni = settimane[settimana_key]
-        if not turni:
-            continue
         
         prima_data = turni[0]['data']
         ultima_data = turni[-1]['data']
@@ -924,113 +1525,9 @@ def genera_report_settimanale(dati, output_dir='stampe_pdf'):
         num_settimana = prima_data.isocalendar()[1]
         
         filename = f"{output_dir}/Piano_Settimanale_W{num_settimana:02d}_{anno}.pdf"
-        
-        print(f"📄 Settimana {num_settimana} ({prima_data.strftime('%d/%m')} - {ultima_data.strftime('%d/%m/%Y')})")
-        
-        doc = SimpleDocTemplate(
-            filename,
-            pagesize=landscape(A4),
-            rightMargin=1*cm,
-            leftMargin=1*cm,
-            topMargin=1.5*cm,
-            bottomMargin=1*cm
-        )
-        
-        story = []
-        styles = getSampleStyleSheet()
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#1a5490'),
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        story.append(Paragraph(
-            f"PIANO SETTIMANALE - Settimana {num_settimana}/{anno}<br/>"
-            f"<font size=10>Dal {prima_data.strftime('%d/%m/%Y')} al {ultima_data.strftime('%d/%m/%Y')}</font>",
-            title_style
-        ))
-        story.append(Spacer(1, 0.5*cm))
-        
-        table_data = [['Data', 'Turno', 'Percorso 1', 'Percorso 2', 'Percorso 3', 'Percorso 4', 'Fuori Aula']]
-        
-        for riga in turni:
-            data_str = riga['data'].strftime('%d/%m')
-            turno = riga['turno']
-            
-            percorsi_txt = []
-            for i in range(4):
-                if i < len(riga['percorsi']):
-                    nome_perc, perc = riga['percorsi'][i]
-                    txt = f"{perc.get('nome', '-')}\n"
-                    txt += f"Form: {perc.get('formatore1', '-')}"
-                    if perc.get('formatore2'):
-                        txt += f", {perc['formatore2']}"
-                    txt += f"\nAula: {perc.get('aula', '-')}\n"
-                    txt += f"Att: {perc.get('attivita', '-')}"
-                    if perc.get('test'):
-                        txt += f"\nTest: {perc['test']}"
-                    percorsi_txt.append(txt)
-                else:
-                    percorsi_txt.append('-')
-            
-            fa_txt = ""
-            if riga.get('fuori_aula'):
-                fa_txt = "Form: " + ", ".join(riga['fuori_aula'])
-            if riga.get('attivita_esterne'):
-                if fa_txt:
-                    fa_txt += "\n"
-                fa_txt += "Att: " + ", ".join(riga['attivita_esterne'])
-            if not fa_txt:
-                fa_txt = "-"
-            
-            table_data.append([
-                data_str,
-                turno,
-                percorsi_txt[0],
-                percorsi_txt[1],
-                percorsi_txt[2],
-                percorsi_txt[3],
-                fa_txt
-            ])
-        
-        table = Table(table_data, colWidths=[2*cm, 2.5*cm, 4.5*cm, 4.5*cm, 4.5*cm, 4.5*cm, 4*cm])
-        
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a5490')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 7),
-            ('ALIGN', (0, 1), (1, -1), 'CENTER'),
-            ('ALIGN', (2, 1), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#1a5490')),
-            ('LEFTPADDING', (0, 0), (-1, -1), 4),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        
-        story.append(table)
-        story.append(Spacer(1, 0.5*cm))
-        footer_style = ParagraphStyle('Footer', parent=styles['Normal'], fontSize=7, textColor=colors.grey)
-        story.append(Paragraph("Form = Formatore | Att = Attività | Test = Formatore TEST", footer_style))
-        
-        doc.build(story)
-        print(f"   ✅ Salvato: {filename}")
-    
-    print(f"\n✅ Generati {len(settimane)} report settimanali")
-    print()
+        lavori.append((f"📄 Settimana {num_settimana} ({prima_data.strftime('%d/%m')} - {ultima_data.strftime('%d/%m/%Y')})",
+                       filename, pdf_settimana, (filename, turni)))
+    return lavori
 
 
 def genera_report_formatore_specifico(dati, output_dir='stampe_pdf'):
@@ -1043,17 +1540,8 @@ def genera_report_formatore_specifico(dati, output_dir='stampe_pdf'):
     print()
     
     # Mostra formatori disponibili
-    formatori_presenti = set()
-    for riga in dati:
-        for _, perc in riga['percorsi']:
-            if perc.get('formatore1'):
-                formatori_presenti.add(perc['formatore1'])
-            if perc.get('formatore2'):
-                formatori_presenti.add(perc['formatore2'])
-        if riga.get('fuori_aula'):
-            formatori_presenti.update(riga['fuori_aula'])
-    
-    formatori_list = sorted(formatori_presenti)
+    turni_formatore = aggrega_dati(dati)['turni_formatore']
+    formatori_list = sorted(turni_formatore)
     print("Formatori disponibili:")
     for i, f in enumerate(formatori_list, 1):
         print(f"  {i}. {f}")
@@ -1085,31 +1573,10 @@ def genera_report_formatore_specifico(dati, output_dir='stampe_pdf'):
         print("\n❌ Formato data non valido o operazione annullata")
         return
     
-    # Filtra dati per formatore e periodo
-    dati_filtrati = []
-    for riga in dati:
-        if not riga['data']:
-            continue
-        
-        # Controllo periodo
-        if data_inizio and riga['data'] < data_inizio:
-            continue
-        if data_fine and riga['data'] > data_fine:
-            continue
-        
-        # Controllo se formatore è presente
-        presente = False
-        for _, perc in riga['percorsi']:
-            if perc.get('formatore1') == formatore or perc.get('formatore2') == formatore:
-                presente = True
-                break
-        
-        if not presente and riga.get('fuori_aula'):
-            if formatore in riga['fuori_aula']:
-                presente = True
-        
-        if presente:
-            dati_filtrati.append(riga)
+    # Turni del formatore nel periodo
+    dati_filtrati = [riga for riga in turni_formatore[formatore]
+                     if not (data_inizio and riga['data'] < data_inizio)
+                     and not (data_fine and riga['data'] > data_fine)]
     
     if not dati_filtrati:
         print(f"\n⚠️  Nessun turno trovato per {formatore} nel periodo selezionato")
@@ -1118,18 +1585,29 @@ def genera_report_formatore_specifico(dati, output_dir='stampe_pdf'):
     # Genera PDF
     os.makedirs(output_dir, exist_ok=True)
     
-    periodo_str = ""
     if data_inizio and data_fine:
         periodo_str = f"_{data_inizio.strftime('%d%m%Y')}-{data_fine.strftime('%d%m%Y')}"
     elif data_inizio:
         periodo_str = f"_dal_{data_inizio.strftime('%d%m%Y')}"
     elif data_fine:
         periodo_str = f"_al_{data_fine.strftime('%d%m%Y')}"
+    else:
+        periodo_str = "_intero_piano"
     
     filename = f"{output_dir}/Programma_Formatore_{formatore}{periodo_str}_2026.pdf"
     
-    doc = SimpleDocTemplate(
+    pdf_formatore_specifico(filename, formatore, dati_filtrati, data_inizio, data_fine)
+    
+    print(f"✅ PDF generato: {filename}")
+    print(f"   Turni trovati: {len(dati_filtrati)}")
+    print()
+
+
+def pdf_formatore_specifico(filename, formatore, dati_filtrati, data_inizio=None, data_fine=None):
+    """Il PDF del programma di un formatore: dati_filtrati = turni del formatore nel periodo"""
+    doc = nuovo_documento(
         filename,
+        f"Programma formatore {formatore} 2026",
         pagesize=A4,
         rightMargin=2*cm,
         leftMargin=2*cm,
@@ -1138,17 +1616,6 @@ def genera_report_formatore_specifico(dati, output_dir='stampe_pdf'):
     )
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1a5490'),
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
     
     periodo_text = "Anno 2026"
     if data_inizio and data_fine:
@@ -1161,7 +1628,7 @@ def genera_report_formatore_specifico(dati, output_dir='stampe_pdf'):
     story.append(Paragraph(
         f"PROGRAMMA FORMATORE: {formatore}<br/>"
         f"<font size=12>{periodo_text}</font>",
-        title_style
+        STILI_PARAGRAFO['titolo_report']
     ))
     story.append(Spacer(1, 1*cm))
     
@@ -1189,41 +1656,21 @@ def genera_report_formatore_specifico(dati, output_dir='stampe_pdf'):
                 ])
         
         # Fuori aula
-        if riga.get('fuori_aula') and formatore in riga['fuori_aula']:
-            idx = riga['fuori_aula'].index(formatore)
-            att = riga.get('attivita_esterne', [])[idx] if idx < len(riga.get('attivita_esterne', [])) else '-'
-            table_data.append([
-                data_str,
-                turno,
-                'FUORI AULA',
-                '-',
-                att,
-                ''
-            ])
-    
-    table = Table(table_data, colWidths=[3*cm, 3*cm, 4*cm, 2.5*cm, 4*cm, 4.5*cm])
+        for formatore_fa, attivita_fa in fuori_aula_turno(riga):
+            if formatore_fa == formatore:
+                table_data.append([
+                    data_str,
+                    turno,
+                    'FUORI AULA',
+                    '-',
+                    attivita_fa or '-',
+                    ''
+                ])
     
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a5490')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#1a5490')),
-    ]))
+    table = tabella_report(table_data, [3*cm, 3*cm, 4*cm, 2.5*cm, 4*cm, 4.5*cm], STILI_TABELLA['specifico'])
     
     story.append(table)
     doc.build(story)
-    
-    print(f"✅ PDF generato: {filename}")
-    print(f"   Turni trovati: {len(dati_filtrati)}")
-    print()
 
 
 def genera_report_corso_specifico(dati, output_dir='stampe_pdf'):
@@ -1235,14 +1682,9 @@ def genera_report_corso_specifico(dati, output_dir='stampe_pdf'):
     print("=" * 70)
     print()
     
-    # Raccogli tutti i nomi/numeri di corsi presenti
-    corsi_presenti = set()
-    for riga in dati:
-        for nome_perc, perc in riga['percorsi']:
-            if perc.get('nome'):
-                corsi_presenti.add(perc['nome'])
-    
-    corsi_list = sorted(corsi_presenti)
+    # Tutti i nomi/numeri di corsi presenti
+    turni_corso = aggrega_dati(dati)['turni_corso']
+    corsi_list = sorted(turni_corso)
     if not corsi_list:
         print("⚠️  Nessun corso trovato nel file")
         return
@@ -1262,16 +1704,8 @@ def genera_report_corso_specifico(dati, output_dir='stampe_pdf'):
         print("\n❌ Operazione annullata")
         return
     
-    # Filtra dati per corso
-    dati_filtrati = []
-    for riga in dati:
-        if not riga['data']:
-            continue
-        
-        for nome_perc, perc in riga['percorsi']:
-            if perc.get('nome') == corso:
-                dati_filtrati.append(riga)
-                break
+    # Turni del corso
+    dati_filtrati = [riga for riga, _ in turni_corso[corso]]
     
     if not dati_filtrati:
         print(f"\n⚠️  Nessun turno trovato per il corso: {corso}")
@@ -1280,10 +1714,21 @@ def genera_report_corso_specifico(dati, output_dir='stampe_pdf'):
     # Genera PDF
     os.makedirs(output_dir, exist_ok=True)
     
-    filename = f"{output_dir}/Programma_Corso_{corso.replace('/', '-')}_2026.pdf"
+    filename = f"{output_dir}/Programma_Corso_Specifico_{corso.replace('/', '-')}_2026.pdf"
     
-    doc = SimpleDocTemplate(
+    pdf_corso_specifico(filename, corso, dati_filtrati)
+    
+    giorni_unici = len(set(r['data'].date() for r in dati_filtrati))
+    print(f"✅ PDF generato: {filename}")
+    print(f"   Giorni corso: {giorni_unici}")
+    print()
+
+
+def pdf_corso_specifico(filename, corso, dati_filtrati):
+    """Il PDF del programma di un corso: dati_filtrati = turni del corso"""
+    doc = nuovo_documento(
         filename,
+        f"Programma corso {corso} 2026",
         pagesize=A4,
         rightMargin=2*cm,
         leftMargin=2*cm,
@@ -1292,17 +1737,6 @@ def genera_report_corso_specifico(dati, output_dir='stampe_pdf'):
     )
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1a5490'),
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
     
     prima_data = dati_filtrati[0]['data']
     ultima_data = dati_filtrati[-1]['data']
@@ -1310,7 +1744,7 @@ def genera_report_corso_specifico(dati, output_dir='stampe_pdf'):
     story.append(Paragraph(
         f"PROGRAMMA CORSO: {corso}<br/>"
         f"<font size=12>Dal {prima_data.strftime('%d/%m/%Y')} al {ultima_data.strftime('%d/%m/%Y')}</font>",
-        title_style
+        STILI_PARAGRAFO['titolo_report']
     ))
     story.append(Spacer(1, 1*cm))
     
@@ -1339,34 +1773,16 @@ def genera_report_corso_specifico(dati, output_dir='stampe_pdf'):
     
     table = Table(table_data, colWidths=[3*cm, 3*cm, 5*cm, 3*cm, 5*cm, 2*cm])
     
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a5490')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#1a5490')),
-    ]))
+    table.setStyle(STILI_TABELLA['specifico'])
     
     story.append(table)
     
     # Totale giorni
     giorni_unici = len(set(r['data'].date() for r in dati_filtrati))
     story.append(Spacer(1, 0.5*cm))
-    note_style = ParagraphStyle('Note', parent=styles['Normal'], fontSize=10)
-    story.append(Paragraph(f"<b>Totale giorni corso:</b> {giorni_unici}", note_style))
+    story.append(Paragraph(f"<b>Totale giorni corso:</b> {giorni_unici}", STILI_PARAGRAFO['nota']))
     
     doc.build(story)
-    
-    print(f"✅ PDF generato: {filename}")
-    print(f"   Giorni corso: {giorni_unici}")
-    print()
 
 
 def main():
@@ -1475,7 +1891,7 @@ def main():
         genera_report_corsi(dati, output_dir)
     
     if scelta == '4' or scelta == '7':
-        genera_report_settimanale(dati, output_dir)
+        genera_report_settimanale(dati, output_dir, incrementale=True)
     
     if scelta == '5':
         genera_report_formatore_specifico(dati, output_dir)
@@ -1490,6 +1906,9 @@ def main():
     print("=" * 70)
     print()
     print(f"📁 I PDF sono stati salvati in: {output_dir}/")
+    if sum(CONTEGGIO_CACHE_PDF.values()):
+        print(f"♻️  Cache PDF: {CONTEGGIO_CACHE_PDF['riutilizzati']} riutilizzati, "
+              f"{CONTEGGIO_CACHE_PDF['generati']} generati ({output_dir}/{CARTELLA_CACHE_PDF})")
     print()
     
     if scelta == '1':
@@ -1509,7 +1928,7 @@ def main():
         print("   • Programma_Formatore_[FORMATORE]_[PERIODO]_2026.pdf")
     elif scelta == '6':
         print("📋 Report generato:")
-        print("   • Programma_Corso_[CORSO]_2026.pdf")
+        print("   • Programma_Corso_Specifico_[CORSO]_2026.pdf")
     else:  # scelta == '7'
         print("📋 Report generati:")
         print("   1. Prenotazione_Aule_2026.pdf (tutte le aule)")
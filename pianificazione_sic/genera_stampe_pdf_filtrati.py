@@ -3,189 +3,90 @@
 Funzioni per generazione PDF con filtri personalizzati
 """
 
-from openpyxl import load_workbook
-from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.platypus import Table, Paragraph, Spacer
 from datetime import datetime
 from collections import defaultdict
-import calendar
+from bisect import bisect_left, bisect_right
 import os
 
-# Importa la funzione turno_a_orario da genera_stampe_pdf
-from genera_stampe_pdf import turno_a_orario
+import genera_stampe_pdf
 
+# Importa da genera_stampe_pdf turno_a_orario, il catalogo degli stili PDF
+# (colori da stili.py, paragrafi e tabelle creati una sola volta),
+# aggrega_dati (viste dei turni calcolate una volta), nuovo_documento
+# (PDF riproducibili, metadati fissi) e tabella_report (tabelle lunghe)
+from genera_stampe_pdf import (turno_a_orario, fuori_aula_turno, aggrega_dati, nuovo_documento,
+                               esegui_lavori_pdf, tabella_report, FORMATORI,
+                               STILI_PARAGRAFO, STILI_TABELLA, LEGENDA_ATTIVITA)
 
-def carica_dati_excel(filename='Pianificazione_Corsi_2026.xlsx'):
-    """Carica tutti i dati dal file Excel"""
-    wb = load_workbook(filename)
-    ws = wb['2026']
-    
-    dati = []
-    ultima_data = None  # Memorizza l'ultima data valida per i pomeriggi
-    
-    for row in range(1, ws.max_row + 1):
-        turno = ws.cell(row=row, column=2).value
-        
-        if turno not in ['mattina', 'Pomeriggio']:
-            continue
-        
-        data = ws.cell(row=row, column=1).value
-        
-        # Se non c'è data e il turno è Pomeriggio, usa l'ultima data valida
-        if not data and turno == 'Pomeriggio' and ultima_data:
-            data = ultima_data
-        elif not data:
-            continue
-        
-        # Aggiorna l'ultima data valida se presente
-        if ws.cell(row=row, column=1).value:
-            ultima_data = data
-        
-        riga_dati = {
-            'data': data,
-            'turno': turno,
-            'percorsi': []
-        }
-        
-        # PERCORSO 1 (C-H)
-        perc1 = {
-            'nome': ws.cell(row=row, column=3).value,
-            'formatore1': ws.cell(row=row, column=4).value,
-            'formatore2': ws.cell(row=row, column=5).value,
-            'aula': ws.cell(row=row, column=6).value,
-            'attivita': ws.cell(row=row, column=7).value,
-            'test': ws.cell(row=row, column=8).value,
-        }
-        if any(perc1.values()):
-            riga_dati['percorsi'].append(('Percorso 1', perc1))
-        
-        # PERCORSO 2 (I-N)
-        perc2 = {
-            'nome': ws.cell(row=row, column=9).value,
-            'formatore1': ws.cell(row=row, column=10).value,
-            'formatore2': ws.cell(row=row, column=11).value,
-            'aula': ws.cell(row=row, column=12).value,
-            'attivita': ws.cell(row=row, column=13).value,
-            'test': ws.cell(row=row, column=14).value,
-        }
-        if any(perc2.values()):
-            riga_dati['percorsi'].append(('Percorso 2', perc2))
-        
-        # PERCORSO 3 (O-T)
-        perc3 = {
-            'nome': ws.cell(row=row, column=15).value,
-            'formatore1': ws.cell(row=row, column=16).value,
-            'formatore2': ws.cell(row=row, column=17).value,
-            'aula': ws.cell(row=row, column=18).value,
-            'attivita': ws.cell(row=row, column=19).value,
-            'test': ws.cell(row=row, column=20).value,
-        }
-        if any(perc3.values()):
-            riga_dati['percorsi'].append(('Percorso 3', perc3))
-        
-        # PERCORSO 4 (U-Z)
-        perc4 = {
-            'nome': ws.cell(row=row, column=21).value,
-            'formatore1': ws.cell(row=row, column=22).value,
-            'formatore2': ws.cell(row=row, column=23).value,
-            'aula': ws.cell(row=row, column=24).value,
-            'attivita': ws.cell(row=row, column=25).value,
-            'test': ws.cell(row=row, column=26).value,
-        }
-        if any(perc4.values()):
-            riga_dati['percorsi'].append(('Percorso 4', perc4))
-        
-        # Fuori aula - con mappatura attività
-        fuori_aula_list = []
-        for col in range(27, 38, 2):  # 27-37 dispari = formatori, pari = attività
-            form = ws.cell(row=row, column=col).value
-            att = ws.cell(row=row, column=col+1).value
-            if form:
-                fuori_aula_list.append({
-                    'formatore': form,
-                    'attivita': att if att else ''
-                })
-        
-        if fuori_aula_list:
-            riga_dati['fuori_aula'] = fuori_aula_list
-        
-        dati.append(riga_dati)
-    
-    return dati
+
+FILE_EXCEL = 'Pianificazione_Corsi_2026.xlsx'
 
 
-def genera_report_aule_settimane(settimane, output_dir='stampe_pdf'):
-    """Genera report aule per settimane specifiche"""
+def carica_dati_excel(filename=FILE_EXCEL):
+    """Carica tutti i dati dal file Excel: gli stessi turni di genera_stampe_pdf.carica_dati_excel"""
+    return genera_stampe_pdf.carica_dati_excel(filename)
+
+
+def genera_report_aule_settimane(settimane, output_dir='stampe_pdf', dati=None, file_excel=FILE_EXCEL):
+    """
+    Genera report aule per settimane specifiche
+    
+    dati: turni già caricati (carica_dati_excel), per generare più report
+    con una sola lettura del file; se mancano sono letti da file_excel.
+    """
     print(f"📋 Generazione report aule per settimane: {settimane}")
     
-    dati = carica_dati_excel()
+    if dati is None:
+        dati = carica_dati_excel(file_excel)
     os.makedirs(output_dir, exist_ok=True)
     
-    # Filtra dati per settimane
-    dati_filtrati = []
-    for riga in dati:
-        if riga['data']:
-            num_settimana = riga['data'].isocalendar()[1]
-            if num_settimana in settimane:
-                dati_filtrati.append(riga)
-    
-    if not dati_filtrati:
+    lavori = lavori_aule_settimane(dati, settimane, output_dir)
+    if not lavori:
         print("⚠️  Nessun dato trovato per le settimane selezionate")
         return
     
-    # Organizza per aula
+    _, filename, funzione, argomenti = lavori[0]
+    funzione(*argomenti)
+    print(f"✅ PDF generato: {filename}")
+
+
+def lavori_aule_settimane(dati, settimane, output_dir='stampe_pdf'):
+    """Il lavoro del PDF aule per settimane (vedi esegui_lavori_pdf), [] se non ci sono turni"""
+    # Prenotazioni per aula (aggrega_dati) nelle settimane richieste
+    aule_settimane = aggrega_dati(dati)['aule_settimane']
     aule_dati = defaultdict(list)
+    for settimana in sorted(set(settimane)):
+        for aula, prenotazioni in aule_settimane.get(settimana, {}).items():
+            aule_dati[aula] += prenotazioni
     
-    for riga in dati_filtrati:
-        for _, perc in riga['percorsi']:
-            aula = perc.get('aula')
-            if aula:
-                aule_dati[aula].append({
-                    'data': riga['data'],
-                    'turno': riga['turno'],
-                    'percorso': perc.get('nome'),
-                    'attivita': perc.get('attivita'),
-                    'formatori': [f for f in [perc.get('formatore1'), perc.get('formatore2')] if f]
-                })
+    if not aule_dati:
+        return []
     
     # Genera PDF
     settimane_str = '_'.join(map(str, sorted(settimane)))
     filename = f"{output_dir}/Prenotazione_Aule_Settimane_{settimane_str}_2026.pdf"
-    
-    doc = SimpleDocTemplate(filename, pagesize=A4,
-                           leftMargin=1.5*cm, rightMargin=1.5*cm,
-                           topMargin=2*cm, bottomMargin=2*cm)
+    return [(f"📄 Generazione: {filename}", filename, pdf_aule_settimane,
+             (filename, sorted(settimane), dict(aule_dati)))]
+
+
+def pdf_aule_settimane(filename, settimane, aule_dati):
+    """Il PDF delle aule per settimane: aule_dati = {aula: [prenotazioni]}"""
+    settimane_str = '_'.join(map(str, settimane))
+    doc = nuovo_documento(filename, f"Prenotazione aule settimane {settimane_str} 2026", pagesize=A4,
+                          leftMargin=1.5*cm, rightMargin=1.5*cm,
+                          topMargin=2*cm, bottomMargin=2*cm)
     
     elements = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.HexColor('#1F4E78'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
-    
-    elements.append(Paragraph(f"<b>PRENOTAZIONE AULE - Settimane {', '.join(map(str, sorted(settimane)))}</b>", title_style))
-    elements.append(Paragraph("Anno 2026", styles['Normal']))
+    
+    elements.append(Paragraph(f"<b>PRENOTAZIONE AULE - Settimane {', '.join(map(str, sorted(settimane)))}</b>", STILI_PARAGRAFO['titolo_piccolo']))
+    elements.append(Paragraph("Anno 2026", STILI_PARAGRAFO['normale']))
     elements.append(Spacer(1, 0.8*cm))
     
     for aula in sorted(aule_dati.keys()):
-        aula_style = ParagraphStyle(
-            'AulaTitle',
-            parent=styles['Heading1'],
-            fontSize=14,
-            textColor=colors.HexColor('#2E75B5'),
-            spaceBefore=20,
-            spaceAfter=15
-        )
-        elements.append(Paragraph(f"<b>AULA {aula}</b>", aula_style))
+        elements.append(Paragraph(f"<b>AULA {aula}</b>", STILI_PARAGRAFO['aula']))
         
         prenotazioni = sorted(aule_dati[aula], key=lambda x: (x['data'], x['turno']))
         
@@ -200,92 +101,112 @@ def genera_report_aule_settimane(settimane, output_dir='stampe_pdf'):
                 ', '.join(pren['formatori']) if pren['formatori'] else '-'
             ])
         
-        table = Table(table_data, colWidths=[2.5*cm, 2.5*cm, 3*cm, 3*cm, 5*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#D9E1F2')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1F4E78')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F2F2F2')])
-        ]))
+        table = tabella_report(table_data, [2.5*cm, 2.5*cm, 3*cm, 3*cm, 5*cm], STILI_TABELLA['elenco'])
         
         elements.append(table)
         elements.append(Spacer(1, 0.6*cm))
     
     doc.build(elements)
-    print(f"✅ PDF generato: {filename}")
 
 
-def genera_report_formatore_periodo(formatore, data_inizio_str=None, data_fine_str=None, output_dir='stampe_pdf'):
-    """Genera report per formatore specifico con periodo"""
+def genera_report_formatore_periodo(formatore, data_inizio_str=None, data_fine_str=None, output_dir='stampe_pdf',
+                                    dati=None, file_excel=FILE_EXCEL):
+    """Genera report per formatore specifico con periodo (dati / file_excel come genera_report_aule_settimane)"""
     print(f"👤 Generazione report per {formatore}")
     
-    dati = carica_dati_excel()
+    if dati is None:
+        dati = carica_dati_excel(file_excel)
     os.makedirs(output_dir, exist_ok=True)
     
+    lavori = lavori_formatore_periodo(dati, formatore, data_inizio_str, data_fine_str, output_dir)
+    if not lavori:
+        print(f"⚠️  Nessun turno trovato per {formatore}")
+        return
+    
+    _, filename, funzione, argomenti = lavori[0]
+    funzione(*argomenti)
+    print(f"✅ PDF generato: {filename}")
+    print(f"   Turni: {len(argomenti[2])}")
+
+
+def genera_report_formatori_periodo(formatori=None, data_inizio_str=None, data_fine_str=None, output_dir='stampe_pdf',
+                                     dati=None, file_excel=FILE_EXCEL, processi=None):
+    """
+    Genera i report per periodo di più formatori (tutti quelli in FORMATORI se
+    formatori è None) con una sola lettura e una sola aggregazione dei dati
+    
+    Restituisce i PDF non generati [(filename, errore)], come esegui_lavori_pdf.
+    """
+    formatori = sorted(FORMATORI) if formatori is None else formatori
+    print(f"👥 Generazione report per {len(formatori)} formatori")
+    
+    if dati is None:
+        dati = carica_dati_excel(file_excel)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    lavori = lavori_formatori_periodo(dati, formatori, data_inizio_str, data_fine_str, output_dir)
+    senza_turni = len(formatori) - len(lavori)
+    if senza_turni:
+        print(f"⚠️  {senza_turni} formatori senza turni nel periodo")
+    return esegui_lavori_pdf(lavori, processi)
+
+
+def lavori_formatori_periodo(dati, formatori, data_inizio_str=None, data_fine_str=None, output_dir='stampe_pdf'):
+    """I lavori dei PDF per periodo di più formatori (vedi lavori_formatore_periodo)"""
+    lavori = []
+    for formatore in formatori:
+        lavori += lavori_formatore_periodo(dati, formatore, data_inizio_str, data_fine_str, output_dir)
+    return lavori
+
+
+def turni_formatore_periodo(aggregati, formatore, data_inizio=None, data_fine=None):
+    """
+    I turni del formatore tra data_inizio e data_fine (incluse), da aggrega_dati
+    
+    I turni sono in ordine di data: gli estremi del periodo si trovano con bisect
+    sugli ordinali delle date invece di controllare ogni turno.
+    """
+    turni = aggregati['turni_formatore'].get(formatore, [])
+    ordinali = aggregati['ordinali_formatore'].get(formatore, [])
+    inizio = bisect_left(ordinali, data_inizio.toordinal()) if data_inizio else 0
+    fine = bisect_right(ordinali, data_fine.toordinal()) if data_fine else len(turni)
+    return turni[inizio:fine]
+
+
+def lavori_formatore_periodo(dati, formatore, data_inizio_str=None, data_fine_str=None, output_dir='stampe_pdf'):
+    """Il lavoro del PDF formatore per periodo (date 'AAAA-MM-GG'), [] se non ci sono turni"""
     # Parse date
     data_inizio = datetime.strptime(data_inizio_str, '%Y-%m-%d') if data_inizio_str else None
     data_fine = datetime.strptime(data_fine_str, '%Y-%m-%d') if data_fine_str else None
     
-    # Filtra dati
-    dati_filtrati = []
-    for riga in dati:
-        if not riga['data']:
-            continue
-        
-        # Controllo periodo
-        if data_inizio and riga['data'] < data_inizio:
-            continue
-        if data_fine and riga['data'] > data_fine:
-            continue
-        
-        # Controllo formatore
-        presente = False
-        for _, perc in riga['percorsi']:
-            if perc.get('formatore1') == formatore or perc.get('formatore2') == formatore:
-                presente = True
-                break
-        
-        if not presente and riga.get('fuori_aula'):
-            if formatore in riga['fuori_aula']:
-                presente = True
-        
-        if presente:
-            dati_filtrati.append(riga)
+    # Turni del formatore (aggrega_dati) nel periodo
+    dati_filtrati = turni_formatore_periodo(aggrega_dati(dati), formatore, data_inizio, data_fine)
     
     if not dati_filtrati:
-        print(f"⚠️  Nessun turno trovato per {formatore}")
-        return
+        return []
     
     # Genera PDF
-    periodo_str = ""
     if data_inizio and data_fine:
         periodo_str = f"_{data_inizio.strftime('%d%m')}-{data_fine.strftime('%d%m')}"
     elif data_inizio:
         periodo_str = f"_dal_{data_inizio.strftime('%d%m')}"
     elif data_fine:
         periodo_str = f"_al_{data_fine.strftime('%d%m')}"
+    else:
+        periodo_str = "_intero_piano"
     
     filename = f"{output_dir}/Programma_Formatore_{formatore}{periodo_str}_2026.pdf"
-    
-    doc = SimpleDocTemplate(filename, pagesize=A4,
-                           leftMargin=2*cm, rightMargin=2*cm,
-                           topMargin=2*cm, bottomMargin=2*cm)
+    return [(f"📄 Generazione: {filename}", filename, pdf_formatore_periodo,
+             (filename, formatore, dati_filtrati, data_inizio, data_fine))]
+
+
+def pdf_formatore_periodo(filename, formatore, dati_filtrati, data_inizio=None, data_fine=None):
+    """Il PDF di un formatore nel periodo: dati_filtrati = turni del formatore"""
+    doc = nuovo_documento(filename, f"Programma formatore {formatore} 2026", pagesize=A4,
+                          leftMargin=2*cm, rightMargin=2*cm,
+                          topMargin=2*cm, bottomMargin=2*cm)
     
     elements = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1F4E78'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
     
     periodo_text = "Anno 2026"
     if data_inizio and data_fine:
@@ -295,8 +216,8 @@ def genera_report_formatore_periodo(formatore, data_inizio_str=None, data_fine_s
     elif data_fine:
         periodo_text = f"Al {data_fine.strftime('%d/%m/%Y')}"
     
-    elements.append(Paragraph(f"<b>PROGRAMMA FORMATORE {formatore}</b>", title_style))
-    elements.append(Paragraph(periodo_text, styles['Normal']))
+    elements.append(Paragraph(f"<b>PROGRAMMA FORMATORE {formatore}</b>", STILI_PARAGRAFO['titolo']))
+    elements.append(Paragraph(periodo_text, STILI_PARAGRAFO['normale']))
     elements.append(Spacer(1, 1*cm))
     
     table_data = [['Data', 'Turno', 'Percorso', 'Aula', 'Attività', 'Note']]
@@ -320,82 +241,68 @@ def genera_report_formatore_periodo(formatore, data_inizio_str=None, data_fine_s
                     note
                 ])
         
-        if riga.get('fuori_aula') and formatore in riga['fuori_aula']:
-            idx = riga['fuori_aula'].index(formatore)
-            att = riga.get('attivita_esterne', [])[idx] if idx < len(riga.get('attivita_esterne', [])) else '-'
-            table_data.append([
-                data_str,
-                turno,
-                'FUORI AULA',
-                '-',
-                att,
-                ''
-            ])
+        for formatore_fa, attivita_fa in fuori_aula_turno(riga):
+            if formatore_fa == formatore:
+                table_data.append([
+                    data_str,
+                    turno,
+                    'FUORI AULA',
+                    '-',
+                    attivita_fa or '-',
+                    ''
+                ])
     
-    table = Table(table_data, colWidths=[3*cm, 2.5*cm, 3.5*cm, 2.5*cm, 4*cm, 4.5*cm])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#D9E1F2')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1F4E78')),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F2F2F2')])
-    ]))
+    table = tabella_report(table_data, [3*cm, 2.5*cm, 3.5*cm, 2.5*cm, 4*cm, 4.5*cm], STILI_TABELLA['elenco'])
     
     elements.append(table)
     doc.build(elements)
-    
-    print(f"✅ PDF generato: {filename}")
-    print(f"   Turni: {len(dati_filtrati)}")
+    return f"Generato per {formatore}: {len(dati_filtrati)} turni\n"
 
 
-def genera_report_corso_specifico(corso, output_dir='stampe_pdf'):
-    """Genera report per corso specifico"""
+def genera_report_corso_specifico(corso, output_dir='stampe_pdf', dati=None, file_excel=FILE_EXCEL):
+    """Genera report per corso specifico (dati / file_excel come genera_report_aule_settimane)"""
     print(f"📖 Generazione report per corso: {corso}")
     
-    dati = carica_dati_excel()
+    if dati is None:
+        dati = carica_dati_excel(file_excel)
     os.makedirs(output_dir, exist_ok=True)
     
-    # Filtra dati per corso
-    dati_filtrati = []
-    for riga in dati:
-        if not riga['data']:
-            continue
-        
-        for _, perc in riga['percorsi']:
-            if perc.get('nome') == corso:
-                dati_filtrati.append((riga, perc))
-                break
-    
-    if not dati_filtrati:
+    lavori = lavori_corso_specifico(dati, corso, output_dir)
+    if not lavori:
         print(f"⚠️  Nessun turno trovato per {corso}")
         return
     
-    # Genera PDF
-    filename = f"{output_dir}/Programma_Corso_{corso.replace('/', '-')}_2026.pdf"
+    _, filename, funzione, argomenti = lavori[0]
+    funzione(*argomenti)
+    print(f"✅ PDF generato: {filename}")
+
+
+def lavori_corso_specifico(dati, corso, output_dir='stampe_pdf'):
+    """Il lavoro del PDF di un corso, [] se non ci sono turni"""
+    # Turni del corso (aggrega_dati): [(turno, percorso)]
+    dati_filtrati = aggrega_dati(dati)['turni_corso'].get(corso, [])
     
-    doc = SimpleDocTemplate(filename, pagesize=A4,
-                           leftMargin=2*cm, rightMargin=2*cm,
-                           topMargin=2*cm, bottomMargin=2*cm)
+    if not dati_filtrati:
+        return []
     
-    elements = []
-    styles = getSampleStyleSheet()
+    # Genera PDF
+    filename = f"{output_dir}/Programma_Corso_Specifico_{corso.replace('/', '-')}_2026.pdf"
+    return [(f"📄 Generazione: {filename}", filename, pdf_corso_specifico, (filename, corso, dati_filtrati))]
+
+
+def pdf_corso_specifico(filename, corso, dati_filtrati):
+    """Il PDF di un corso: dati_filtrati = [(turno, percorso del corso)]"""
+    doc = nuovo_documento(filename, f"Programma corso {corso} 2026", pagesize=A4,
+                          leftMargin=2*cm, rightMargin=2*cm,
+                          topMargin=2*cm, bottomMargin=2*cm)
     
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1F4E78'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
+    elements = []
     
     prima_data = dati_filtrati[0][0]['data']
     ultima_data = dati_filtrati[-1][0]['data']
     
-    elements.append(Paragraph(f"<b>PROGRAMMA CORSO: {corso}</b>", title_style))
-    elements.append(Paragraph(f"Dal {prima_data.strftime('%d/%m/%Y')} al {ultima_data.strftime('%d/%m/%Y')}", styles['Normal']))
+    elements.append(Paragraph(f"<b>PROGRAMMA CORSO: {corso}</b>", STILI_PARAGRAFO['titolo']))
+    elements.append(Paragraph(f"Dal {prima_data.strftime('%d/%m/%Y')} al {ultima_data.strftime('%d/%m/%Y')}", STILI_PARAGRAFO['normale']))
     elements.append(Spacer(1, 1*cm))
     
     # Organizza turni per giorno (mattina e pomeriggio separati)
@@ -446,14 +353,7 @@ def genera_report_corso_specifico(corso, output_dir='stampe_pdf'):
                     cell_text += "<b>Formatore:</b> -"
                 
                 # Usa Paragraph per supportare tag HTML
-                cell_style = ParagraphStyle(
-                    'CellStyle',
-                    parent=styles['Normal'],
-                    fontSize=7,
-                    alignment=TA_CENTER,
-                    leading=9
-                )
-                mattina_row.append(Paragraph(cell_text, cell_style))
+                mattina_row.append(Paragraph(cell_text, STILI_PARAGRAFO['cella']))
             else:
                 mattina_row.append('-')
         
@@ -483,14 +383,7 @@ def genera_report_corso_specifico(corso, output_dir='stampe_pdf'):
                     cell_text += "<b>Formatore:</b> -"
                 
                 # Usa Paragraph per supportare tag HTML
-                cell_style = ParagraphStyle(
-                    'CellStyle',
-                    parent=styles['Normal'],
-                    fontSize=7,
-                    alignment=TA_CENTER,
-                    leading=9
-                )
-                pomeriggio_row.append(Paragraph(cell_text, cell_style))
+                pomeriggio_row.append(Paragraph(cell_text, STILI_PARAGRAFO['cella']))
             else:
                 pomeriggio_row.append('-')
         
@@ -503,67 +396,19 @@ def genera_report_corso_specifico(corso, output_dir='stampe_pdf'):
         col_widths = [2.5*cm] + [col_width] * num_giorni
         
         table = Table(table_data, colWidths=col_widths)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E75B5')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#D9E1F2')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 8),
-            ('FONTSIZE', (0, 1), (-1, -1), 7),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('LEFTPADDING', (0, 1), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 1), (-1, -1), 3),
-        ]))
+        table.setStyle(STILI_TABELLA['calendario_specifico'])
         
         elements.append(table)
     
     # Legenda attività (più piccola)
     elements.append(Spacer(1, 0.8*cm))
     
-    legend_title_style = ParagraphStyle(
-        'LegendTitle',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.HexColor('#1F4E78'),
-    )
-    
-    elements.append(Paragraph("<b>LEGENDA ATTIVITÀ:</b>", legend_title_style))
+    elements.append(Paragraph("<b>LEGENDA ATTIVITÀ:</b>", STILI_PARAGRAFO['legenda']))
     elements.append(Spacer(1, 0.1*cm))
     
-    # Legenda su 2 colonne
-    legenda_data = [
-        ['AULA', 'Lezione in aula', 'TT', 'Test Tedesco'],
-        ['DIGI', 'Attività digitali', 'TI', 'Test Inglese'],
-        ['CV', 'Curriculum Vitae', 'UFF', 'Ufficio'],
-        ['CS', 'Colloquio selezione', 'COL', 'Colloquio'],
-        ['RA', 'Ricerca attiva', 'C', 'Corso']
-    ]
-    
-    legenda_table = Table(legenda_data, colWidths=[1*cm, 3.5*cm, 1*cm, 3.5*cm])
-    legenda_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E8F0F8')),
-        ('BACKGROUND', (2, 0), (2, -1), colors.HexColor('#E8F0F8')),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 6),
-        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-        ('ALIGN', (3, 0), (3, -1), 'LEFT'),
-        ('GRID', (0, 0), (-1, -1), 0.3, colors.lightgrey),
-        ('LEFTPADDING', (0, 0), (-1, -1), 3),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-        ('TOPPADDING', (0, 0), (-1, -1), 2),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-    ]))
+    legenda_table = Table(LEGENDA_ATTIVITA, colWidths=[1*cm, 3.5*cm, 1*cm, 3.5*cm])
+    legenda_table.setStyle(STILI_TABELLA['legenda'])
     
     elements.append(legenda_table)
     
     doc.build(elements)
-    
-    print(f"✅ PDF generato: {filename}")
@@ -4,21 +4,92 @@ Server HTTP minimo per eseguire comandi Python dall'HTML
 CROSS-PLATFORM: Funziona su Windows, Mac e Linux
 """
 from http.server import HTTPServer, SimpleHTTPRequestHandler
+import hashlib
 import json
 import subprocess
 import os
 import sys
 import platform
-from urllib.parse import parse_qs
+from urllib.parse import parse_qs, unquote
+
+from genera_stampe_pdf import carica_dati_excel, lavoro_per_nome, pdf_in_memoria
+from genera_report_html import pagina_per_nome
 
 # Determina il comando Python corretto per la piattaforma
 # Su Windows: C:\Python311\python.exe
 # Su Mac/Linux: /usr/bin/python3
 PYTHON_CMD = sys.executable
 
+FILE_EXCEL = 'Pianificazione_Corsi_2026.xlsx'
+
+# Dati del piano già letti: (data di modifica del file Excel, dati)
+_DATI_LETTI = [None, None]
+
+
+def dati_pianificazione():
+    """Turni del file Excel, riletti solo se il file è stato modificato"""
+    versione = os.path.getmtime(FILE_EXCEL)
+    if _DATI_LETTI[0] != versione:
+        _DATI_LETTI[:] = [versione, carica_dati_excel(FILE_EXCEL)]
+    return _DATI_LETTI[1]
+
+
+def pdf_aggiornato(filename):
+    """
+    Byte del PDF 'filename' di stampe_pdf, None se non esiste
+    
+    I report di aule, formatori, corsi e settimane sono ricostruiti in memoria
+    dai dati attuali dell'Excel (niente file da rileggere, niente PDF vecchi);
+    gli altri (report filtrati, con nomi propri) sono letti dal disco.
+    """
+    if os.path.exists(FILE_EXCEL):
+        lavoro = lavoro_per_nome(dati_pianificazione(), filename)
+        if lavoro:
+            return pdf_in_memoria(lavoro)[0]
+    
+    filepath = os.path.join('stampe_pdf', filename)
+    if os.path.exists(filepath):
+        with open(filepath, 'rb') as f:
+            return f.read()
+    return None
+
+
+def html_aggiornato(nome):
+    """Byte della pagina HTML 'nome' (genera_report_html) dai dati attuali dell'Excel, None se non esiste"""
+    if not os.path.exists(FILE_EXCEL):
+        return None
+    pagina = pagina_per_nome(dati_pianificazione(), nome, FILE_EXCEL)
+    return pagina.encode('utf-8') if pagina is not None else None
+
+
 class PianificazioneHandler(SimpleHTTPRequestHandler):
     def do_GET(self):
-        if self.path == '/api/list-pdfs':
+        if self.path.startswith('/report/'):
+            # Pagine HTML dei report: /report/ (indice), /report/settimana_2026_W03.html ...
+            # I nomi dei formatori nei collegamenti sono codificati (quote)
+            nome = os.path.basename(unquote(self.path.split('?')[0])) or 'index.html'
+            try:
+                html_data = html_aggiornato(nome)
+                if html_data is None:
+                    self.send_error(404, 'Report non trovato')
+                    return
+                # ETag dal contenuto: il browser rivalida (no-cache) e riceve 304 se il piano non è cambiato
+                etag = '"' + hashlib.sha256(html_data).hexdigest()[:32] + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(html_data)))
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+                self.wfile.write(html_data)
+            except Exception as e:
+                self.send_error(500, str(e))
+        elif self.path == '/api/list-pdfs':
             try:
                 pdf_dir = 'stampe_pdf'
                 if os.path.exists(pdf_dir):
@@ -125,17 +196,15 @@ class PianificazioneHandler(SimpleHTTPRequestHandler):
             post_data = self.rfile.read(content_length)
             data = json.loads(post_data.decode('utf-8'))
             
-            filename = data.get('filename', '')
-            filepath = os.path.join('stampe_pdf', filename)
+            filename = os.path.basename(data.get('filename', ''))
             
             try:
-                if os.path.exists(filepath) and filename.endswith('.pdf'):
-                    with open(filepath, 'rb') as f:
-                        pdf_data = f.read()
-                    
+                pdf_data = pdf_aggiornato(filename) if filename.endswith('.pdf') else None
+                if pdf_data is not None:
                     self.send_response(200)
                     self.send_header('Content-Type', 'application/pdf')
                     self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+                    self.send_header('Content-Length', str(len(pdf_data)))
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.end_headers()
                     self.wfile.write(pdf_data)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+SINCRONIZZAZIONE RISULTATI NEL FILE EXCEL
+=========================================
+
+Legge una sola volta il foglio 2026 o i fogli per periodo (stesso parser dei PDF) e calcola in Python:
+- turni e giorni svolti / previsti / rimanenti per formatore (come nei PDF formatori)
+- conflitti: formatore o aula ripetuti nello stesso turno
+- incompatibilità aula-attività (AULE_ATTIVITA)
+
+I risultati sono scritti come valori statici, senza formule, nel foglio
+RISULTATI. I formatori con conflitti hanno un commento con l'elenco dei turni.
+Il file viene salvato una sola volta.
+Per i file creati con crea_pianificazione_smart.py --leggero (senza formule
+né conditional formatting) è il controllo dei conflitti insieme ai PDF.
+
+Uso:
+    python3 sincronizza_risultati.py [Pianificazione_Corsi_2026.xlsx]
+"""
+
+from openpyxl import load_workbook
+from collections import Counter, defaultdict
+from datetime import datetime
+import argparse
+import time
+
+from crea_pianificazione_smart import AULE_ATTIVITA, OpenpyxlBackend
+from genera_stampe_pdf import FORMATORI, FORMATORI_DATA, fogli_piano, leggi_turni, giorni_svolti_formatori
+
+NOME_FOGLIO = 'RISULTATI'
+
+# Commento troncato oltre questo numero di turni
+MAX_TURNI_COMMENTO = 20
+
+
+def formatori_turno(riga):
+    """Formatori del turno nelle colonne controllate dai duplicati (F1, F2, fuori aula)"""
+    formatori = []
+    for perc_label, perc_dati in riga['percorsi']:
+        formatori += [f for f in (perc_dati.get('formatore1'), perc_dati.get('formatore2')) if f]
+    formatori += [fa['formatore'] for fa in riga.get('fuori_aula', []) if fa.get('formatore')]
+    return formatori
+
+
+def calcola_risultati(dati):
+    """
+    Restituisce (statistiche, anomalie):
+    statistiche = {formatore: dict(turni, svolti, previsti, rimanenti, perc, conflitti)}
+    anomalie = [(data, turno, tipo, dettaglio)] in ordine di data
+    """
+    svolti = giorni_svolti_formatori(dati)
+    anomalie = []
+    conflitti = defaultdict(list)
+    
+    for riga in dati:
+        if not riga['data']:
+            continue
+        data, turno = riga['data'], riga['turno']
+        
+        for formatore, n in Counter(formatori_turno(riga)).items():
+            if n > 1:
+                anomalie.append((data, turno, 'Formatore duplicato', f'{formatore} presente {n} volte'))
+                conflitti[formatore].append((data, turno))
+        
+        aule = [p.get('aula') for _, p in riga['percorsi'] if p.get('aula')]
+        for aula, n in Counter(aule).items():
+            if n > 1:
+                anomalie.append((data, turno, 'Aula duplicata', f'Aula {aula} usata da {n} percorsi'))
+        
+        for perc_label, perc_dati in riga['percorsi']:
+            aula, attivita = perc_dati.get('aula'), perc_dati.get('attivita')
+            if not aula or not attivita:
+                continue
+            compatibili = AULE_ATTIVITA.get(str(aula))
+            if compatibili is None:
+                anomalie.append((data, turno, 'Aula sconosciuta', f'{perc_label}: aula {aula}'))
+            elif attivita not in compatibili:
+                anomalie.append((data, turno, 'Attività incompatibile',
+                                 f'{perc_label}: {attivita} non ammessa in aula {aula}'))
+    
+    statistiche = {}
+    for formatore in FORMATORI:
+        giorni = svolti.get(formatore, 0.0)
+        previsti = FORMATORI_DATA.get(formatore, {}).get('giorni_previsti')
+        statistiche[formatore] = {
+            'turni': int(giorni * 2),
+            'svolti': giorni,
+            'previsti': previsti,
+            'rimanenti': previsti - giorni if previsti is not None else None,
+            'perc': giorni / previsti if previsti else None,
+            'conflitti': conflitti.get(formatore, []),
+        }
+    
+    return statistiche, anomalie
+
+
+def scrivi_risultati(backend, statistiche, anomalie):
+    """Foglio RISULTATI con soli valori statici"""
+    wb = backend.wb
+    if NOME_FOGLIO in wb.sheetnames:
+        wb.remove(wb[NOME_FOGLIO])
+    ws = backend.add_sheet(NOME_FOGLIO)
+    
+    ws.write('A1', 'RISULTATI PIANIFICAZIONE', 'Titolo foglio')
+    ws.merge('A1:G1')
+    ws.write('A2', f'Sincronizzato il {datetime.now().strftime("%d.%m.%Y %H:%M")} '
+                   f'(valori calcolati, rilanciare sincronizza_risultati.py dopo le modifiche)', 'Corsivo')
+    
+    headers = ['Formatore', 'Turni', 'Giorni svolti', 'Giorni previsti',
+               'Giorni rimanenti', '% svolta', 'Conflitti']
+    for col, testo in enumerate(headers, start=1):
+        ws.cell(4, col, testo, 'Intestazione')
+    
+    row = 5
+    for formatore, stat in statistiche.items():
+        ws.cell(row, 1, formatore, 'Grassetto')
+        ws.cell(row, 2, stat['turni'])
+        ws.cell(row, 3, stat['svolti'], 'Giorni svolti')
+        ws.cell(row, 4, stat['previsti'])
+        ws.cell(row, 5, stat['rimanenti'])
+        ws.cell(row, 6, stat['perc'], 'Percentuale')
+        ws.cell(row, 7, len(stat['conflitti']))
+        
+        if stat['conflitti']:
+            turni = [f"{data.strftime('%d/%m/%Y')} {turno}" for data, turno in stat['conflitti']]
+            if len(turni) > MAX_TURNI_COMMENTO:
+                turni = turni[:MAX_TURNI_COMMENTO] + [f'... altri {len(turni) - MAX_TURNI_COMMENTO}']
+            ws.add_comment(row, 1, 'Presente più volte nello stesso turno:\n' + '\n'.join(turni))
+        row += 1
+    
+    row += 2
+    ws.cell(row, 1, f'ANOMALIE ({len(anomalie)})', 'Sezione festività')
+    row += 1
+    for col, testo in enumerate(['Data', 'Turno', 'Tipo', 'Dettaglio'], start=1):
+        ws.cell(row, col, testo, 'Intestazione')
+    row += 1
+    
+    for data, turno, tipo, dettaglio in anomalie:
+        ws.cell(row, 1, data, 'Data')
+        ws.cell(row, 2, turno)
+        ws.cell(row, 3, tipo)
+        ws.cell(row, 4, dettaglio)
+        row += 1
+    
+    ws.set_width('A', 14)
+    ws.set_width('C', 22)
+    ws.set_width('D', 40)
+    for col_letter in 'BEFG':
+        ws.set_width(col_letter, 14)
+
+
+def main(filename='Pianificazione_Corsi_2026.xlsx', output=None):
+    print("=" * 70)
+    print("🔄 SINCRONIZZAZIONE RISULTATI")
+    print("=" * 70)
+    
+    start = time.perf_counter()
+    output = output or filename
+    
+    print(f"📖 Caricamento: {filename}...")
+    wb = load_workbook(filename)
+    dati = [turno for nome in fogli_piano(wb.sheetnames) for turno in leggi_turni(wb[nome])]
+    print(f"✅ Caricati {len(dati)} turni")
+    
+    statistiche, anomalie = calcola_risultati(dati)
+    
+    backend = OpenpyxlBackend(output, wb)
+    scrivi_risultati(backend, statistiche, anomalie)
+    
+    print(f"\n💾 Salvataggio: {output}...")
+    backend.save()
+    
+    print()
+    for formatore, stat in statistiche.items():
+        print(f"  {formatore:<4} {stat['svolti']:6.1f} giorni svolti  conflitti: {len(stat['conflitti'])}")
+    print(f"\n⚠️  Anomalie: {len(anomalie)}" if anomalie else "\n✅ Nessuna anomalia")
+    print(f"⏱️  Completato in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Scrive nel foglio RISULTATI conteggi e anomalie calcolati in Python')
+    parser.add_argument('filename', nargs='?', default='Pianificazione_Corsi_2026.xlsx', help='file Excel')
+    parser.add_argument('--output', help='salva in un altro file (predefinito: sovrascrive)')
+    args = parser.parse_args()
+    main(args.filename, args.output)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+VERIFICA PDF RIPRODUCIBILI
+==========================
+
+Genera due volte tutti i report PDF (genera_stampe_pdf e
+genera_stampe_pdf_filtrati) dallo stesso file Excel, in due cartelle
+temporanee distinte e a qualche secondo di distanza, e controlla che i due
+giri producano gli stessi file con gli stessi byte.
+
+Un PDF diverso significa che nel report è entrato qualcosa che non dipende
+dai dati (data di creazione, ID del documento, ordine di un set...): lo
+script lo segnala e termina con codice 1.
+
+Uso (nella cartella di Pianificazione_Corsi_2026.xlsx):
+    python3 verifica_pdf_riproducibili.py
+"""
+
+from unittest import mock
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import genera_stampe_pdf
+import genera_stampe_pdf_filtrati
+
+FILE_EXCEL = 'Pianificazione_Corsi_2026.xlsx'
+
+# Attesa tra i due giri: la data di creazione dei PDF ha la risoluzione del secondo
+ATTESA_TRA_GIRI = 1.5
+
+
+def genera_tutti(dati, output_dir):
+    """Genera ogni report in una sua sottocartella di output_dir; restituisce gli errori [(report, errore)]"""
+    corsi = sorted({str(perc['nome']) for riga in dati for _, perc in riga['percorsi'] if perc.get('nome')})
+    formatori = sorted({str(perc[chiave]) for riga in dati for _, perc in riga['percorsi']
+                        for chiave in ('formatore1', 'formatore2') if perc.get(chiave)})
+    settimane = sorted({riga['data'].isocalendar()[1] for riga in dati if riga['data']})
+    
+    report = [
+        ('aule', lambda cartella: genera_stampe_pdf.genera_report_aule(dati, cartella)),
+        ('formatori', lambda cartella: genera_stampe_pdf.genera_report_formatori(dati, cartella)),
+        ('corsi', lambda cartella: genera_stampe_pdf.genera_report_corsi(dati, cartella)),
+        ('settimanale', lambda cartella: genera_stampe_pdf.genera_report_settimanale(dati, cartella)),
+    ]
+    # Report interattivi: primo formatore / corso dell'elenco, tutto l'anno
+    if formatori:
+        report.append(('formatore specifico', lambda cartella: interattivo(
+            genera_stampe_pdf.genera_report_formatore_specifico, dati, cartella, ['1', '', ''])))
+    if corsi:
+        report.append(('corso specifico', lambda cartella: interattivo(
+            genera_stampe_pdf.genera_report_corso_specifico, dati, cartella, ['1'])))
+    # Report filtrati, sugli stessi dati già caricati
+    if settimane:
+        report.append(('aule per settimane', lambda cartella: genera_stampe_pdf_filtrati.genera_report_aule_settimane(
+            settimane[:3], cartella, dati=dati)))
+    if formatori:
+        report.append(('formatore per periodo', lambda cartella: genera_stampe_pdf_filtrati.genera_report_formatore_periodo(
+            formatori[0], '2026-01-01', '2026-12-31', cartella, dati=dati)))
+    if corsi:
+        report.append(('corso specifico (filtrati)', lambda cartella: genera_stampe_pdf_filtrati.genera_report_corso_specifico(
+            corsi[0], cartella, dati=dati)))
+    
+    errori = []
+    for numero, (nome, genera) in enumerate(report, start=1):
+        cartella = os.path.join(output_dir, f'{numero:02d}')
+        os.makedirs(cartella, exist_ok=True)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                falliti = genera(cartella)
+            errori += [(nome, f"{os.path.basename(filename)}: {errore}") for filename, errore in falliti or []]
+        except Exception as e:
+            errori.append((nome, str(e)))
+    return errori
+
+
+def interattivo(funzione, dati, output_dir, risposte):
+    with mock.patch('builtins.input', side_effect=risposte):
+        return funzione(dati, output_dir)
+
+
+def leggi_pdf(cartella):
+    """{percorso relativo: contenuto} dei PDF generati in cartella (senza la cache)"""
+    contenuti = {}
+    for radice, sottocartelle, nomi in os.walk(cartella):
+        sottocartelle[:] = [nome for nome in sottocartelle if nome != genera_stampe_pdf.CARTELLA_CACHE_PDF]
+        for nome in nomi:
+            if nome.endswith('.pdf'):
+                percorso = os.path.join(radice, nome)
+                with open(percorso, 'rb') as f:
+                    contenuti[os.path.relpath(percorso, cartella)] = f.read()
+    return contenuti
+
+
+def main():
+    print("=" * 70)
+    print("🔁 VERIFICA PDF RIPRODUCIBILI")
+    print("=" * 70)
+    
+    if not os.path.exists(FILE_EXCEL):
+        print(f"❌ File non trovato: {FILE_EXCEL}")
+        return False
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        dati = genera_stampe_pdf.carica_dati_excel(FILE_EXCEL)
+    print(f"📊 {len(dati)} turni letti da {FILE_EXCEL}")
+    
+    with tempfile.TemporaryDirectory() as cartella:
+        giri = []
+        for giro in (1, 2):
+            if giro == 2:
+                time.sleep(ATTESA_TRA_GIRI)
+            output_dir = os.path.join(cartella, f'giro{giro}')
+            inizio = time.perf_counter()
+            errori = genera_tutti(dati, output_dir)
+            if errori:
+                print(f"\n❌ Report non generati nel giro {giro}:")
+                for nome, errore in errori:
+                    print(f"   {nome}: {errore}")
+                return False
+            giri.append(leggi_pdf(output_dir))
+            print(f"📄 Giro {giro}: {len(giri[-1])} PDF in {time.perf_counter() - inizio:.2f}s")
+    
+    primo, secondo = giri
+    diversi = sorted(nome for nome in primo.keys() & secondo.keys() if primo[nome] != secondo[nome])
+    mancanti = sorted(primo.keys() ^ secondo.keys())
+    
+    if diversi or mancanti:
+        print("\n❌ PDF NON RIPRODUCIBILI:")
+        for nome in diversi:
+            print(f"   {nome}: byte diversi tra i due giri")
+        for nome in mancanti:
+            print(f"   {nome}: generato in un solo giro")
+        return False
+    
+    print(f"\n✅ {len(primo)} PDF identici byte per byte")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)